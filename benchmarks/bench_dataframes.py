@@ -0,0 +1,79 @@
+"""
+Benchmark of Receipts.to_dataframes against the previous row-wise implementation
+
+The row-wise implementation built a one-row dataframe per receipt, line item and payment and concatenated them. The
+columnar implementation flattens all receipts in a single pass and builds each dataframe once.
+
+Usage: python -m benchmarks.bench_dataframes --receipts 1189 --repeat 3
+"""
+
+import argparse
+import timeit
+import pandas as pd
+from loyverse.endpoints import Receipts
+from loyverse.endpoints.fields import receipt as fields
+from loyverse.testing.synthetic import generate_receipts
+
+
+def to_dataframes_rowwise(response: dict):
+    """
+    Previous implementation of Receipts.to_dataframes, kept as benchmark reference
+    """
+
+    id_key = 'receipt_number'
+    receipts, items, payments = [], [], []
+
+    for receipt in response['receipts']:
+        receipts.append(pd.DataFrame({key: receipt[key] for key in fields.receipt}, index=[0]))
+
+        items_df = []
+        for line_item in receipt['line_items']:
+            item = {key: line_item[key] for key in fields.item}
+            item[id_key] = receipt[id_key]
+            items_df.append(pd.DataFrame(item, index=[0]))
+        items.append(pd.concat(items_df))
+
+        payments_df = []
+        for payment_item in receipt['payments']:
+            payment = {key: payment_item[key] for key in fields.payment}
+            payment[id_key] = receipt[id_key]
+            details = payment_item['payment_details']
+            if details is None:
+                payment_details = {key: None for key in fields.payment_details}
+            else:
+                payment_details = {key: details[key] for key in fields.payment_details}
+            payments_df.append(pd.DataFrame({**payment, **payment_details}, index=[0]))
+        payments.append(pd.concat(payments_df))
+
+    return (pd.concat(receipts).reset_index(drop=True), pd.concat(items).reset_index(drop=True),
+            pd.concat(payments).reset_index(drop=True))
+
+
+def run(receipts: int, repeat: int) -> dict:
+    """
+    Times both implementations on the same synthetic response
+
+    Args:
+        receipts (int): number of synthetic receipts
+        repeat (int): number of timed repetitions, the best one is reported
+    Returns:
+        results (dict): best timings in seconds and speedup
+    """
+
+    response = {'receipts': generate_receipts(receipts)}
+
+    rowwise = min(timeit.repeat(lambda: to_dataframes_rowwise(response), number=1, repeat=repeat))
+    columnar = min(timeit.repeat(lambda: Receipts.to_dataframes(response), number=1, repeat=repeat))
+
+    return {'receipts': receipts, 'rowwise_s': rowwise, 'columnar_s': columnar, 'speedup': rowwise / columnar}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--receipts', type=int, default=1189)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    results = run(args.receipts, args.repeat)
+    print(f"{results['receipts']} receipts: row-wise {results['rowwise_s']:.3f}s, "
+          f"columnar {results['columnar_s']:.4f}s, speedup x{results['speedup']:.0f}")
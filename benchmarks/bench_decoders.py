@@ -0,0 +1,66 @@
+"""
+Benchmark of the JSON decoder backends on receipt pages
+
+Pages of 250 receipts (the maximum page size of the API) are encoded to bytes once and decoded with every installed
+backend. Recorded pages (JSON files of raw receipt endpoint responses) can be passed in instead of synthetic ones.
+
+Usage: python -m benchmarks.bench_decoders --pages 40 --repeat 5 [--recorded page1.json page2.json ...]
+"""
+
+import argparse
+import json
+import timeit
+from loyverse.decoders import available_backends, get_decoder
+from loyverse.testing.synthetic import generate_receipts
+
+
+def synthetic_pages(pages: int) -> list:
+    """
+    Synthetic receipt pages encoded as bytes, as received from the API
+    """
+
+    receipts = generate_receipts(pages * 250)
+    return [json.dumps({'receipts': receipts[index:index + 250], 'cursor': 'x' * 64}).encode()
+            for index in range(0, len(receipts), 250)]
+
+
+def run(contents: list, repeat: int) -> dict:
+    """
+    Times every installed decoder backend on the same pages
+
+    Args:
+        contents (list): raw pages (bytes)
+        repeat (int): number of timed repetitions, the best one is reported
+    Returns:
+        results (dict): best timing in seconds to decode all pages, by backend
+    """
+
+    results = dict()
+    for backend in available_backends():
+        decode = get_decoder(backend)
+        results[backend] = min(timeit.repeat(lambda: [decode(content) for content in contents], number=1,
+                                             repeat=repeat))
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--recorded', nargs='*', default=None)
+    args = parser.parse_args()
+
+    if args.recorded:
+        contents = []
+        for path in args.recorded:
+            with open(path, 'rb') as f:
+                contents.append(f.read())
+    else:
+        contents = synthetic_pages(args.pages)
+
+    megabytes = sum(len(content) for content in contents) / 1e6
+    results = run(contents, args.repeat)
+    for backend, seconds in results.items():
+        print(f'{backend:>8}: {seconds:.3f}s for {len(contents)} pages ({megabytes / seconds:.0f} MB/s), '
+              f'x{results["json"] / seconds:.1f} vs json')
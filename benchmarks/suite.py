@@ -0,0 +1,216 @@
+"""
+Synthetic-load benchmark suite: pagination, JSON decoding, dataframe building and customer queries
+
+Every benchmark runs offline, on synthetic receipts and customers following the shape of the API responses
+(loyverse.testing.synthetic), served page by page from memory in place of the HTTP session. Requests are not
+throttled, timings measure the client-side cost only. Results are written as JSON, to track regressions across
+versions.
+
+Benchmarks (for each number of receipts):
+
+* pagination: Api.get_request following the cursors of all receipt pages and merging them
+* decoding: decoding all raw receipt pages, for each installed JSON decoder backend
+* to_dataframes: Receipts.to_dataframes on all receipts, raw and typed columns
+* customers_query: Customers.get_by_query over all customer pages (one customer for every 10 receipts)
+* customers_get_many: Customers.get_many for 1000 customer IDs, in concurrent batches
+
+Generating unique receipts dominates the runtime at large volumes, hence a pool of unique pages (``--unique-pages``)
+is generated once and served in a cycle. Decoded receipts are still distinct objects. Running the suite with 1M
+receipts holds all decoded receipts in memory, which needs several GB.
+
+Usage: python -m benchmarks.suite --receipts 10000 100000 1000000 --repeat 3 --output results.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+from itertools import islice, cycle
+import loyverse
+from loyverse.api import Api
+from loyverse.decoders import available_backends, get_decoder
+from loyverse.endpoints import Receipts, Customers
+from loyverse.throttle import RateLimiter
+from loyverse.testing.synthetic import generate_receipts, generate_customers, encode_pages
+
+
+class Unthrottled(RateLimiter):
+    """
+    Rate limiter letting every request through right away
+    """
+
+    def reserve(self, tokens: int = 1) -> float:
+        return 0.
+
+    @property
+    def remaining(self) -> int:
+        return sys.maxsize
+
+
+class PageResponse:
+    """
+    Minimal stand-in for requests.Response holding a raw page
+    """
+
+    status_code = 200
+    headers = {}
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+class PageSession:
+    """
+    Minimal stand-in for requests.Session serving raw pages by cursor, and objects by ID for ID filters
+
+    Args:
+        pages (list): raw pages, the cursor of each page is the index of the next page
+        objects (dict): objects by ID, served for requests filtering by IDs
+        key (str): page key holding the list of objects
+        id_param (str): query parameter holding comma-separated IDs
+    """
+
+    def __init__(self, pages: list, objects: dict = None, key: str = None, id_param: str = None):
+        self.pages = pages
+        self.objects = objects or dict()
+        self.key = key
+        self.id_param = id_param
+
+    def get(self, url: str, params: dict = None, **kwargs) -> PageResponse:
+        params = params or dict()
+
+        if self.id_param is not None and self.id_param in params:
+            ids = params[self.id_param].split(',')
+            found = [self.objects[object_id] for object_id in ids if object_id in self.objects]
+            return PageResponse(json.dumps({self.key: found}).encode())
+
+        return PageResponse(self.pages[int(params.get('cursor', 0))])
+
+    def close(self) -> None:
+        return None
+
+
+def receipt_pages(receipts: int, unique_pages: int) -> list:
+    """
+    Raw receipt pages holding the passed in number of receipts, cycling through a pool of unique pages
+    """
+
+    pool = generate_receipts(min(receipts, unique_pages * 250))
+    pool = [json.dumps({'receipts': pool[index:index + 250]}).encode() for index in range(0, len(pool), 250)]
+
+    count = -(-receipts // 250)
+    pages = list(islice(cycle(pool), count))
+    # The cursor of each page points to the next page in the cycled list
+    return [page[:-1] + f', "cursor": "{index + 1}"}}'.encode() if index + 1 < count else page
+            for index, page in enumerate(pages)]
+
+
+def api(session: PageSession) -> Api:
+    """
+    Unthrottled Api object sending its requests to the passed in session
+    """
+
+    api = Api(access_token='benchmark', rate_limiter=Unthrottled())
+    api._session = session
+    return api
+
+
+def best(function, repeat: int) -> float:
+    """
+    Best timing in seconds over repeated single calls
+    """
+
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def result(benchmark: str, size: int, seconds: float, **extra) -> dict:
+    return {'benchmark': benchmark, 'receipts': size, 'seconds': round(seconds, 6),
+            'receipts_per_s': round(size / seconds), **extra}
+
+
+def run(receipts: int, repeat: int, unique_pages: int = 40) -> list:
+    """
+    Runs all benchmarks for the passed in number of receipts
+
+    Args:
+        receipts (int): number of synthetic receipts
+        repeat (int): number of timed repetitions, the best one is reported
+        unique_pages (int): number of unique receipt pages generated, served in a cycle
+    Returns:
+        results (list): one result (dict) per benchmark, holding its best timing and throughput
+    """
+
+    results = []
+
+    pages = receipt_pages(receipts, unique_pages)
+    megabytes = sum(len(page) for page in pages) / 1e6
+    receipts_api = api(PageSession(pages))
+
+    seconds = best(lambda: receipts_api.get_request(receipts_api._url('receipts'), {}), repeat)
+    results.append(result('pagination', receipts, seconds, pages=len(pages), megabytes=round(megabytes, 1)))
+
+    for backend in available_backends():
+        decode = get_decoder(backend)
+        seconds = best(lambda: [decode(page) for page in pages], repeat)
+        results.append(result('decoding', receipts, seconds, backend=backend,
+                              megabytes_per_s=round(megabytes / seconds, 1)))
+
+    response = receipts_api.get_request(receipts_api._url('receipts'), {})
+    for typed in (False, True):
+        seconds = best(lambda: Receipts.to_dataframes(response, typed=typed), repeat)
+        results.append(result('to_dataframes', receipts, seconds, typed=typed))
+
+    customers = generate_customers(max(1, receipts // 10))
+    session = PageSession(encode_pages(customers, 'customers'), objects={c['id']: c for c in customers},
+                          key='customers', id_param='customer_ids')
+    endpoint = Customers(api(session))
+
+    seconds = best(lambda: endpoint.get_by_query(), repeat)
+    results.append(result('customers_query', receipts, seconds, customers=len(customers)))
+
+    ids = [customer['id'] for customer in customers[:1000]]
+    seconds = best(lambda: endpoint.get_many(ids), repeat)
+    results.append(result('customers_get_many', receipts, seconds, customers=len(ids)))
+
+    return results
+
+
+def environment() -> dict:
+    """
+    Package, interpreter and platform versions the benchmarks ran on
+    """
+
+    return {
+        'loyverse': loyverse.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'decoders': available_backends(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--receipts', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--unique-pages', type=int, default=40)
+    parser.add_argument('--output', default=None, help='JSON results file (default: standard output)')
+    args = parser.parse_args()
+
+    report = {'environment': environment(), 'results': []}
+    for size in args.receipts:
+        start = time.perf_counter()
+        report['results'].extend(run(size, args.repeat, args.unique_pages))
+        print(f'{size} receipts: done in {time.perf_counter() - start:.1f}s', file=sys.stderr)
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
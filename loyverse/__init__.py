@@ -10,5 +10,7 @@ __author__ = "Matteo Berchier <maberchier@gmail.com>"
 __copyright__ = "(c) 2020, Matteo Berchier"
 
 from loyverse.client import Client
+from loyverse.async_client import AsyncClient
+from loyverse.pool import ClientPool
 
-__all__ = ('Client',)
+__all__ = ('Client', 'AsyncClient', 'ClientPool',)
@@ -0,0 +1,355 @@
+"""
+Streaming aggregation of sales over receipts
+
+The SalesAggregator consumes receipts one by one (e.g. page by page from Receipts.iter_by_dates) and keeps running
+totals keyed by configurable dimensions, with memory proportional to the number of distinct keys instead of the number
+of receipts or line items. Aggregators of disjoint receipt sets (e.g. shards fetched in parallel) can be merged.
+
+Dimensions:
+
+* day, hour: business date of the receipt (receipt_date), in the timezone of the aggregator
+* store_id, employee_id, pos_device_id, customer_id, dining_option, source: receipt fields
+* item_id, variant_id: line item fields, totals are then computed over line items
+* payment_type: payment type ID, totals are then computed over payments
+
+Totals by key:
+
+* receipts: number of sale receipts (refunds excluded), lines: number of line items or payments (item and payment
+  dimensions only)
+* gross_sales: total money of sales, refunds: total money of refunds, net_sales: gross_sales - refunds
+* discounts, taxes: total discounts and taxes (refunds deducted)
+* quantity: quantity sold (refunds deducted, item dimensions only)
+* refund_receipts: number of refund receipts
+* customers: estimated number of distinct customers of the sales (HyperLogLog sketch, exact for small counts)
+
+Refunds are identified by receipt_type (REFUND) or refund_for (the number of the refunded receipt) and booked on their
+own date, as negative sales. Cancelled receipts are skipped.
+"""
+
+import hashlib
+import math
+from loyverse.utils.dates import parse_isoformat
+
+receipt_dimensions = ('day', 'hour', 'store_id', 'employee_id', 'pos_device_id', 'customer_id', 'dining_option',
+                      'source')
+item_dimensions = ('item_id', 'variant_id')
+payment_dimensions = ('payment_type',)
+
+
+class HyperLogLog:
+    """
+    Mergeable distinct count sketch. Small sets are counted exactly, until they grow beyond a fraction of the number
+    of registers; larger sets are estimated with a relative standard error of about 1.04 / sqrt(2 ** precision).
+
+    Args:
+        precision (int): number of index bits (4 to 16), the sketch holds 2 ** precision one-byte registers
+    """
+
+    __slots__ = ('precision', 'registers', 'sparse')
+
+    def __init__(self, precision: int = 10):
+        if not 4 <= precision <= 16:
+            raise ValueError('HyperLogLog precision has to be between 4 and 16.')
+
+        self.precision = precision
+        self.registers = None
+        self.sparse = set()
+
+    @staticmethod
+    def _hash(value) -> int:
+        return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), 'big')
+
+    def _densify(self) -> None:
+        self.registers = bytearray(1 << self.precision)
+        for hashed in self.sparse:
+            self._update(hashed)
+        self.sparse = None
+
+    def _update(self, hashed: int) -> None:
+        width = 64 - self.precision
+        index = hashed >> width
+        rank = width - (hashed & ((1 << width) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add(self, value) -> None:
+        """
+        Adds a value (converted to string) to the sketch
+        """
+
+        hashed = self._hash(value)
+        if self.sparse is not None:
+            self.sparse.add(hashed)
+            if len(self.sparse) > (1 << self.precision) // 8:
+                self._densify()
+        else:
+            self._update(hashed)
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """
+        Merges another sketch of the same precision into this one (union of the counted sets)
+        """
+
+        if other.precision != self.precision:
+            raise ValueError('Only sketches of the same precision can be merged.')
+
+        if other.sparse is not None:
+            for hashed in other.sparse:
+                if self.sparse is not None:
+                    self.sparse.add(hashed)
+                else:
+                    self._update(hashed)
+            if self.sparse is not None and len(self.sparse) > (1 << self.precision) // 8:
+                self._densify()
+            return
+
+        if self.sparse is not None:
+            self._densify()
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def count(self) -> float:
+        """
+        Estimated number of distinct values added
+
+        Returns:
+            count (float): estimate (exact while the sketch is sparse)
+        """
+
+        if self.sparse is not None:
+            return float(len(self.sparse))
+
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / sum(2. ** -register for register in self.registers)
+
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros > 0:
+            # Linear counting for small cardinalities
+            estimate = m * math.log(m / zeros)
+
+        return estimate
+
+
+class _Totals:
+    """
+    Running totals of one key
+    """
+
+    __slots__ = ('receipts', 'lines', 'gross_sales', 'refunds', 'discounts', 'taxes', 'quantity', 'refund_receipts',
+                 'customers')
+
+    sums = ('receipts', 'lines', 'gross_sales', 'refunds', 'discounts', 'taxes', 'quantity', 'refund_receipts')
+
+    def __init__(self, precision: int):
+        for name in self.sums:
+            setattr(self, name, 0)
+        self.customers = HyperLogLog(precision)
+
+    def merge(self, other: '_Totals') -> None:
+        for name in self.sums:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.customers.merge(other.customers)
+
+
+class SalesAggregator:
+    """
+    Streaming aggregator of sales totals by dimensions
+
+    Args:
+        dimensions (tuple): names of the dimensions of the keys, see the module docstring. Item and payment dimensions
+            cannot be combined.
+        timezone_id (str): timezone of the day and hour dimensions (e.g. Europe/Zurich), default: UTC
+        precision (int): precision of the distinct customer sketches, see HyperLogLog
+    """
+
+    def __init__(self, dimensions: tuple = ('day', 'store_id'), timezone_id: str = 'UTC', precision: int = 10):
+
+        dimensions = tuple(dimensions)
+        unknown = set(dimensions) - set(receipt_dimensions + item_dimensions + payment_dimensions)
+        if unknown:
+            raise ValueError(f'Unknown dimensions: {", ".join(sorted(unknown))}.')
+
+        self.level = 'receipt'
+        if any(dimension in item_dimensions for dimension in dimensions):
+            self.level = 'item'
+        if any(dimension in payment_dimensions for dimension in dimensions):
+            if self.level == 'item':
+                raise ValueError('Item and payment dimensions cannot be combined.')
+            self.level = 'payment'
+
+        self.dimensions = dimensions
+        self.timezone_id = timezone_id
+        self.precision = precision
+        self.totals = dict()
+        self.skipped = 0
+
+        self._timezone = None
+        if timezone_id != 'UTC':
+            import pytz
+            self._timezone = pytz.timezone(timezone_id)
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    def _period(self, receipt: dict, dimension: str) -> str:
+        """
+        Day (YYYY-MM-DD) or hour (YYYY-MM-DDTHH) of the business date of a receipt
+        """
+
+        date = receipt.get('receipt_date') or receipt['created_at']
+        if self._timezone is not None:
+            date = parse_isoformat(date).astimezone(self._timezone).strftime('%Y-%m-%dT%H')
+
+        return date[:10] if dimension == 'day' else date[:13]
+
+    def _receipt_key(self, receipt: dict) -> list:
+        key = []
+        for dimension in self.dimensions:
+            if dimension in ('day', 'hour'):
+                key.append(self._period(receipt, dimension))
+            elif dimension in receipt_dimensions:
+                key.append(receipt.get(dimension))
+            else:
+                key.append(None)
+        return key
+
+    def _totals(self, key: tuple) -> _Totals:
+        totals = self.totals.get(key)
+        if totals is None:
+            totals = self.totals[key] = _Totals(self.precision)
+        return totals
+
+    def add(self, receipt: dict) -> None:
+        """
+        Adds a receipt to the running totals
+
+        Args:
+            receipt (dict): receipt object, as returned by the API
+        """
+
+        if receipt.get('cancelled_at') is not None:
+            self.skipped += 1
+            return
+
+        refund = receipt.get('receipt_type') == 'REFUND' or receipt.get('refund_for') is not None
+        sign = -1 if refund else 1
+        customer_id = receipt.get('customer_id')
+        base = self._receipt_key(receipt)
+
+        if self.level == 'receipt':
+            lines = [(tuple(base), receipt.get('total_money') or 0., receipt.get('total_discount') or 0.,
+                      receipt.get('total_tax') or 0., 0.)]
+        elif self.level == 'item':
+            positions = [index for index, dimension in enumerate(self.dimensions) if dimension in item_dimensions]
+            lines = []
+            for line_item in receipt.get('line_items') or []:
+                key = list(base)
+                for index in positions:
+                    key[index] = line_item.get(self.dimensions[index])
+                taxes = sum(tax.get('money_amount') or 0. for tax in line_item.get('line_taxes') or [])
+                lines.append((tuple(key), line_item.get('total_money') or 0., line_item.get('total_discount') or 0.,
+                              taxes, line_item.get('quantity') or 0.))
+        else:
+            index = self.dimensions.index('payment_type')
+            lines = []
+            for payment in receipt.get('payments') or []:
+                key = list(base)
+                key[index] = payment.get('payment_type_id')
+                lines.append((tuple(key), payment.get('money_amount') or 0., 0., 0., 0.))
+
+        counted = set()
+        for key, money, discount, tax, quantity in lines:
+            totals = self._totals(key)
+
+            if self.level != 'receipt':
+                totals.lines += 1
+
+            if refund:
+                totals.refunds += money
+            else:
+                totals.gross_sales += money
+            totals.discounts += sign * discount
+            totals.taxes += sign * tax
+            totals.quantity += sign * quantity
+
+            if key in counted:
+                continue
+            counted.add(key)
+
+            if refund:
+                totals.refund_receipts += 1
+            else:
+                totals.receipts += 1
+                if customer_id is not None:
+                    totals.customers.add(customer_id)
+
+    def update(self, receipts) -> 'SalesAggregator':
+        """
+        Adds receipts to the running totals, consuming the iterable lazily
+
+        Args:
+            receipts (iterable): receipt objects, e.g. Receipts.iter_by_dates(start_date, end_date)
+        Returns:
+            aggregator (SalesAggregator): the aggregator itself
+        """
+
+        for receipt in receipts:
+            self.add(receipt)
+
+        return self
+
+    def merge(self, other: 'SalesAggregator') -> 'SalesAggregator':
+        """
+        Merges the totals of another aggregator (with the same dimensions, e.g. of another shard) into this one. The
+        aggregators have to be built from disjoint sets of receipts, distinct customers are merged as set unions.
+
+        Args:
+            other (SalesAggregator): aggregator to be merged
+        Returns:
+            aggregator (SalesAggregator): the aggregator itself
+        """
+
+        if (other.dimensions, other.timezone_id, other.precision) != \
+                (self.dimensions, self.timezone_id, self.precision):
+            raise ValueError('Only aggregators with the same dimensions, timezone and precision can be merged.')
+
+        for key, totals in other.totals.items():
+            self._totals(key).merge(totals)
+        self.skipped += other.skipped
+
+        return self
+
+    def results(self) -> list:
+        """
+        Totals of all keys
+
+        Returns:
+            results (list): one dictionary per key holding the dimensions and the totals, sorted by key
+        """
+
+        results = []
+        for key in sorted(self.totals, key=lambda k: tuple('' if value is None else str(value) for value in k)):
+            totals = self.totals[key]
+            row = dict(zip(self.dimensions, key))
+            row.update({name: getattr(totals, name) for name in _Totals.sums})
+            row['net_sales'] = totals.gross_sales - totals.refunds
+            row['customers'] = round(totals.customers.count())
+            if self.level == 'receipt':
+                del row['lines']
+            if self.level != 'item':
+                del row['quantity']
+            results.append(row)
+
+        return results
+
+    def to_dataframe(self):
+        """
+        Totals of all keys as dataframe, one row per key
+
+        Returns:
+            totals (pandas.DataFrame): dimensions and totals columns
+        """
+
+        import pandas as pd
+
+        return pd.DataFrame(self.results())
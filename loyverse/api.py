@@ -1,13 +1,21 @@
 """
 Base class sharing common properties and methods that can be reused for all endpoints.
 The root url for all Loyverse API requests is https://api.loyverse.com/v1.0.
+Requests are throttled client-side to stay below the limits per account (300 requests in 300sec).
 """
 
-# TODO: Implement throttling of requests to stay below limits per account (300 requests in 300sec)
-
+import hashlib
 import os
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from loyverse.exceptions import AccessTokenMissingError
+from loyverse.throttle import RateLimiter, TokenBucket
+from loyverse.cache import ResponseCache
+from loyverse.retry import RetryPolicy
+from loyverse.decoders import get_decoder
+from loyverse.metrics import Hooks
 
 
 class Api:
@@ -15,19 +23,36 @@ class Api:
     Base API properties for all endpoints
     """
 
-    def __init__(self, access_token: str = None):
+    limit_max = 250
+
+    def __init__(self, access_token: str = None, pool_size: int = 10, keep_alive: bool = True,
+                 timeout: tuple = (10, 60), rate_limiter: RateLimiter = None, cache: ResponseCache = None,
+                 retry: RetryPolicy = None, decoder: str = None, url: str = None, hooks: Hooks = None):
         """
         Api initialization
 
         Args:
             access_token (str): API access token, can also be defined in the environment variable LOYVERSE_ACCESS_TOKEN
+            pool_size (int): maximum number of pooled connections kept open to the API host
+            keep_alive (bool): reuse connections between requests (default: True)
+            timeout (tuple): connect and read timeouts in seconds, passed to every request
+            rate_limiter (RateLimiter): request rate limiter (default: in-process TokenBucket for 300 requests in
+                300sec), pass a SQLiteTokenBucket to share the budget between processes
+            cache (ResponseCache): if provided, caches the responses of single-resource requests (e.g. get_by_id)
+            retry (RetryPolicy): retry policy for rate limited, failing or timed out requests (default: RetryPolicy())
+            decoder (str): JSON decoder backend (orjson, msgspec or json), default: fastest installed backend
+            url (str): root url of the API (default: https://api.loyverse.com/v1.0), e.g. the url of a local
+                loyverse.testing.server.FakeServer
+            hooks (Hooks): instrumentation hooks notified of requests, pages, retries and throttling waits (e.g. a
+                loyverse.metrics.MetricsCollector)
         Notes:
-            Initializes the hostname, version and name, as well as the headers containing the access token
+            Initializes the hostname, version and name, as well as the headers containing the access token and the
+            HTTP session shared by all endpoints using this object. The session is safe to share between threads.
         """
 
         self.name = 'loyverse'
         self.version = '1.0'
-        self.url = 'https://api.loyverse.com/v1.0'
+        self.url = 'https://api.loyverse.com/v1.0' if url is None else url.rstrip('/')
 
         if access_token is None:
             try:
@@ -41,7 +66,78 @@ class Api:
             'Authorization': f'Bearer {self._access_token}'
         }
 
-    def request(self, method: str, path: str, params: dict = None) -> dict:
+        if not keep_alive:
+            self._header['Connection'] = 'close'
+
+        # Cached responses are keyed by token fingerprint and url, a cache shared between accounts never mixes them
+        self._cache_prefix = hashlib.sha256(str(self._access_token).encode()).hexdigest()[:16]
+
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._session = None
+        self._session_lock = threading.Lock()
+
+        if rate_limiter is None:
+            rate_limiter = TokenBucket()
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+
+        if retry is None:
+            retry = RetryPolicy()
+        self.retry = retry
+        self._decode = get_decoder(decoder)
+        self.hooks = hooks
+
+    @property
+    def rate_limit_remaining(self) -> int:
+        """
+        Number of requests that can be sent right away without being throttled
+
+        Returns:
+            remaining (int): remaining request budget
+        """
+
+        return self.rate_limiter.remaining
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        HTTP session holding the connection pool, created on first use
+
+        Returns:
+            session (requests.Session): pooled HTTP session
+        """
+
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size,
+                                          pool_block=True)
+                    session = requests.Session()
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+
+        return self._session
+
+    def close(self) -> None:
+        """
+        Closes all pooled connections. The Api object can still be used afterwards, a new pool is then created.
+        """
+
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def request(self, method: str, path: str, params: dict = None, payload: dict = None,
+                idempotent: bool = False, cached: bool = False) -> dict:
         """
         API request method
 
@@ -49,49 +145,112 @@ class Api:
             method (str): HTTP method (GET, POST, PUT, PATCH, DELETE)
             path (str): API resource path
             params (dict): query parameters dictionary for passed-in path
+            payload (dict): JSON body of write requests (POST, PUT, PATCH)
+            idempotent (bool): whether a write request can be safely sent twice, see write_request
+            cached (bool): whether a GET request of a single resource (e.g. get_by_id) can be served from the
+                response cache. List requests are never cached, as their cursor pages have to be followed.
 
         Returns:
             response (dict): parsed JSON response
         """
 
-        if path == '' or path is None:
-            url = self.url
-        else:
-            url = f'{self.url}/{path}'
+        url = self._url(path)
 
         if method.lower() == 'get':
-            response = self.get_request(url, params)
+            if cached and params is None and self.cache is not None:
+                response = self.cached_get_request(url)
+            else:
+                response = self.get_request(url, params)
         else:
-            # TODO: Implement PUT, PATCH, DELETE, POST methods
-            response = None
+            response = self.write_request(method, url, payload=payload, params=params, idempotent=idempotent)
 
         return response
 
-    def get_request(self, url: str, params: dict) -> dict:
+    def _url(self, path: str) -> str:
         """
-        GET method for API requests
+        Complete url (host + path) for an API resource path
+        """
+
+        if path == '' or path is None:
+            return self.url
+
+        return f'{self.url}/{path}'
+
+    def _cache_key(self, url: str) -> str:
+        """
+        Response cache key of a complete url, specific to the access token
+        """
+
+        return f'{self._cache_prefix}:{url}'
+
+    def _endpoint_path(self, url: str) -> str:
+        """
+        Resource path of a complete url, as reported to the hooks
+        """
+
+        return url[len(self.url) + 1:] if url.startswith(self.url) else url
+
+    @staticmethod
+    def _records(page: dict) -> int:
+        """
+        Number of objects in a response page
+        """
+
+        for key, value in page.items():
+            if key != 'cursor' and isinstance(value, list):
+                return len(value)
+
+        return 0
+
+    def iter_pages(self, path: str, params: dict = None, decode=None):
+        """
+        Iterates over the response pages of a GET request, following cursors until the last page
+
+        Args:
+            path (str): API resource path
+            params (dict): query parameters dictionary for passed-in path
+            decode (callable): function decoding the raw bytes of a page (default: JSON decoder of the Api object)
+        Returns:
+            pages (generator): parsed JSON response pages (dict), yielded as soon as each page is received
+        """
+
+        return self._get_pages(self._url(path), params, decode=decode)
+
+    def _get_pages(self, url: str, params: dict, decode=None):
+        """
+        Generator behind iter_pages and get_request, sends one request per cursor page
 
         Args:
             url (str): complete url (host + path) for the request
             params (dict): query parameters
+            decode (callable): function decoding the raw bytes of a page (default: JSON decoder of the Api object)
         Returns:
-            response (dict): parse JSON response
+            pages (generator): parsed JSON response pages (dict)
         Notes:
-            Function maximizes query limit to maximum available (250) and merges multiple responses if response
-            size is larger than maximum (250)
+            Function maximizes query limit to maximum available (250) to minimize the number of pages
         """
 
-        limit_max = 250
+        if decode is None:
+            decode = self._decode
+
+        limit_max = self.limit_max
         if params is not None:
+            params = dict(params)
             params['limit'] = limit_max
 
+        hooks = self.hooks
         cursor = True
-        response_full = dict()
 
         while cursor:
-            response = requests.get(url, headers=self._header, params=params)
+            start = time.perf_counter()
+            response = self._send(url, params)
             response.raise_for_status()
-            response = response.json()
+            content = response.content
+            response = decode(content)
+
+            if hooks is not None:
+                hooks.page(self._endpoint_path(url), self._records(response), len(content),
+                           time.perf_counter() - start)
 
             if 'cursor' in response:
                 params = {
@@ -101,11 +260,182 @@ class Api:
             else:
                 cursor = False
 
-            key = list(response.keys())[0]
-            if key in response_full:
-                response_full[key].extend(response[key])
-            else:
-                for key in response.keys():
-                    response_full[key] = response[key]
+            yield response
+
+    def _send(self, url: str, params: dict = None, headers: dict = None, method: str = 'GET', payload: dict = None,
+              idempotent: bool = True) -> requests.Response:
+        """
+        Sends a single request over the pooled session, once the rate limiter allows it. Rate limited, failing or
+        timed out requests are retried with the same parameters, according to the retry policy.
+
+        Args:
+            url (str): complete url (host + path) for the request
+            params (dict): query parameters
+            headers (dict): additional request headers
+            method (str): HTTP method
+            payload (dict): JSON body of the request
+            idempotent (bool): if False, only rate limited requests (never processed by the API) are retried
+        Returns:
+            response (requests.Response): raw HTTP response (the last one, if all retries failed)
+        """
+
+        if headers is None:
+            headers = self._header
+        else:
+            headers = {**self._header, **headers}
+
+        hooks = self.hooks
+        path = self._endpoint_path(url) if hooks is not None else None
+
+        retries = 0
+        while True:
+            waited = self.rate_limiter.acquire()
+
+            if hooks is not None:
+                if waited > 0:
+                    hooks.throttle_wait(path, waited, self.rate_limiter.remaining)
+                hooks.request_start(path, retries)
+                start = time.perf_counter()
+
+            try:
+                if method == 'GET':
+                    response = self.session.get(url, headers=headers, params=params, timeout=self.timeout)
+                else:
+                    response = self.session.request(method, url, headers=headers, params=params, json=payload,
+                                                    timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if hooks is not None:
+                    hooks.request_end(path, None, time.perf_counter() - start, 0, self.rate_limiter.remaining)
+                if not idempotent or not self.retry.should_retry('connection_error', retries):
+                    raise
+                delay = self.retry.delay(retries)
+                if hooks is not None:
+                    hooks.retry(path, 'connection_error', retries, delay)
+                time.sleep(delay)
+                retries += 1
+                continue
+
+            if hooks is not None:
+                hooks.request_end(path, response.status_code, time.perf_counter() - start, len(response.content),
+                                  self.rate_limiter.remaining)
+
+            status_class = self.retry.status_class(response.status_code)
+            if not idempotent and status_class != 'rate_limited':
+                status_class = None
+            if not self.retry.should_retry(status_class, retries):
+                return response
+
+            delay = self.retry.delay(retries, response.headers.get('Retry-After'))
+            if delay is None:
+                # The server asks to wait longer than the retry policy allows, fail fast
+                return response
+            if hooks is not None:
+                hooks.retry(path, status_class, retries, delay)
+            time.sleep(delay)
+            retries += 1
+
+    def cached_get_request(self, url: str) -> dict:
+        """
+        GET method for single-resource requests, served from the response cache while fresh
+
+        Args:
+            url (str): complete url (host + path) for the request
+        Returns:
+            response (dict): parsed JSON response
+        Notes:
+            Expired responses are revalidated with If-None-Match / If-Modified-Since when the server sent an ETag or
+            Last-Modified header, a 304 response then renews the cached response. Cached responses are shared, they
+            should not be modified by the caller.
+        """
+
+        key = self._cache_key(url)
+        entry = self.cache.lookup(key)
+        if entry is not None and entry.fresh:
+            return entry.response
+
+        headers = dict()
+        if entry is not None:
+            if entry.etag is not None:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified is not None:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        response = self._send(url, headers=headers)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.revalidated(key, entry)
+            return entry.response
+
+        response.raise_for_status()
+        data = self._decode(response.content)
+        self.cache.set(key, data, etag=response.headers.get('ETag'),
+                       last_modified=response.headers.get('Last-Modified'))
+
+        return data
+
+    def write_request(self, method: str, url: str, payload: dict = None, params: dict = None,
+                      idempotent: bool = False) -> dict:
+        """
+        POST, PUT, PATCH and DELETE method for API requests
+
+        Args:
+            method (str): HTTP method (POST, PUT, PATCH or DELETE)
+            url (str): complete url (host + path) for the request
+            payload (dict): JSON body of the request
+            params (dict): query parameters
+            idempotent (bool): whether the request can be safely sent twice (e.g. setting absolute stock levels or
+                updating an object by ID). Rate limited requests are always retried, failing or timed out requests
+                only if idempotent, as the API may have processed them.
+        Returns:
+            response (dict): parsed JSON response (empty for responses without body)
+        Notes:
+            Cached responses of the written object (url, or url/<id> if the payload holds an object ID) are
+            invalidated.
+        """
+
+        response = self._send(url, params=params, method=method.upper(), payload=payload, idempotent=idempotent)
+        response.raise_for_status()
+
+        if self.cache is not None:
+            self.cache.invalidate(self._cache_key(url))
+            if isinstance(payload, dict) and payload.get('id') is not None:
+                self.cache.invalidate(self._cache_key(f'{url}/{payload["id"]}'))
+
+        if not response.content:
+            return dict()
+
+        return self._decode(response.content)
+
+    def get_request(self, url: str, params: dict) -> dict:
+        """
+        GET method for API requests
+
+        Args:
+            url (str): complete url (host + path) for the request
+            params (dict): query parameters
+        Returns:
+            response (dict): parse JSON response
+        Notes:
+            Function maximizes query limit to maximum available (250) and merges multiple responses if response
+            size is larger than maximum (250)
+        """
+
+        response_full = dict()
+
+        for response in self._get_pages(url, params):
+            self._merge(response_full, response)
 
         return response_full
+
+    @staticmethod
+    def _merge(response_full: dict, response: dict) -> None:
+        """
+        Merges a response page into the full response, by extending the list of objects of the page
+        """
+
+        key = list(response.keys())[0]
+        if key in response_full:
+            response_full[key].extend(response[key])
+        else:
+            for key in response.keys():
+                response_full[key] = response[key]
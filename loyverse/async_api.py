@@ -0,0 +1,350 @@
+"""
+Asyncio version of the Api base class, running on the httpx asynchronous transport with pooled connections.
+Pagination, throttling and response merging follow the same semantics as the blocking Api class.
+
+The httpx package is an optional dependency, install it with ``pip install loyverse[async]``.
+"""
+
+import asyncio
+import time
+from loyverse.api import Api
+from loyverse.throttle import RateLimiter
+from loyverse.cache import ResponseCache
+from loyverse.retry import RetryPolicy
+from loyverse.metrics import Hooks
+
+
+class AsyncApi(Api):
+    """
+    Base API properties for all asynchronous endpoints, all request methods are coroutines
+    """
+
+    def __init__(self, access_token: str = None, pool_size: int = 10, keep_alive: bool = True,
+                 timeout: tuple = (10, 60), rate_limiter: RateLimiter = None, cache: ResponseCache = None,
+                 retry: RetryPolicy = None, decoder: str = None, url: str = None, hooks: Hooks = None):
+        """
+        AsyncApi initialization
+
+        Args:
+            access_token (str): API access token, can also be defined in the environment variable LOYVERSE_ACCESS_TOKEN
+            pool_size (int): maximum number of pooled connections kept open to the API host
+            keep_alive (bool): reuse connections between requests (default: True)
+            timeout (tuple): connect and read timeouts in seconds, passed to every request
+            rate_limiter (RateLimiter): request rate limiter (default: in-process TokenBucket for 300 requests in
+                300sec), the limiter can be shared with blocking Api objects
+            cache (ResponseCache): if provided, caches the responses of single-resource requests (e.g. get_by_id)
+            retry (RetryPolicy): retry policy for rate limited, failing or timed out requests (default: RetryPolicy())
+            decoder (str): JSON decoder backend (orjson, msgspec or json), default: fastest installed backend
+            url (str): root url of the API (default: https://api.loyverse.com/v1.0)
+            hooks (Hooks): instrumentation hooks notified of requests, pages, retries and throttling waits
+        """
+
+        super().__init__(access_token=access_token, pool_size=pool_size, keep_alive=keep_alive, timeout=timeout,
+                         rate_limiter=rate_limiter, cache=cache, retry=retry, decoder=decoder, url=url, hooks=hooks)
+        self.keep_alive = keep_alive
+
+    @property
+    def session(self):
+        """
+        Asynchronous HTTP client holding the connection pool, created on first use
+
+        Returns:
+            session (httpx.AsyncClient): pooled asynchronous HTTP client
+        """
+
+        if self._session is None:
+            try:
+                import httpx
+            except ImportError:
+                raise ImportError('AsyncApi requires the httpx package, install it with: pip install loyverse[async]')
+
+            connect, read = self.timeout
+            limits = httpx.Limits(max_connections=self.pool_size,
+                                  max_keepalive_connections=self.pool_size if self.keep_alive else 0)
+            self._session = httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(read, connect=connect))
+
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Closes all pooled connections. The AsyncApi object can still be used afterwards, a new pool is then created.
+        """
+
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.aclose()
+
+    def __enter__(self):
+        raise TypeError('AsyncApi is an asynchronous context manager, use: async with AsyncApi(...)')
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def request(self, method: str, path: str, params: dict = None, payload: dict = None,
+                      idempotent: bool = False, cached: bool = False) -> dict:
+        """
+        API request method
+
+        Args:
+            method (str): HTTP method (GET, POST, PUT, PATCH, DELETE)
+            path (str): API resource path
+            params (dict): query parameters dictionary for passed-in path
+            payload (dict): JSON body of write requests (POST, PUT, PATCH)
+            idempotent (bool): whether a write request can be safely sent twice, see Api.write_request
+            cached (bool): whether a GET request of a single resource (e.g. get_by_id) can be served from the
+                response cache. List requests are never cached, as their cursor pages have to be followed.
+
+        Returns:
+            response (dict): parsed JSON response
+        """
+
+        url = self._url(path)
+
+        if method.lower() == 'get':
+            if cached and params is None and self.cache is not None:
+                response = await self.cached_get_request(url)
+            else:
+                response = await self.get_request(url, params)
+        else:
+            response = await self.write_request(method, url, payload=payload, params=params, idempotent=idempotent)
+
+        return response
+
+    def iter_pages(self, path: str, params: dict = None, decode=None):
+        """
+        Iterates asynchronously over the response pages of a GET request, following cursors until the last page
+
+        Args:
+            path (str): API resource path
+            params (dict): query parameters dictionary for passed-in path
+            decode (callable): function decoding the raw bytes of a page (default: JSON decoder of the Api object)
+        Returns:
+            pages (async generator): parsed JSON response pages (dict), yielded as soon as each page is received
+        """
+
+        return self._get_pages(self._url(path), params, decode=decode)
+
+    async def _get_pages(self, url: str, params: dict, decode=None):
+        """
+        Asynchronous generator behind iter_pages and get_request, sends one request per cursor page
+
+        Args:
+            url (str): complete url (host + path) for the request
+            params (dict): query parameters
+            decode (callable): function decoding the raw bytes of a page (default: JSON decoder of the Api object)
+        Returns:
+            pages (async generator): parsed JSON response pages (dict)
+        """
+
+        if decode is None:
+            decode = self._decode
+
+        limit_max = self.limit_max
+        if params is not None:
+            params = dict(params)
+            params['limit'] = limit_max
+
+        hooks = self.hooks
+        cursor = True
+
+        while cursor:
+            start = time.perf_counter()
+            response = await self._send(url, params)
+            response.raise_for_status()
+            content = response.content
+            response = decode(content)
+
+            if hooks is not None:
+                hooks.page(self._endpoint_path(url), self._records(response), len(content),
+                           time.perf_counter() - start)
+
+            if 'cursor' in response:
+                params = {
+                    'cursor': response['cursor'],
+                    'limit': limit_max,
+                }
+            else:
+                cursor = False
+
+            yield response
+
+    async def _send(self, url: str, params: dict = None, headers: dict = None, method: str = 'GET',
+                    payload: dict = None, idempotent: bool = True):
+        """
+        Sends a single request over the pooled client, once the rate limiter allows it. Rate limited, failing or
+        timed out requests are retried with the same parameters, according to the retry policy.
+
+        Args:
+            url (str): complete url (host + path) for the request
+            params (dict): query parameters
+            headers (dict): additional request headers
+            method (str): HTTP method
+            payload (dict): JSON body of the request
+            idempotent (bool): if False, only rate limited requests (never processed by the API) are retried
+        Returns:
+            response (httpx.Response): raw HTTP response (the last one, if all retries failed)
+        Notes:
+            The rate limiter (reservations and the remaining budget reported to the hooks) is consulted from a worker
+            thread, as it may block (e.g. SQLiteTokenBucket), and throttling waits are awaited: the event loop is never
+            blocked.
+        """
+
+        import httpx
+
+        if headers is None:
+            headers = self._header
+        else:
+            headers = {**self._header, **headers}
+
+        loop = asyncio.get_running_loop()
+
+        hooks = self.hooks
+        path = self._endpoint_path(url) if hooks is not None else None
+
+        retries = 0
+        while True:
+            delay = await loop.run_in_executor(None, self.rate_limiter.reserve)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if hooks is not None:
+                if delay > 0:
+                    hooks.throttle_wait(path, delay, await self._remaining(loop))
+                hooks.request_start(path, retries)
+                start = time.perf_counter()
+
+            try:
+                if method == 'GET':
+                    response = await self.session.get(url, headers=headers, params=params)
+                else:
+                    response = await self.session.request(method, url, headers=headers, params=params, json=payload)
+            except (httpx.TransportError, httpx.TimeoutException):
+                if hooks is not None:
+                    hooks.request_end(path, None, time.perf_counter() - start, 0, await self._remaining(loop))
+                if not idempotent or not self.retry.should_retry('connection_error', retries):
+                    raise
+                delay = self.retry.delay(retries)
+                if hooks is not None:
+                    hooks.retry(path, 'connection_error', retries, delay)
+                await asyncio.sleep(delay)
+                retries += 1
+                continue
+
+            if hooks is not None:
+                hooks.request_end(path, response.status_code, time.perf_counter() - start, len(response.content),
+                                  await self._remaining(loop))
+
+            status_class = self.retry.status_class(response.status_code)
+            if not idempotent and status_class != 'rate_limited':
+                status_class = None
+            if not self.retry.should_retry(status_class, retries):
+                return response
+
+            delay = self.retry.delay(retries, response.headers.get('Retry-After'))
+            if delay is None:
+                # The server asks to wait longer than the retry policy allows, fail fast
+                return response
+            if hooks is not None:
+                hooks.retry(path, status_class, retries, delay)
+            await asyncio.sleep(delay)
+            retries += 1
+
+    async def _remaining(self, loop) -> int:
+        """
+        Remaining request budget reported to the hooks, read from a worker thread as the rate limiter may block (e.g.
+        SQLiteTokenBucket)
+        """
+
+        return await loop.run_in_executor(None, lambda: self.rate_limiter.remaining)
+
+    async def write_request(self, method: str, url: str, payload: dict = None, params: dict = None,
+                            idempotent: bool = False) -> dict:
+        """
+        POST, PUT, PATCH and DELETE method for API requests, see Api.write_request
+
+        Args:
+            method (str): HTTP method (POST, PUT, PATCH or DELETE)
+            url (str): complete url (host + path) for the request
+            payload (dict): JSON body of the request
+            params (dict): query parameters
+            idempotent (bool): whether the request can be safely sent twice
+        Returns:
+            response (dict): parsed JSON response (empty for responses without body)
+        """
+
+        response = await self._send(url, params=params, method=method.upper(), payload=payload,
+                                    idempotent=idempotent)
+        response.raise_for_status()
+
+        if self.cache is not None:
+            self.cache.invalidate(self._cache_key(url))
+            if isinstance(payload, dict) and payload.get('id') is not None:
+                self.cache.invalidate(self._cache_key(f'{url}/{payload["id"]}'))
+
+        if not response.content:
+            return dict()
+
+        return self._decode(response.content)
+
+    async def cached_get_request(self, url: str) -> dict:
+        """
+        GET method for single-resource requests, served from the response cache while fresh, see
+        Api.cached_get_request
+
+        Args:
+            url (str): complete url (host + path) for the request
+        Returns:
+            response (dict): parsed JSON response
+        """
+
+        key = self._cache_key(url)
+        entry = self.cache.lookup(key)
+        if entry is not None and entry.fresh:
+            return entry.response
+
+        headers = dict()
+        if entry is not None:
+            if entry.etag is not None:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified is not None:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        response = await self._send(url, headers=headers)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.revalidated(key, entry)
+            return entry.response
+
+        response.raise_for_status()
+        data = self._decode(response.content)
+        self.cache.set(key, data, etag=response.headers.get('ETag'),
+                       last_modified=response.headers.get('Last-Modified'))
+
+        return data
+
+    async def get_request(self, url: str, params: dict) -> dict:
+        """
+        GET method for API requests
+
+        Args:
+            url (str): complete url (host + path) for the request
+            params (dict): query parameters
+        Returns:
+            response (dict): parse JSON response
+        Notes:
+            Function maximizes query limit to maximum available (250) and merges multiple responses if response
+            size is larger than maximum (250)
+        """
+
+        response_full = dict()
+
+        async for response in self._get_pages(url, params):
+            self._merge(response_full, response)
+
+        return response_full
@@ -0,0 +1,101 @@
+"""
+The AsyncClient class is the asyncio counterpart of the Client class: it encapsulates the asynchronous endpoints of the
+Loyverse API, sharing one pooled connection and one rate limit budget between them.
+
+The AsyncClient class exposes the following end-points
+
+* receipts
+* customers
+"""
+
+from loyverse.async_api import AsyncApi
+from loyverse.throttle import RateLimiter
+from loyverse.cache import ResponseCache
+from loyverse.retry import RetryPolicy
+from loyverse.metrics import Hooks
+
+
+class AsyncClient:
+    """Loyverse API asyncio client
+
+    Args:
+        access_token (str): Access token string to be used to initialize the client
+        pool_size (int): maximum number of pooled connections shared by all endpoints
+        keep_alive (bool): reuse connections between requests (default: True)
+        timeout (tuple): connect and read timeouts in seconds
+        rate_limiter (loyverse.throttle.RateLimiter): request rate limiter shared by all endpoints
+        cache (loyverse.cache.ResponseCache): opt-in cache for single-resource lookups (e.g. get_by_id)
+        retry (loyverse.retry.RetryPolicy): retry policy for rate limited, failing or timed out requests
+        decoder (str): JSON decoder backend (orjson, msgspec or json), default: fastest installed backend
+        url (str): root url of the API (default: https://api.loyverse.com/v1.0)
+        hooks (loyverse.metrics.Hooks): instrumentation hooks, e.g. a loyverse.metrics.MetricsCollector
+    """
+
+    def __init__(self, access_token: str = None, pool_size: int = 10, keep_alive: bool = True,
+                 timeout: tuple = (10, 60), rate_limiter: RateLimiter = None, cache: ResponseCache = None,
+                 retry: RetryPolicy = None, decoder: str = None, url: str = None, hooks: Hooks = None):
+
+        self._api = AsyncApi(access_token=access_token, pool_size=pool_size, keep_alive=keep_alive, timeout=timeout,
+                             rate_limiter=rate_limiter, cache=cache, retry=retry, decoder=decoder, url=url,
+                             hooks=hooks)
+
+        self._customers = None
+        self._receipts = None
+
+    async def request(self, method: str, path: str, params: dict = None, payload: dict = None,
+                      idempotent: bool = False):
+        """
+        Client general request, payload is the JSON body of write requests (see Api.write_request)
+        """
+
+        return await self._api.request(method, path, params=params, payload=payload, idempotent=idempotent)
+
+    @property
+    def rate_limit_remaining(self) -> int:
+        """
+        Number of requests that can be sent right away without being throttled
+        """
+
+        return self._api.rate_limit_remaining
+
+    async def close(self):
+        """
+        Closes the connection pool shared by all endpoints
+        """
+
+        await self._api.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def customers(self):
+        """
+        Customers endpoint
+
+        Returns:
+            customers (loyverse.endpoints.AsyncCustomers): asynchronous Customer endpoint wrapper
+        """
+
+        if self._customers is None:
+            from loyverse.endpoints import AsyncCustomers
+            self._customers = AsyncCustomers(self._api)
+        return self._customers
+
+    @property
+    def receipts(self):
+        """
+        Receipts endpoint
+
+        Returns:
+            receipts (loyverse.endpoints.AsyncReceipts): asynchronous Receipts endpoint wrapper
+        """
+
+        if self._receipts is None:
+            from loyverse.endpoints import AsyncReceipts
+            self._receipts = AsyncReceipts(self._api)
+
+        return self._receipts
@@ -0,0 +1,130 @@
+"""
+Checkpointed, resumable backfills of receipts
+
+A backfill walks through a date range in consecutive time windows (oldest first) and follows the pagination cursors
+of each window. After every page handed to the sink, its progress is stored in a small JSON state file: the query,
+the current time window, the cursor of the next page and the number of receipts written. Running the same backfill
+again with the same state file resumes right after the last page handed to the sink.
+
+A page is checkpointed once the sink returns, hence a process killed while the sink is writing a page gets that page
+again on resume: sinks should upsert receipts (e.g. loyverse.store.ReceiptStore.upsert) to avoid duplicates.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from loyverse.utils.dates import utc_isoformat, parse_isoformat, day_start, day_end
+
+
+class Backfill:
+    """
+    Resumable backfill of receipts over a date range
+
+    Args:
+        receipts (loyverse.endpoints.Receipts): receipts endpoint
+        state_path (str): path of the JSON state file (created if it does not exist)
+        start_date (datetime): start date, including time-zone info
+        end_date (datetime): end date, including time-zone info (default: end date stored in the state file, UTC now
+            for a new backfill)
+        window (timedelta): size of the time windows the date range is split into
+        query: additional query arguments, same as for Receipts.get_by_query (e.g. store_id)
+    """
+
+    def __init__(self, receipts, state_path: str, start_date: datetime, end_date: datetime = None,
+                 window: timedelta = timedelta(days=1), **query):
+
+        if 'created_at_min' in query or 'created_at_max' in query or 'cursor' in query:
+            raise ValueError('The date range of a backfill is defined by start_date and end_date.')
+
+        self._receipts = receipts
+        self.state_path = state_path
+        self.window = window
+        self.query = query
+
+        self.state = self._load()
+        query_params = receipts._params(**query)
+        query_params.pop('limit', None)
+
+        if end_date is None:
+            end = self.state['end'] if self.state is not None else utc_isoformat(datetime.now(timezone.utc))
+        else:
+            end = utc_isoformat(day_end(end_date))
+
+        job = {
+            'start': utc_isoformat(day_start(start_date)),
+            'end': end,
+            'window': window.total_seconds(),
+            'query': query_params,
+        }
+
+        if self.state is None:
+            self.state = {**job, 'window_start': job['start'], 'cursor': None, 'written': 0, 'done': False}
+            self._save()
+        elif {key: self.state[key] for key in job} != job:
+            raise ValueError(f'State file {state_path} belongs to a different backfill, use a new state file.')
+
+    @property
+    def written(self) -> int:
+        """
+        Number of receipts handed to the sink so far, over all runs
+        """
+
+        return self.state['written']
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the whole date range has been backfilled
+        """
+
+        return self.state['done']
+
+    def _load(self):
+        if not os.path.exists(self.state_path):
+            return None
+
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def _save(self) -> None:
+        with open(f'{self.state_path}.tmp', 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(f'{self.state_path}.tmp', self.state_path)
+
+    def run(self, sink) -> int:
+        """
+        Runs (or resumes) the backfill
+
+        Args:
+            sink (callable): function sink(receipts) called with the list of receipts of every page
+        Returns:
+            count (int): number of receipts handed to the sink during this run
+        """
+
+        count = 0
+        end = parse_isoformat(self.state['end'])
+        # Windows do not overlap, the API filters are inclusive on both ends
+        resolution = timedelta(milliseconds=1)
+
+        while not self.state['done']:
+            window_start = parse_isoformat(self.state['window_start'])
+            window_end = min(end, window_start + self.window)
+
+            if self.state['cursor'] is not None:
+                params = {'cursor': self.state['cursor']}
+            else:
+                window_max = window_end if window_end == end else window_end - resolution
+                params = self._receipts._params(created_at_min=window_start, created_at_max=window_max, **self.query)
+
+            for page in self._receipts._api.iter_pages(self._receipts._path, params=params):
+                sink(page['receipts'])
+                count += len(page['receipts'])
+
+                self.state['written'] += len(page['receipts'])
+                self.state['cursor'] = page.get('cursor')
+                if self.state['cursor'] is None:
+                    self.state['window_start'] = utc_isoformat(window_end)
+                    self.state['done'] = window_end >= end
+                self._save()
+
+        return count
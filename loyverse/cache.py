@@ -0,0 +1,215 @@
+"""
+Response cache for single-resource lookups (e.g. Customers.get_by_id, Receipts.get_by_id)
+
+The cache keeps the most recently used responses in memory (LRU, bounded in size) and optionally on disk. Entries expire
+after a time to live; expired entries carrying an ETag or Last-Modified header are revalidated with a conditional
+request (If-None-Match / If-Modified-Since), which only costs a 304 response when the resource did not change.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheEntry:
+    """
+    Cached response with its expiry time and validators
+    """
+
+    __slots__ = ('response', 'expires', 'etag', 'last_modified')
+
+    def __init__(self, response: dict, expires: float, etag: str = None, last_modified: str = None):
+        self.response = response
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL/LRU response cache with an optional on-disk tier
+
+    Args:
+        maxsize (int): maximum number of responses kept in memory, least recently used ones are evicted first
+        ttl (float): time to live of a cached response in seconds, before it has to be revalidated
+        directory (str): if provided, responses are also stored as JSON files in this directory, shared between runs
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300., directory: str = None):
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.directory = directory
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + '.json')
+
+    def _load(self, key: str):
+        """
+        Loads an entry from the on-disk tier
+        """
+
+        if self.directory is None:
+            return None
+
+        try:
+            with open(self._path(key)) as f:
+                return CacheEntry(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        """
+        Keeps an entry in memory as most recently used, evicting the least recently used entries
+        """
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        """
+        Stores an entry in memory (evicting the least recently used entries) and on disk
+        """
+
+        self._remember(key, entry)
+
+        if self.directory is not None:
+            path = self._path(key)
+            with open(f'{path}.tmp', 'w') as f:
+                json.dump(entry.to_dict(), f)
+            os.replace(f'{path}.tmp', path)
+
+    def lookup(self, key: str):
+        """
+        Looks up a response, counting a hit if a fresh response is cached and a miss otherwise
+
+        Args:
+            key (str): cache key (access token fingerprint and request url, see Api._cache_key)
+        Returns:
+            entry (CacheEntry): cached entry (possibly expired, to be revalidated), None if nothing is cached
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._load(key)
+
+            if entry is not None:
+                self._remember(key, entry)
+
+            if entry is not None and entry.fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        return entry
+
+    def set(self, key: str, response: dict, etag: str = None, last_modified: str = None) -> None:
+        """
+        Caches a response
+
+        Args:
+            key (str): cache key
+            response (dict): parsed JSON response
+            etag (str): ETag header of the response
+            last_modified (str): Last-Modified header of the response
+        """
+
+        with self._lock:
+            self._store(key, CacheEntry(response, time.time() + self.ttl, etag=etag, last_modified=last_modified))
+
+    def revalidated(self, key: str, entry: CacheEntry) -> None:
+        """
+        Extends the lifetime of an entry confirmed unchanged by the server (304 Not Modified)
+
+        Args:
+            key (str): cache key
+            entry (CacheEntry): revalidated entry
+        """
+
+        with self._lock:
+            self.revalidations += 1
+            entry.expires = time.time() + self.ttl
+            self._store(key, entry)
+
+    def invalidate(self, key: str) -> None:
+        """
+        Removes a cached response (in memory and on disk), e.g. after the object was modified
+
+        Args:
+            key (str): cache key
+        """
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+            if self.directory is not None:
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+
+    def clear(self) -> None:
+        """
+        Removes all cached responses (in memory and on disk) and resets the counters
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.revalidations = self.evictions = 0
+
+            if self.directory is not None:
+                # Temporary files are left behind by writes interrupted before their atomic rename
+                for filename in os.listdir(self.directory):
+                    if filename.endswith(('.json', '.json.tmp')):
+                        try:
+                            os.remove(os.path.join(self.directory, filename))
+                        except FileNotFoundError:
+                            pass
+
+    def stats(self) -> dict:
+        """
+        Cache counters, to tune the cache size and time to live
+
+        Returns:
+            stats (dict): hits, misses, revalidations, evictions, number of cached responses and hit ratio
+        """
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'hit_ratio': self.hits / lookups if lookups else 0.,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,145 @@
+"""
+In-memory snapshot of the catalog (reference data) of a merchant
+
+A CatalogSnapshot holds items, variants, categories, stores, employees, taxes, discounts, payment types and inventory
+levels, indexed in dictionaries. Joining receipts with catalog data (e.g. the category of a line item or the name of a
+store) is then a local lookup instead of one API request per object.
+
+Snapshots are loaded with Client.catalog_snapshot, which fetches all catalog endpoints concurrently.
+
+Indexes:
+
+* items, variants, categories, stores, employees, taxes, discounts, payment_types: objects by ID
+* variants_by_sku: variants by SKU
+* variants_by_item: variants by item ID
+* inventory: stock levels (in_stock) by (variant ID, store ID)
+"""
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from loyverse.endpoints.catalog import Items, Variants, Categories, Stores, Employees, Taxes, Discounts, PaymentTypes
+
+# Object field holding the object ID, by catalog endpoint key
+_id_keys = {endpoint.key: endpoint.id_key for endpoint in (Items, Variants, Categories, Stores, Employees, Taxes,
+                                                           Discounts, PaymentTypes)}
+
+
+def _index(objects: dict, key: str) -> dict:
+    """
+    Objects of a catalog endpoint key by ID
+    """
+
+    id_key = _id_keys[key]
+    return {obj[id_key]: obj for obj in objects.get(key, [])}
+
+
+class CatalogSnapshot:
+    """
+    Indexed catalog of a merchant
+
+    Args:
+        objects (dict): lists of objects by catalog endpoint key (items, variants, categories, stores, employees, taxes,
+            discounts, payment_types and inventory_levels), missing keys are treated as empty
+    """
+
+    keys = ('items', 'variants', 'categories', 'stores', 'employees', 'taxes', 'discounts', 'payment_types',
+            'inventory_levels')
+
+    def __init__(self, objects: dict):
+
+        self.items = _index(objects, 'items')
+        self.categories = _index(objects, 'categories')
+        self.stores = _index(objects, 'stores')
+        self.employees = _index(objects, 'employees')
+        self.taxes = _index(objects, 'taxes')
+        self.discounts = _index(objects, 'discounts')
+        self.payment_types = _index(objects, 'payment_types')
+
+        # Variants are also embedded in items, the variants endpoint holds the complete objects
+        variant_key = Variants.id_key
+        self.variants = dict()
+        for item_id, item in self.items.items():
+            for variant in item.get('variants') or []:
+                self.variants[variant[variant_key]] = {'item_id': item_id, **variant}
+        self.variants.update(_index(objects, 'variants'))
+
+        self.variants_by_sku = dict()
+        self.variants_by_item = defaultdict(list)
+        for variant in self.variants.values():
+            if variant.get('sku') is not None:
+                self.variants_by_sku[variant['sku']] = variant
+            self.variants_by_item[variant.get('item_id')].append(variant)
+
+        self.inventory = {(level['variant_id'], level['store_id']): level.get('in_stock')
+                          for level in objects.get('inventory_levels', [])}
+
+    @classmethod
+    def fetch(cls, endpoints: dict, workers: int = 4):
+        """
+        Loads all catalog endpoints concurrently
+
+        Args:
+            endpoints (dict): catalog endpoints (loyverse.endpoints.catalog.CatalogEndpoint) by key
+            workers (int): number of endpoints fetched concurrently (sharing the rate limit budget of the client)
+        Returns:
+            snapshot (CatalogSnapshot): indexed catalog
+        """
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {key: executor.submit(endpoint.get_all) for key, endpoint in endpoints.items()}
+            return cls({key: future.result() for key, future in futures.items()})
+
+    def __len__(self) -> int:
+        return sum(len(index) for index in (self.items, self.variants, self.categories, self.stores, self.employees,
+                                            self.taxes, self.discounts, self.payment_types, self.inventory))
+
+    def item(self, item_id: str) -> dict:
+        """
+        Item with the given ID, None if not in the catalog
+        """
+
+        return self.items.get(item_id)
+
+    def variant(self, variant_id: str = None, sku: str = None) -> dict:
+        """
+        Variant with the given ID or SKU, None if not in the catalog
+        """
+
+        if variant_id is not None:
+            return self.variants.get(variant_id)
+
+        return self.variants_by_sku.get(sku)
+
+    def category(self, item_id: str) -> dict:
+        """
+        Category of the item with the given ID, None if the item is not in the catalog or has no category
+        """
+
+        item = self.items.get(item_id)
+        if item is None or item.get('category_id') is None:
+            return None
+
+        return self.categories.get(item['category_id'])
+
+    def join_line_item(self, line_item: dict, store_id: str = None) -> dict:
+        """
+        Catalog data of a receipt line item
+
+        Args:
+            line_item (dict): line item of a receipt (with item_id and variant_id)
+            store_id (str): store of the receipt, to look up the store and the stock level
+        Returns:
+            data (dict): item, variant, category and store objects (None if not in the catalog) and the stock level of
+                the variant in the store (in_stock, None if unknown)
+        """
+
+        item_id = line_item.get('item_id')
+        variant_id = line_item.get('variant_id')
+
+        return {
+            'item': self.items.get(item_id),
+            'variant': self.variants.get(variant_id),
+            'category': self.category(item_id),
+            'store': self.stores.get(store_id),
+            'in_stock': self.inventory.get((variant_id, store_id)),
+        }
@@ -6,9 +6,16 @@ The Client class exposes the following end-points
 
 * receipts
 * customers
+* items, variants, categories, stores, employees, taxes, discounts, payment_types and inventory (catalog)
+
+The catalog_snapshot method loads all catalog end-points concurrently into an indexed in-memory snapshot.
 """
 
 from loyverse.api import Api
+from loyverse.throttle import RateLimiter
+from loyverse.cache import ResponseCache
+from loyverse.retry import RetryPolicy
+from loyverse.metrics import Hooks
 
 
 class Client:
@@ -16,11 +23,24 @@ class Client:
 
     Args:
         access_token (str): Access token string to be used to initialize the client
+        pool_size (int): maximum number of pooled connections shared by all endpoints
+        keep_alive (bool): reuse connections between requests (default: True)
+        timeout (tuple): connect and read timeouts in seconds
+        rate_limiter (loyverse.throttle.RateLimiter): request rate limiter shared by all endpoints
+        cache (loyverse.cache.ResponseCache): opt-in cache for single-resource lookups (e.g. get_by_id)
+        retry (loyverse.retry.RetryPolicy): retry policy for rate limited, failing or timed out requests
+        decoder (str): JSON decoder backend (orjson, msgspec or json), default: fastest installed backend
+        url (str): root url of the API (default: https://api.loyverse.com/v1.0)
+        hooks (loyverse.metrics.Hooks): instrumentation hooks, e.g. a loyverse.metrics.MetricsCollector
     """
 
-    def __init__(self, access_token: str = None):
+    def __init__(self, access_token: str = None, pool_size: int = 10, keep_alive: bool = True,
+                 timeout: tuple = (10, 60), rate_limiter: RateLimiter = None, cache: ResponseCache = None,
+                 retry: RetryPolicy = None, decoder: str = None, url: str = None, hooks: Hooks = None):
 
-        self._api = Api(access_token=access_token)
+        self._api = Api(access_token=access_token, pool_size=pool_size, keep_alive=keep_alive, timeout=timeout,
+                        rate_limiter=rate_limiter, cache=cache, retry=retry, decoder=decoder, url=url,
+                        hooks=hooks)
 
         self._categories = None
         self._customers = None
@@ -39,12 +59,33 @@ class Client:
         self._taxes = None
         self._variants = None
 
-    def request(self, method: str, path: str, params: dict = None):
+    def request(self, method: str, path: str, params: dict = None, payload: dict = None, idempotent: bool = False):
+        """
+        Client general request, payload is the JSON body of write requests (see Api.write_request)
+        """
+
+        return self._api.request(method, path, params=params, payload=payload, idempotent=idempotent)
+
+    @property
+    def rate_limit_remaining(self) -> int:
+        """
+        Number of requests that can be sent right away without being throttled
+        """
+
+        return self._api.rate_limit_remaining
+
+    def close(self):
         """
-        Client general request
+        Closes the connection pool shared by all endpoints
         """
 
-        return self._api.request(method, path, params=params)
+        self._api.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     @property
     def customers(self):
@@ -74,3 +115,156 @@ class Client:
             self._receipts = Receipts(self._api)
 
         return self._receipts
+
+    @property
+    def categories(self):
+        """
+        Categories endpoint
+
+        Returns:
+            categories (loyverse.endpoints.Categories): Categories endpoint wrapper
+        """
+
+        if self._categories is None:
+            from loyverse.endpoints import Categories
+            self._categories = Categories(self._api)
+
+        return self._categories
+
+    @property
+    def discounts(self):
+        """
+        Discounts endpoint
+
+        Returns:
+            discounts (loyverse.endpoints.Discounts): Discounts endpoint wrapper
+        """
+
+        if self._discounts is None:
+            from loyverse.endpoints import Discounts
+            self._discounts = Discounts(self._api)
+
+        return self._discounts
+
+    @property
+    def employees(self):
+        """
+        Employees endpoint
+
+        Returns:
+            employees (loyverse.endpoints.Employees): Employees endpoint wrapper
+        """
+
+        if self._employees is None:
+            from loyverse.endpoints import Employees
+            self._employees = Employees(self._api)
+
+        return self._employees
+
+    @property
+    def inventory(self):
+        """
+        Inventory levels endpoint
+
+        Returns:
+            inventory (loyverse.endpoints.Inventory): Inventory levels endpoint wrapper
+        """
+
+        if self._inventory is None:
+            from loyverse.endpoints import Inventory
+            self._inventory = Inventory(self._api)
+
+        return self._inventory
+
+    @property
+    def items(self):
+        """
+        Items endpoint
+
+        Returns:
+            items (loyverse.endpoints.Items): Items endpoint wrapper
+        """
+
+        if self._items is None:
+            from loyverse.endpoints import Items
+            self._items = Items(self._api)
+
+        return self._items
+
+    @property
+    def payment_types(self):
+        """
+        Payment types endpoint
+
+        Returns:
+            payment_types (loyverse.endpoints.PaymentTypes): Payment types endpoint wrapper
+        """
+
+        if self._payments is None:
+            from loyverse.endpoints import PaymentTypes
+            self._payments = PaymentTypes(self._api)
+
+        return self._payments
+
+    @property
+    def stores(self):
+        """
+        Stores endpoint
+
+        Returns:
+            stores (loyverse.endpoints.Stores): Stores endpoint wrapper
+        """
+
+        if self._stores is None:
+            from loyverse.endpoints import Stores
+            self._stores = Stores(self._api)
+
+        return self._stores
+
+    @property
+    def taxes(self):
+        """
+        Taxes endpoint
+
+        Returns:
+            taxes (loyverse.endpoints.Taxes): Taxes endpoint wrapper
+        """
+
+        if self._taxes is None:
+            from loyverse.endpoints import Taxes
+            self._taxes = Taxes(self._api)
+
+        return self._taxes
+
+    @property
+    def variants(self):
+        """
+        Variants endpoint
+
+        Returns:
+            variants (loyverse.endpoints.Variants): Variants endpoint wrapper
+        """
+
+        if self._variants is None:
+            from loyverse.endpoints import Variants
+            self._variants = Variants(self._api)
+
+        return self._variants
+
+    def catalog_snapshot(self, workers: int = 4):
+        """
+        Loads the catalog (items, variants, categories, stores, employees, taxes, discounts, payment types and
+        inventory levels) concurrently into an indexed in-memory snapshot
+
+        Args:
+            workers (int): number of catalog endpoints fetched concurrently (sharing the rate limit budget)
+        Returns:
+            snapshot (loyverse.catalog.CatalogSnapshot): catalog objects indexed by ID, SKU and variant
+        """
+
+        from loyverse.catalog import CatalogSnapshot
+
+        endpoints = (self.items, self.variants, self.categories, self.stores, self.employees, self.taxes,
+                     self.discounts, self.payment_types, self.inventory)
+
+        return CatalogSnapshot.fetch({endpoint.key: endpoint for endpoint in endpoints}, workers=workers)
@@ -0,0 +1,79 @@
+"""
+JSON decoders for API responses
+
+Responses are decoded straight from the raw response bytes, without an intermediate text copy. The fastest available
+backend is used by default: orjson, then msgspec, falling back to the standard library json module.
+
+Available backends:
+
+* orjson: install with ``pip install orjson``
+* msgspec: install with ``pip install msgspec``
+* json: standard library
+"""
+
+import json
+
+backends = ('orjson', 'msgspec', 'json')
+
+
+def _orjson():
+    import orjson
+    return orjson.loads
+
+
+def _msgspec():
+    import msgspec
+    return msgspec.json.Decoder().decode
+
+
+def _json():
+    return json.loads
+
+
+_loaders = {
+    'orjson': _orjson,
+    'msgspec': _msgspec,
+    'json': _json,
+}
+
+
+def available_backends() -> list:
+    """
+    Decoder backends installed in the current environment
+
+    Returns:
+        backends (list): names of the available backends, fastest first
+    """
+
+    available = []
+    for backend in backends:
+        try:
+            _loaders[backend]()
+        except ImportError:
+            continue
+        available.append(backend)
+
+    return available
+
+
+def get_decoder(backend: str = None):
+    """
+    JSON decoder function for raw response bytes
+
+    Args:
+        backend (str): decoder backend (orjson, msgspec or json), default: fastest available backend
+    Returns:
+        decode (callable): function decode(content) returning the parsed JSON object of the passed in bytes
+    """
+
+    if backend is None:
+        for backend in backends:
+            try:
+                return _loaders[backend]()
+            except ImportError:
+                continue
+
+    if backend not in _loaders:
+        raise ValueError(f'Unknown decoder backend {backend}, available backends are: {", ".join(backends)}.')
+
+    return _loaders[backend]()
@@ -1,4 +1,7 @@
-from loyverse.endpoints.receipts import Receipts
-from loyverse.endpoints.customers import Customers
+from loyverse.endpoints.receipts import Receipts, AsyncReceipts
+from loyverse.endpoints.customers import Customers, AsyncCustomers
+from loyverse.endpoints.catalog import Items, Variants, Categories, Stores, Employees, Taxes, Discounts, PaymentTypes, \
+    Inventory
 
-__all__ = ('Receipts', 'Customers',)
+__all__ = ('Receipts', 'Customers', 'AsyncReceipts', 'AsyncCustomers', 'Items', 'Variants', 'Categories', 'Stores',
+           'Employees', 'Taxes', 'Discounts', 'PaymentTypes', 'Inventory',)
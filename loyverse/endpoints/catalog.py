@@ -0,0 +1,282 @@
+"""
+Catalog (reference data) endpoint wrapper classes
+
+Endpoints:
+
+* Items: items of the catalog, with their variants
+* Variants: item variants (SKU, barcode, prices per store)
+* Categories: item categories
+* Stores: stores of the merchant
+* Employees: employees of the merchant
+* Taxes: taxes applied to items
+* Discounts: discounts available at the point of sale
+* PaymentTypes: payment types available at the point of sale
+* Inventory: stock levels by variant and store
+
+Possible requests (all endpoints):
+
+* get_by_query: get objects that respect passed in query parameters (filters listed in the class docstrings)
+* get_by_id: get object with a given ID (all endpoints but Inventory)
+* get_all: get all objects (deleted objects excluded)
+* iter_by_query: streaming version of get_by_query, yielding objects page by page
+
+Inventory levels are updated in bulk with Inventory.update.
+
+Catalogs change rarely and are small compared to receipts. Client.catalog_snapshot loads all of them concurrently into a
+loyverse.catalog.CatalogSnapshot, indexing objects to join receipts with catalog data locally.
+"""
+
+from datetime import datetime
+from loyverse.api import Api
+from loyverse.utils.dates import utc_isoformat
+from loyverse.utils.chunks import send_many
+
+
+class CatalogEndpoint:
+    """
+    Base class of the catalog endpoints
+
+    Subclasses define the resource path, the response key holding the list of objects and the supported query
+    filters. Endpoints of objects identified by a single ID derive from CatalogObjectEndpoint instead.
+    """
+
+    path = None
+    key = None
+    filters = ()
+
+    def __init__(self, api: Api):
+        self._api = api
+        self._path = self.path
+
+    def _params(self, limit: int = 250, cursor: str = None, **query) -> dict:
+        """
+        Formats query arguments into query parameters: lists are joined by commas, dates are formatted in ISO format
+        (UTC) and booleans in lower case
+
+        Args:
+            limit (int): maximum number of objects to return per request (1 to 250)
+            cursor (str): token to get continuation of return list for requests exceeding limits
+            query: query filters, see the class docstring for the filters supported by the endpoint
+        Returns:
+            params (dict): query parameters
+        """
+
+        params = dict()
+
+        for name, value in query.items():
+            if name not in self.filters:
+                raise ValueError(f'Unknown filter {name} for {self.path}, available filters are: '
+                                 f'{", ".join(self.filters)}.')
+            if value is None:
+                continue
+
+            if isinstance(value, (list, tuple, set)):
+                value = ','.join(value)
+            elif isinstance(value, datetime):
+                value = utc_isoformat(value)
+            elif isinstance(value, bool):
+                value = str(value).lower()
+            params[name] = value
+
+        if limit is not None:
+            params['limit'] = limit
+
+        if cursor is not None:
+            params['cursor'] = cursor
+
+        return params
+
+    def get_by_query(self, limit: int = 250, cursor: str = None, **query) -> dict:
+        """
+        Retrieves objects that respect the specific query criteria passed in
+
+        Args:
+            limit (int): maximum number of objects to return per request (1 to 250)
+            cursor (str): token to get continuation of return list for requests exceeding limits
+            query: query filters, see the class docstring for the filters supported by the endpoint
+        Returns:
+            response (dict): formatted objects information (JSON), under the endpoint key (e.g. items)
+        """
+
+        return self._api.request('GET', self._path, params=self._params(limit=limit, cursor=cursor, **query))
+
+    def get_all(self) -> list:
+        """
+        Retrieves all objects of the endpoint, deleted objects excluded
+
+        Returns:
+            objects (list): objects (dict)
+        """
+
+        return self.get_by_query().get(self.key, [])
+
+    def iter_by_query(self, **query):
+        """
+        Iterates over objects that respect the specific query criteria passed in, requesting the next page only once
+        all objects of the current page have been consumed.
+
+        Args:
+            query: query arguments, same as for get_by_query
+        Returns:
+            objects (generator): objects (dict)
+        """
+
+        for page in self._api.iter_pages(self._path, params=self._params(**query)):
+            yield from page.get(self.key, [])
+
+
+class CatalogObjectEndpoint(CatalogEndpoint):
+    """
+    Base class of the catalog endpoints of objects identified by an ID (the object field id_key), adding the
+    single-object request
+    """
+
+    id_key = 'id'
+
+    def get_by_id(self, object_id: str) -> dict:
+        """
+        Retrieves the object with a specific ID
+
+        Args:
+            object_id (str): string uniquely identifying the object to be retrieved
+        Returns:
+            response (dict): formatted object information (JSON)
+        """
+
+        return self._api.request('GET', f'{self._path}/{object_id}', cached=True)
+
+
+_dates = ('created_at_min', 'created_at_max', 'updated_at_min', 'updated_at_max')
+
+
+class Items(CatalogObjectEndpoint):
+    """
+    Items endpoint wrapper, filters: items_ids, created_at_min, created_at_max, updated_at_min, updated_at_max,
+    show_deleted
+    """
+
+    path = 'items'
+    key = 'items'
+    filters = ('items_ids',) + _dates + ('show_deleted',)
+
+
+class Variants(CatalogObjectEndpoint):
+    """
+    Variants endpoint wrapper, filters: variant_ids, items_ids, sku, created_at_min, created_at_max, updated_at_min,
+    updated_at_max, show_deleted
+    """
+
+    path = 'variants'
+    key = 'variants'
+    id_key = 'variant_id'
+    filters = ('variant_ids', 'items_ids', 'sku') + _dates + ('show_deleted',)
+
+
+class Categories(CatalogObjectEndpoint):
+    """
+    Categories endpoint wrapper, filters: categories_ids, show_deleted
+    """
+
+    path = 'categories'
+    key = 'categories'
+    filters = ('categories_ids', 'show_deleted')
+
+
+class Stores(CatalogObjectEndpoint):
+    """
+    Stores endpoint wrapper, filters: store_ids, show_deleted
+    """
+
+    path = 'stores'
+    key = 'stores'
+    filters = ('store_ids', 'show_deleted')
+
+
+class Employees(CatalogObjectEndpoint):
+    """
+    Employees endpoint wrapper, filters: employee_ids, created_at_min, created_at_max, updated_at_min, updated_at_max,
+    show_deleted
+    """
+
+    path = 'employees'
+    key = 'employees'
+    filters = ('employee_ids',) + _dates + ('show_deleted',)
+
+
+class Taxes(CatalogObjectEndpoint):
+    """
+    Taxes endpoint wrapper, filters: tax_ids, created_at_min, created_at_max, updated_at_min, updated_at_max,
+    show_deleted
+    """
+
+    path = 'taxes'
+    key = 'taxes'
+    filters = ('tax_ids',) + _dates + ('show_deleted',)
+
+
+class Discounts(CatalogObjectEndpoint):
+    """
+    Discounts endpoint wrapper, filters: discount_ids, created_at_min, created_at_max, updated_at_min,
+    updated_at_max, show_deleted
+    """
+
+    path = 'discounts'
+    key = 'discounts'
+    filters = ('discount_ids',) + _dates + ('show_deleted',)
+
+
+class PaymentTypes(CatalogObjectEndpoint):
+    """
+    Payment types endpoint wrapper, filters: payment_type_ids, created_at_min, created_at_max, updated_at_min,
+    updated_at_max, show_deleted
+    """
+
+    path = 'payment_types'
+    key = 'payment_types'
+    filters = ('payment_type_ids',) + _dates + ('show_deleted',)
+
+
+class Inventory(CatalogEndpoint):
+    """
+    Inventory levels endpoint wrapper, filters: store_ids, variant_ids, updated_at_min, updated_at_max
+
+    Inventory levels are identified by variant and store, there is no single-object request.
+    """
+
+    path = 'inventory'
+    key = 'inventory_levels'
+    filters = ('store_ids', 'variant_ids', 'updated_at_min', 'updated_at_max')
+    batch_size = 250
+    required = ('variant_id', 'store_id', 'stock_after')
+
+    def update(self, levels: list, workers: int = 4) -> dict:
+        """
+        Sets the stock levels of variants in stores, in batches of up to 250 levels (the maximum accepted by the API)
+        sent concurrently within the rate limit budget
+
+        Args:
+            levels (list): inventory levels (dict) holding variant_id, store_id and stock_after (absolute stock level)
+            workers (int): number of batches sent concurrently
+        Returns:
+            response (dict): updated inventory levels (inventory_levels) and failure reports (failed) holding the
+                rejected level, the HTTP status (None if not sent or no response) and the error message
+        Notes:
+            Levels missing a required field are reported as failed without being sent. Batches rejected by the API
+            are split until the rejected levels are isolated, all other levels are still updated.
+        """
+
+        valid, failed = [], []
+        for level in levels:
+            missing = [field for field in self.required if level.get(field) is None]
+            if missing:
+                failed.append({'record': level, 'status': None, 'error': f'Missing fields: {", ".join(missing)}'})
+            else:
+                valid.append(level)
+
+        def send(batch: list) -> list:
+            response = self._api.request('POST', self._path, payload={self.key: batch}, idempotent=True)
+            return response.get(self.key, batch)
+
+        results = send_many(send, valid, batch_size=self.batch_size, workers=workers)
+
+        return {self.key: results['succeeded'], 'failed': failed + results['failed']}
@@ -5,41 +5,44 @@ Possible requests:
 
 * get_by_query: get customers that respect passed in query parameters
 * get_by_id: get customer with given customer ID
+* get_many: get customers for many customer IDs, in concurrent batches
 * get_by_email: get customer with given email
 * get_by_creation_date: get customers created at specific date
 * get_by_creation_dates: get customers created between specific dates
+* iter_by_query, iter_by_creation_dates: streaming versions of the above, yielding customers page by page
+* iter_models: streaming of customers decoded into typed models (loyverse.models.Customer)
+* create_or_update: create a customer, or update it if the customer holds an ID
+* upsert_many: create or update many customers, concurrently
+* delete: delete customer with given customer ID
+
+The AsyncCustomers class exposes the same requests as coroutines and asynchronous generators.
 """
 
-from datetime import datetime, timezone
+import asyncio
+from datetime import datetime, timedelta, timezone
 from loyverse.api import Api
+from loyverse.async_api import AsyncApi
 from loyverse.utils.dates import utc_isoformat, day_start, day_end
+from loyverse.utils.shards import fetch_sharded, fetch_sharded_async
+from loyverse.utils.chunks import fetch_many, pack_ids, send_many, send_many_async
 
 
-class Customers:
+class CustomersBase:
+    """
+    Base class of the blocking and asynchronous customers endpoints, sharing the formatting of query parameters
+    """
 
     def __init__(self, api: Api):
         self._api = api
         self._path = 'customers'
 
-    def get_by_query(self, customer_ids: list = None, email: str = None,
-                     created_at_min: datetime = None, created_at_max: datetime = None,
-                     updated_at_min: datetime = None, updated_at_max: datetime = None,
-                     limit: int = 250, cursor: str = None) -> dict:
+    @staticmethod
+    def _params(customer_ids: list = None, email: str = None,
+                created_at_min: datetime = None, created_at_max: datetime = None,
+                updated_at_min: datetime = None, updated_at_max: datetime = None,
+                limit: int = 250, cursor: str = None) -> dict:
         """
-        Retrieves customers that respect the specific query criteria passed in. A detailed description of the query
-        parameters is available `here <https://developer.loyverse.com/docs/#tag/Customers/paths/~1customers/get>`_.
-
-        Args:
-            customer_ids (list): filter customers by customer id
-            email (str): filter customer by email
-            created_at_min (datetime): filter customers created after this date (includes timezone info)
-            created_at_max (datetime): filter customers created before this date (includes timezone info)
-            updated_at_min (datetime): filter customers updated after this date (includes timezone info)
-            updated_at_max (datetime): filter customers updated before this date (includes timezone info)
-            limit (int): maximum number of customers to return per request (1 to 250)
-            cursor (str): token to get continuation of return list for requests exceeding limits
-        Returns:
-            response (dict): formatted customers information (JSON)
+        Formats query arguments into query parameters, see get_by_query for a description of the arguments
         """
 
         params = dict()
@@ -68,6 +71,36 @@ class Customers:
         if cursor is not None:
             params['cursor'] = cursor
 
+        return params
+
+
+class Customers(CustomersBase):
+
+    def get_by_query(self, customer_ids: list = None, email: str = None,
+                     created_at_min: datetime = None, created_at_max: datetime = None,
+                     updated_at_min: datetime = None, updated_at_max: datetime = None,
+                     limit: int = 250, cursor: str = None) -> dict:
+        """
+        Retrieves customers that respect the specific query criteria passed in. A detailed description of the query
+        parameters is available `here <https://developer.loyverse.com/docs/#tag/Customers/paths/~1customers/get>`_.
+
+        Args:
+            customer_ids (list): filter customers by customer id
+            email (str): filter customer by email
+            created_at_min (datetime): filter customers created after this date (includes timezone info)
+            created_at_max (datetime): filter customers created before this date (includes timezone info)
+            updated_at_min (datetime): filter customers updated after this date (includes timezone info)
+            updated_at_max (datetime): filter customers updated before this date (includes timezone info)
+            limit (int): maximum number of customers to return per request (1 to 250)
+            cursor (str): token to get continuation of return list for requests exceeding limits
+        Returns:
+            response (dict): formatted customers information (JSON)
+        """
+
+        params = self._params(customer_ids=customer_ids, email=email, created_at_min=created_at_min,
+                              created_at_max=created_at_max, updated_at_min=updated_at_min,
+                              updated_at_max=updated_at_max, limit=limit, cursor=cursor)
+
         return self._api.request('GET', self._path, params=params)
 
     def get_by_id(self, customer_id: str) -> dict:
@@ -80,7 +113,57 @@ class Customers:
             response (dict): formatted customer information (JSON)
         """
 
-        return self._api.request('GET', f'{self._path}/{customer_id}')
+        return self._api.request('GET', f'{self._path}/{customer_id}', cached=True)
+
+    def get_many(self, customer_ids: list, workers: int = 4) -> dict:
+        """
+        Retrieves customers for a list of customer IDs of any length. IDs are de-duplicated and packed into batches
+        fitting in the request url, batches are requested concurrently (within the rate limit budget).
+
+        Args:
+            customer_ids (list): IDs of the customers to be retrieved
+            workers (int): number of batches requested concurrently
+        Returns:
+            response (dict): customers keyed by customer ID (customers) and customer IDs not found (missing)
+        """
+
+        def fetch(batch: list) -> list:
+            return self.get_by_query(customer_ids=batch)['customers']
+
+        results = fetch_many(fetch, customer_ids, key='id', workers=workers)
+
+        return {'customers': results['found'], 'missing': results['missing']}
+
+    def iter_by_query(self, **query):
+        """
+        Iterates over customers that respect the specific query criteria passed in, requesting the next page only once
+        all customers of the current page have been consumed.
+
+        Args:
+            query: query arguments, same as for get_by_query
+        Returns:
+            customers (generator): customer objects (dict)
+        """
+
+        for page in self._api.iter_pages(self._path, params=self._params(**query)):
+            yield from page['customers']
+
+    def iter_models(self, **query):
+        """
+        Iterates over customers that respect the specific query criteria passed in, decoding each page directly into
+        typed models (loyverse.models.Customer) holding only the fields defined in loyverse.endpoints.fields
+
+        Args:
+            query: query arguments, same as for get_by_query
+        Returns:
+            customers (generator): Customer models
+        """
+
+        from loyverse.models import page_decoder
+
+        decode = page_decoder('customers')
+        for page in self._api.iter_pages(self._path, params=self._params(**query), decode=decode):
+            yield from page['customers']
 
     def get_by_email(self, email: str) -> dict:
         """
@@ -109,13 +192,17 @@ class Customers:
                                  )
         return data
 
-    def get_by_creation_dates(self, start_date: datetime, end_date: datetime = None) -> dict:
+    def get_by_creation_dates(self, start_date: datetime, end_date: datetime = None, window: timedelta = None,
+                              workers: int = 4) -> dict:
         """
         Retrieve customers information for a creation date range
 
         Args:
             start_date (datetime): datetime object representing starting day in question (including time zone info)
             end_date (datetime): datetime object for end-date (default: UTC now)
+            window (timedelta): if provided, splits the date range into time windows fetched concurrently, starting
+                with windows of this size and adapting it to the density of customers
+            workers (int): number of windows fetched concurrently (only used with window)
         Returns:
             response (dict): formatted customers information (JSON)
         """
@@ -123,9 +210,278 @@ class Customers:
         if end_date is None:
             end_date = datetime.now(timezone.utc)
 
-        data = self.get_by_query(created_at_min=day_start(start_date),
-                                 created_at_max=day_end(end_date),
-                                 )
-        return data
+        if window is None:
+            data = self.get_by_query(created_at_min=day_start(start_date),
+                                     created_at_max=day_end(end_date),
+                                     )
+            return data
+
+        def fetch(window_start: datetime, window_end: datetime, _) -> list:
+            return self.get_by_query(created_at_min=window_start, created_at_max=window_end)['customers']
+
+        customers = fetch_sharded(fetch, day_start(start_date), day_end(end_date), window, key='id',
+                                  workers=workers)
+
+        return {'customers': customers}
+
+    def iter_by_creation_dates(self, start_date: datetime, end_date: datetime = None):
+        """
+        Iterates over customers created in a date range
+
+        Args:
+            start_date (datetime): datetime object representing starting day in question (including time zone info)
+            end_date (datetime): datetime object for end-date (default: UTC now)
+        Returns:
+            customers (generator): customer objects (dict)
+        """
+
+        if end_date is None:
+            end_date = datetime.now(timezone.utc)
+
+        return self.iter_by_query(created_at_min=day_start(start_date), created_at_max=day_end(end_date))
+
+    def create_or_update(self, customer: dict) -> dict:
+        """
+        Creates a customer, or updates it if the customer object holds an ID
+
+        Args:
+            customer (dict): customer object, see
+                `here <https://developer.loyverse.com/docs/#tag/Customers/paths/~1customers/post>`_
+        Returns:
+            response (dict): created or updated customer information (JSON)
+        Notes:
+            Updates are retried on failures, creations only when rate limited, as a failed creation may have been
+            processed by the API.
+        """
+
+        return self._api.request('POST', self._path, payload=customer, idempotent=customer.get('id') is not None)
+
+    def upsert_many(self, customers: list, workers: int = 4) -> dict:
+        """
+        Creates or updates many customers, sent concurrently within the rate limit budget. The API accepts one
+        customer per request.
+
+        Args:
+            customers (list): customer objects, updated if holding an ID and created otherwise
+            workers (int): number of customers sent concurrently
+        Returns:
+            response (dict): created or updated customers (customers) and failure reports (failed) holding the
+                rejected customer, the HTTP status (None if no response) and the error message
+        """
+
+        def send(batch: list) -> list:
+            return [self.create_or_update(customer) for customer in batch]
+
+        results = send_many(send, customers, batch_size=1, workers=workers)
+
+        return {'customers': results['succeeded'], 'failed': results['failed']}
+
+    def delete(self, customer_id: str) -> dict:
+        """
+        Deletes the customer with specific customer ID
+
+        Args:
+            customer_id (str): string uniquely identifying the customer to be deleted
+        Returns:
+            response (dict): API response (JSON)
+        """
+
+        return self._api.request('DELETE', f'{self._path}/{customer_id}', idempotent=True)
 
     # TODO: Implement parsing to dataframes
+
+
+class AsyncCustomers(CustomersBase):
+    """
+    Asynchronous customers endpoint wrapper, the query arguments are the same as for the Customers methods
+    """
+
+    def __init__(self, api: AsyncApi):
+        super().__init__(api)
+
+    async def get_by_query(self, **query) -> dict:
+        """
+        Retrieves customers that respect the specific query criteria passed in
+
+        Args:
+            query: query arguments, same as for Customers.get_by_query
+        Returns:
+            response (dict): formatted customers information (JSON)
+        """
+
+        return await self._api.request('GET', self._path, params=self._params(**query))
+
+    async def get_by_id(self, customer_id: str) -> dict:
+        """
+        Retrieves the customer information for specific customer ID
+
+        Args:
+            customer_id (str): string uniquely identifying the customer to be retrieved
+        Returns:
+            response (dict): formatted customer information (JSON)
+        """
+
+        return await self._api.request('GET', f'{self._path}/{customer_id}', cached=True)
+
+    async def get_by_email(self, email: str) -> dict:
+        """
+        Retrieves the customer information for a user with the specific email
+
+        Args:
+            email (str): email identifying the customer to be retrieved
+        Returns:
+            response (dict): formatted customer information (JSON)
+        """
+
+        return await self.get_by_query(email=email)
+
+    async def get_by_creation_date(self, date: datetime) -> dict:
+        """
+        Retrieve customers information for a specific creation date
+
+        Args:
+            date (datetime): datetime object representing day in question (including time zone info)
+        Returns:
+            response (dict): formatted customers information (JSON)
+        """
+
+        return await self.get_by_query(created_at_min=day_start(date), created_at_max=day_end(date))
+
+    async def get_by_creation_dates(self, start_date: datetime, end_date: datetime = None, window: timedelta = None,
+                                    workers: int = 4) -> dict:
+        """
+        Retrieve customers information for a creation date range
+
+        Args:
+            start_date (datetime): datetime object representing starting day in question (including time zone info)
+            end_date (datetime): datetime object for end-date (default: UTC now)
+            window (timedelta): if provided, splits the date range into time windows fetched concurrently, see
+                Customers.get_by_creation_dates
+            workers (int): number of windows fetched concurrently (only used with window)
+        Returns:
+            response (dict): formatted customers information (JSON)
+        """
+
+        if end_date is None:
+            end_date = datetime.now(timezone.utc)
+
+        if window is None:
+            return await self.get_by_query(created_at_min=day_start(start_date), created_at_max=day_end(end_date))
+
+        async def fetch(window_start: datetime, window_end: datetime, _) -> list:
+            response = await self.get_by_query(created_at_min=window_start, created_at_max=window_end)
+            return response['customers']
+
+        customers = await fetch_sharded_async(fetch, day_start(start_date), day_end(end_date), window, key='id',
+                                              workers=workers)
+
+        return {'customers': customers}
+
+    def iter_by_creation_dates(self, start_date: datetime, end_date: datetime = None):
+        """
+        Iterates asynchronously over customers created in a date range
+
+        Args:
+            start_date (datetime): datetime object representing starting day in question (including time zone info)
+            end_date (datetime): datetime object for end-date (default: UTC now)
+        Returns:
+            customers (async generator): customer objects (dict)
+        """
+
+        if end_date is None:
+            end_date = datetime.now(timezone.utc)
+
+        return self.iter_by_query(created_at_min=day_start(start_date), created_at_max=day_end(end_date))
+
+    async def get_many(self, customer_ids: list) -> dict:
+        """
+        Retrieves customers for a list of customer IDs of any length, requesting all batches concurrently
+
+        Args:
+            customer_ids (list): customer IDs of the customers to be retrieved
+        Returns:
+            response (dict): customers keyed by customer ID (customers) and customer IDs not found (missing)
+        """
+
+        ids = list(dict.fromkeys(customer_ids))
+        pages = await asyncio.gather(*(self.get_by_query(customer_ids=batch) for batch in pack_ids(ids)))
+
+        found = {obj['id']: obj for page in pages for obj in page['customers']}
+
+        return {'customers': found, 'missing': [id_ for id_ in ids if id_ not in found]}
+
+    async def create_or_update(self, customer: dict) -> dict:
+        """
+        Creates a customer, or updates it if the customer object holds an ID
+
+        Args:
+            customer (dict): customer object, same as for Customers.create_or_update
+        Returns:
+            response (dict): created or updated customer information (JSON)
+        """
+
+        return await self._api.request('POST', self._path, payload=customer,
+                                       idempotent=customer.get('id') is not None)
+
+    async def upsert_many(self, customers: list, workers: int = 4) -> dict:
+        """
+        Creates or updates many customers, at most workers requests at once within the rate limit budget
+
+        Args:
+            customers (list): customer objects, updated if holding an ID and created otherwise
+            workers (int): number of customers sent concurrently
+        Returns:
+            response (dict): created or updated customers (customers) and failure reports (failed), same as for
+                Customers.upsert_many
+        """
+
+        async def send(batch: list) -> list:
+            return [await self.create_or_update(customer) for customer in batch]
+
+        results = await send_many_async(send, customers, batch_size=1, workers=workers)
+
+        return {'customers': results['succeeded'], 'failed': results['failed']}
+
+    async def delete(self, customer_id: str) -> dict:
+        """
+        Deletes the customer with specific customer ID
+
+        Args:
+            customer_id (str): string uniquely identifying the customer to be deleted
+        Returns:
+            response (dict): API response (JSON)
+        """
+
+        return await self._api.request('DELETE', f'{self._path}/{customer_id}', idempotent=True)
+
+    async def iter_by_query(self, **query):
+        """
+        Iterates asynchronously over customers that respect the specific query criteria passed in
+
+        Args:
+            query: query arguments, same as for Customers.get_by_query
+        Returns:
+            customers (async generator): customer objects (dict)
+        """
+
+        async for page in self._api.iter_pages(self._path, params=self._params(**query)):
+            for customer in page['customers']:
+                yield customer
+
+    async def iter_models(self, **query):
+        """
+        Iterates asynchronously over customers that respect the specific query criteria passed in, decoded into typed
+        models (loyverse.models.Customer)
+
+        Args:
+            query: query arguments, same as for Customers.get_by_query
+        Returns:
+            customers (async generator): Customer models
+        """
+
+        from loyverse.models import page_decoder
+
+        decode = page_decoder('customers')
+        async for page in self._api.iter_pages(self._path, params=self._params(**query), decode=decode):
+            for customer in page['customers']:
+                yield customer
@@ -31,3 +31,28 @@ receipt.item = ['item_id', 'variant_id', 'item_name', 'variant_name', 'sku', 'qu
 receipt.payment = ['payment_type_id', 'name', 'type', 'money_amount', 'paid_at']
 
 receipt.payment_details = ['authorization_code', 'reference_id', 'entry_method', 'card_company', 'card_number']
+
+# Column types of the extracted fields (string, double or timestamp), fields not listed are strings
+receipt.types = {
+    'created_at': 'timestamp', 'updated_at': 'timestamp', 'receipt_date': 'timestamp', 'cancelled_at': 'timestamp',
+    'paid_at': 'timestamp',
+    'total_money': 'double', 'total_tax': 'double', 'points_earned': 'double', 'points_deducted': 'double',
+    'points_balance': 'double', 'total_discount': 'double', 'tip': 'double', 'surcharge': 'double',
+    'quantity': 'double', 'price': 'double', 'gross_total_money': 'double', 'cost': 'double', 'cost_total': 'double',
+    'money_amount': 'double',
+}
+
+# Identifier and enumeration columns stored as categoricals in dataframes
+receipt.categorical = ['store_id', 'employee_id', 'pos_device_id', 'receipt_type', 'dining_option', 'source', 'item_id',
+                       'variant_id', 'payment_type_id', 'type', 'entry_method', 'card_company']
+
+customer = AttributeDict()
+customer.customer = ['id', 'name', 'email', 'phone_number', 'address', 'city', 'region', 'postal_code', 'country_code',
+                     'note', 'customer_code', 'first_visit', 'last_visit', 'total_visits', 'total_spent',
+                     'total_points', 'created_at', 'updated_at', 'deleted_at']
+
+customer.types = {
+    'first_visit': 'timestamp', 'last_visit': 'timestamp', 'created_at': 'timestamp', 'updated_at': 'timestamp',
+    'deleted_at': 'timestamp',
+    'total_visits': 'double', 'total_spent': 'double', 'total_points': 'double',
+}
@@ -5,47 +5,51 @@ Possible requests:
 
 * get_by_query: get receipts that respect passed in query parameters
 * get_by_id: get receipt with a given ID
+* get_many: get receipts for many receipt numbers, in concurrent batches
 * get_by_date: get receipts for a given date
 * get_by_dates: get receipts between two dates
+* iter_by_query, iter_by_date, iter_by_dates: streaming versions of the above, yielding receipts page by page
+* iter_models: streaming of receipts decoded into typed models (loyverse.models.Receipt)
+* sync: incrementally synchronize receipts into a local SQLite store
+* backfill: checkpointed, resumable retrieval of receipts over long date ranges
+* export_parquet: stream receipts into partitioned Parquet datasets
+* iter_dataframes: streaming of receipts formatted into dataframes, chunk by chunk
+* aggregate: streaming aggregation of sales totals by configurable dimensions
+
+The AsyncReceipts class exposes the same requests (get_* and iter_*) as coroutines and asynchronous generators.
+
+pandas is only imported by the dataframe methods (to_dataframes, iter_dataframes), fetching receipts does not require
+it.
 """
 
-import pandas as pd
-from datetime import datetime, timezone
+import asyncio
+from operator import itemgetter
+from datetime import datetime, timedelta, timezone
 from loyverse.api import Api
-from loyverse.utils.dates import utc_isoformat, day_start, day_end
+from loyverse.async_api import AsyncApi
+from loyverse.utils.dates import utc_isoformat, parse_isoformat, to_timezone, day_start, day_end
+from loyverse.utils.shards import fetch_sharded, fetch_sharded_async
+from loyverse.utils.chunks import chunked, fetch_many, pack_ids
 from loyverse.endpoints.fields import receipt as fields
 
 
-class Receipts:
+class ReceiptsBase:
+    """
+    Base class of the blocking and asynchronous receipts endpoints, sharing the formatting of query parameters
+    """
 
     def __init__(self, api: Api):
         self._api = api
         self._path = 'receipts'
 
-    def get_by_query(self, receipt_numbers: list = None, since_receipt_number: str = None,
-                     before_receipt_number: str = None, store_id: str = None, order: str = None, source: str = None,
-                     updated_at_min: datetime = None, updated_at_max: datetime = None,
-                     created_at_min: datetime = None, created_at_max: datetime = None, limit: int = 250,
-                     cursor: str = None) -> dict:
+    @staticmethod
+    def _params(receipt_numbers: list = None, since_receipt_number: str = None, before_receipt_number: str = None,
+                store_id: str = None, order: str = None, source: str = None,
+                updated_at_min: datetime = None, updated_at_max: datetime = None,
+                created_at_min: datetime = None, created_at_max: datetime = None, limit: int = 250,
+                cursor: str = None) -> dict:
         """
-        Retrieves receipts that respect the specific query criteria passed in. A detailed description of the query 
-        parameters is available `here <https://developer.loyverse.com/docs/#tag/Receipts/paths/~1receipts/get>`_.
-
-        Args:
-            receipt_numbers (list): filter receipts by receipt numbers
-            since_receipt_number (str): return only receipts after this receipt number
-            before_receipt_number (str): return only receipts before this receipt number
-            store_id (str): filter receipts by store id
-            order (str): filter receipts by order
-            source (str): filter receipts by source (e.g. My app)
-            updated_at_min (datetime): filter receipts updated after this date (includes timezone info)
-            updated_at_max (datetime): filter receipts updated before this date (includes timezone info)
-            created_at_min (datetime): filter receipts created after this date (includes timezone info)
-            created_at_max (datetime): filter receipts created before this date (includes timezone info)
-            limit (int): maximum number of receipts to return per request (1 to 250)
-            cursor (str): token to get continuation of return list for requests exceeding limits
-        Returns:
-            response (dict): formatted receipts information (JSON)
+        Formats query arguments into query parameters, see get_by_query for a description of the arguments
         """
 
         params = dict()
@@ -86,6 +90,42 @@ class Receipts:
         if cursor is not None:
             params['cursor'] = cursor
 
+        return params
+
+
+class Receipts(ReceiptsBase):
+
+    def get_by_query(self, receipt_numbers: list = None, since_receipt_number: str = None,
+                     before_receipt_number: str = None, store_id: str = None, order: str = None, source: str = None,
+                     updated_at_min: datetime = None, updated_at_max: datetime = None,
+                     created_at_min: datetime = None, created_at_max: datetime = None, limit: int = 250,
+                     cursor: str = None) -> dict:
+        """
+        Retrieves receipts that respect the specific query criteria passed in. A detailed description of the query 
+        parameters is available `here <https://developer.loyverse.com/docs/#tag/Receipts/paths/~1receipts/get>`_.
+
+        Args:
+            receipt_numbers (list): filter receipts by receipt numbers
+            since_receipt_number (str): return only receipts after this receipt number
+            before_receipt_number (str): return only receipts before this receipt number
+            store_id (str): filter receipts by store id
+            order (str): filter receipts by order
+            source (str): filter receipts by source (e.g. My app)
+            updated_at_min (datetime): filter receipts updated after this date (includes timezone info)
+            updated_at_max (datetime): filter receipts updated before this date (includes timezone info)
+            created_at_min (datetime): filter receipts created after this date (includes timezone info)
+            created_at_max (datetime): filter receipts created before this date (includes timezone info)
+            limit (int): maximum number of receipts to return per request (1 to 250)
+            cursor (str): token to get continuation of return list for requests exceeding limits
+        Returns:
+            response (dict): formatted receipts information (JSON)
+        """
+
+        params = self._params(receipt_numbers=receipt_numbers, since_receipt_number=since_receipt_number,
+                              before_receipt_number=before_receipt_number, store_id=store_id, order=order,
+                              source=source, updated_at_min=updated_at_min, updated_at_max=updated_at_max,
+                              created_at_min=created_at_min, created_at_max=created_at_max, limit=limit,
+                              cursor=cursor)
         response = self._api.request('GET', self._path, params=params)
 
         return response
@@ -100,7 +140,40 @@ class Receipts:
             response (dict): formatted receipt information (JSON)
         """
 
-        return self._api.request('GET', f'{self._path}/{receipt_id}')
+        return self._api.request('GET', f'{self._path}/{receipt_id}', cached=True)
+
+    def get_many(self, receipt_numbers: list, workers: int = 4) -> dict:
+        """
+        Retrieves receipts for a list of receipt numbers of any length. Receipt numbers are de-duplicated and packed
+        into batches fitting in the request url, batches are requested concurrently (within the rate limit budget).
+
+        Args:
+            receipt_numbers (list): receipt numbers of the receipts to be retrieved
+            workers (int): number of batches requested concurrently
+        Returns:
+            response (dict): receipts keyed by receipt number (receipts) and receipt numbers not found (missing)
+        """
+
+        def fetch(batch: list) -> list:
+            return self.get_by_query(receipt_numbers=batch)['receipts']
+
+        results = fetch_many(fetch, receipt_numbers, key='receipt_number', workers=workers)
+
+        return {'receipts': results['found'], 'missing': results['missing']}
+
+    def iter_by_query(self, **query):
+        """
+        Iterates over receipts that respect the specific query criteria passed in, requesting the next page only once
+        all receipts of the current page have been consumed.
+
+        Args:
+            query: query arguments, same as for get_by_query
+        Returns:
+            receipts (generator): receipt objects (dict)
+        """
+
+        for page in self._api.iter_pages(self._path, params=self._params(**query)):
+            yield from page['receipts']
 
     def get_by_date(self, date: datetime) -> dict:
         """
@@ -117,24 +190,248 @@ class Receipts:
                                  )
         return data
 
-    def get_by_dates(self, start_date: datetime, end_date: datetime = None) -> dict:
+    def get_by_dates(self, start_date: datetime, end_date: datetime = None, window: timedelta = None,
+                     store_ids: list = None, workers: int = 4) -> dict:
         """
         Retrieves receipts information for a specific date interval.
 
         Args:
             start_date (datetime): start date, including time-zone info
             end_date (datetime): end date, including time-zone info (if not provided, defaults to UTC now)
+            window (timedelta): if provided, splits the date interval into time windows fetched concurrently, starting
+                with windows of this size and adapting it to the density of receipts
+            store_ids (list): if provided, additionally splits each time window by store ID
+            workers (int): number of windows fetched concurrently (only used with window or store_ids)
         Returns:
             response (dict): formatted receipts information (JSON)
+        Notes:
+            Concurrent windows share the rate limit budget of the client. Receipts are returned newest first, without
+            duplicates (by receipt number).
         """
 
         if end_date is None:
             end_date = datetime.now(timezone.utc)
 
-        data = self.get_by_query(created_at_min=day_start(start_date),
-                                 created_at_max=day_end(end_date),
-                                 )
-        return data
+        if window is None and store_ids is None:
+            data = self.get_by_query(created_at_min=day_start(start_date),
+                                     created_at_max=day_end(end_date),
+                                     )
+            return data
+
+        def fetch(window_start: datetime, window_end: datetime, store_id: str) -> list:
+            return self.get_by_query(created_at_min=window_start, created_at_max=window_end,
+                                     store_id=store_id)['receipts']
+
+        start_date, end_date = day_start(start_date), day_end(end_date)
+        if window is None:
+            window = end_date - start_date
+
+        receipts = fetch_sharded(fetch, start_date, end_date, window, key='receipt_number', shards=store_ids,
+                                 workers=workers)
+
+        return {'receipts': receipts}
+
+    def iter_models(self, **query):
+        """
+        Iterates over receipts that respect the specific query criteria passed in, decoding each page directly into
+        typed models (loyverse.models.Receipt) holding only the fields defined in loyverse.endpoints.fields
+
+        Args:
+            query: query arguments, same as for get_by_query
+        Returns:
+            receipts (generator): Receipt models
+        """
+
+        from loyverse.models import page_decoder
+
+        decode = page_decoder('receipts')
+        for page in self._api.iter_pages(self._path, params=self._params(**query), decode=decode):
+            yield from page['receipts']
+
+    def iter_by_date(self, date: datetime):
+        """
+        Iterates over receipts of a specific day
+
+        Args:
+            date (datetime): datetime object representing day in question (including time zone info)
+        Returns:
+            receipts (generator): receipt objects (dict)
+        """
+
+        return self.iter_by_query(created_at_min=day_start(date), created_at_max=day_end(date))
+
+    def iter_by_dates(self, start_date: datetime, end_date: datetime = None):
+        """
+        Iterates over receipts of a specific date interval
+
+        Args:
+            start_date (datetime): start date, including time-zone info
+            end_date (datetime): end date, including time-zone info (if not provided, defaults to UTC now)
+        Returns:
+            receipts (generator): receipt objects (dict)
+        """
+
+        if end_date is None:
+            end_date = datetime.now(timezone.utc)
+
+        return self.iter_by_query(created_at_min=day_start(start_date), created_at_max=day_end(end_date))
+
+    def sync(self, store_path: str, start_date: datetime = None) -> int:
+        """
+        Synchronizes receipts into a local SQLite store (see loyverse.store.ReceiptStore). Only receipts updated since
+        the last synchronization (high-water mark of updated_at) are requested, and upserted by receipt number. Pages
+        are stored as they are received, the high-water mark is only moved once all pages were stored.
+
+        Args:
+            store_path (str): path of the SQLite database file (created if it does not exist)
+            start_date (datetime): on the first synchronization, retrieve only receipts created after this date
+                (default: all receipts)
+        Returns:
+            count (int): number of receipts written to the store
+        """
+
+        from loyverse.store import ReceiptStore
+
+        count = 0
+        with ReceiptStore(store_path) as store:
+            high_water_mark = store.high_water_mark
+
+            if high_water_mark is not None:
+                query = {'updated_at_min': parse_isoformat(high_water_mark)}
+            elif start_date is not None:
+                query = {'created_at_min': start_date}
+            else:
+                query = {}
+
+            updated_at = None
+            for page in self._api.iter_pages(self._path, params=self._params(**query)):
+                count += store.upsert(page['receipts'])
+                for receipt in page['receipts']:
+                    if updated_at is None or receipt['updated_at'] > updated_at:
+                        updated_at = receipt['updated_at']
+
+            store.set_high_water_mark(updated_at)
+
+        return count
+
+    def backfill(self, state_path: str, sink, start_date: datetime, end_date: datetime = None,
+                 window: timedelta = timedelta(days=1), **query) -> int:
+        """
+        Runs or resumes a backfill of receipts, storing its progress in a state file after every page
+        (see loyverse.backfill.Backfill)
+
+        Args:
+            state_path (str): path of the JSON state file, re-use it to resume an interrupted backfill
+            sink (callable): function sink(receipts) called with the list of receipts of every page
+            start_date (datetime): start date, including time-zone info
+            end_date (datetime): end date, including time-zone info (default: stored end date when resuming, UTC now
+                otherwise)
+            window (timedelta): size of the time windows the date range is split into
+            query: additional query arguments, same as for get_by_query (e.g. store_id)
+        Returns:
+            count (int): number of receipts handed to the sink during this run
+        """
+
+        from loyverse.backfill import Backfill
+
+        return Backfill(self, state_path, start_date, end_date=end_date, window=window, **query).run(sink)
+
+    def export_parquet(self, path: str, start_date: datetime, end_date: datetime = None, chunk_size: int = 10000,
+                       timezone_id: str = None, mode: str = 'append') -> int:
+        """
+        Streams receipts of a date interval into Parquet datasets (receipts, items, payments) partitioned by receipt
+        date and store ID (see loyverse.export)
+
+        Args:
+            path (str): root directory of the datasets
+            start_date (datetime): start date, including time-zone info
+            end_date (datetime): end date, including time-zone info (if not provided, defaults to UTC now)
+            chunk_size (int): number of receipts converted and written at once, bounds the memory usage
+            timezone_id (str): timezone identifier used to compute the receipt date partition (default: UTC)
+            mode (str): append (add files to existing partitions) or replace (replace the partitions written to)
+        Returns:
+            count (int): number of receipts written
+        """
+
+        from loyverse.export import ParquetExporter
+
+        exporter = ParquetExporter(path, timezone_id=timezone_id, mode=mode)
+
+        count = 0
+        for receipts in chunked(self.iter_by_dates(start_date, end_date), chunk_size):
+            count += exporter.write(receipts)
+
+        return count
+
+    def iter_dataframes(self, start_date: datetime, end_date: datetime = None, chunk_size: int = 10000,
+                        typed: bool = False, timezone_id: str = 'UTC'):
+        """
+        Iterates over receipts of a specific date interval formatted into dataframes, chunk by chunk. Pages are only
+        requested once the previous chunk has been consumed, the memory usage is bounded by the chunk size instead of
+        the length of the date interval.
+
+        Args:
+            start_date (datetime): start date, including time-zone info
+            end_date (datetime): end date, including time-zone info (if not provided, defaults to UTC now)
+            chunk_size (int): maximum number of receipts per chunk
+            typed (bool): convert column types, see to_dataframes
+            timezone_id (str): timezone identifier of the timestamp columns, if typed (default: UTC)
+        Returns:
+            dataframes (generator): tuples (receipt_df, items_df, payments_df) of each chunk, see to_dataframes
+        Notes:
+            Categorical columns of typed chunks only hold the categories present in the chunk, use
+            pandas.api.types.union_categoricals (or convert to string) before concatenating chunks.
+        """
+
+        for receipts in chunked(self.iter_by_dates(start_date, end_date), chunk_size):
+            yield self.to_dataframes({'receipts': receipts}, typed=typed, timezone_id=timezone_id)
+
+    def aggregate(self, start_date: datetime, end_date: datetime = None, dimensions: tuple = ('day', 'store_id'),
+                  timezone_id: str = 'UTC', window: timedelta = None, workers: int = 4):
+        """
+        Aggregates sales of a date interval while streaming the receipts, without keeping them in memory (see
+        loyverse.aggregate.SalesAggregator)
+
+        Args:
+            start_date (datetime): start date, including time-zone info
+            end_date (datetime): end date, including time-zone info (if not provided, defaults to UTC now)
+            dimensions (tuple): dimensions of the aggregation keys (e.g. day, store_id, item_id, payment_type)
+            timezone_id (str): timezone of the day and hour dimensions (default: UTC)
+            window (timedelta): if provided, splits the date interval into time windows aggregated concurrently, the
+                partial aggregates are then merged
+            workers (int): number of windows aggregated concurrently (only used with window)
+        Returns:
+            aggregator (loyverse.aggregate.SalesAggregator): aggregated totals, see its results method
+        """
+
+        from concurrent.futures import ThreadPoolExecutor
+        from loyverse.aggregate import SalesAggregator
+
+        if end_date is None:
+            end_date = datetime.now(timezone.utc)
+
+        if window is None:
+            return SalesAggregator(dimensions, timezone_id=timezone_id).update(self.iter_by_dates(start_date, end_date))
+
+        start, end = day_start(start_date), day_end(end_date)
+        windows = []
+        while start < end:
+            windows.append((start, min(end, start + window)))
+            start += window
+
+        def aggregate(bounds: tuple):
+            window_start, window_end = bounds
+            # Windows do not overlap, the API filters are inclusive on both ends
+            window_max = window_end if window_end == end else window_end - timedelta(milliseconds=1)
+            receipts = self.iter_by_query(created_at_min=window_start, created_at_max=window_max)
+            return SalesAggregator(dimensions, timezone_id=timezone_id).update(receipts)
+
+        aggregator = SalesAggregator(dimensions, timezone_id=timezone_id)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for partial in executor.map(aggregate, windows):
+                aggregator.merge(partial)
+
+        return aggregator
 
     @staticmethod
     def _receipt_to_dataframes(receipt: dict):
@@ -152,72 +449,287 @@ class Receipts:
         if 'receipts' in receipt:
             raise ValueError('Invalid receipt object passed in, should not contain - receipts - field')
 
-        id_key = 'receipt_number'
+        return Receipts.to_dataframes(receipt)
 
-        receipt_df = pd.DataFrame({key: receipt[key] for key in fields.receipt}, index=[0])
+    @staticmethod
+    def _to_rows(receipts: list) -> tuple:
+        """
+        Flattens receipts into rows of receipts, line items and payments, in a single pass over the receipts
 
-        items_df = []
-        for line_item in receipt['line_items']:
-            item = {key: line_item[key] for key in fields.item}
-            item[id_key] = receipt[id_key]
-            item = pd.DataFrame(item, index=[0])
-            items_df.append(item)
+        Args:
+            receipts (list): receipt objects
+        Returns:
+            receipt_rows (list): tuples of receipt values (fields.receipt)
+            item_rows (list): tuples of line item values (fields.item + receipt number)
+            payment_rows (list): tuples of payment values (fields.payment + receipt number + fields.payment_details)
+        """
 
-        items_df = pd.concat(items_df)
+        id_key = 'receipt_number'
 
-        payments_df = []
-        for payment_item in receipt['payments']:
-            payment = {key: payment_item[key] for key in fields.payment}
-            payment[id_key] = receipt[id_key]
-            details = payment_item['payment_details']
+        get_receipt = itemgetter(*fields.receipt)
+        get_item = itemgetter(*fields.item)
+        get_payment = itemgetter(*fields.payment)
+        get_details = itemgetter(*fields.payment_details)
+        no_details = (None,) * len(fields.payment_details)
 
-            if details is None:
-                payment_details = {key: None for key in fields.payment_details}
-            else:
-                payment_details = {key: details[key] for key in fields.payment_details}
+        receipt_rows = []
+        item_rows = []
+        payment_rows = []
 
-            payment = {**payment, **payment_details}
-            payment = pd.DataFrame(payment, index=[0])
-            payments_df.append(payment)
+        for receipt in receipts:
+            if 'receipts' in receipt:
+                raise ValueError('Invalid receipt object passed in, should not contain - receipts - field')
 
-        payments_df = pd.concat(payments_df)
+            number = (receipt[id_key],)
+            receipt_rows.append(get_receipt(receipt))
 
-        return receipt_df, items_df, payments_df
+            for line_item in receipt['line_items']:
+                item_rows.append(get_item(line_item) + number)
+
+            for payment in receipt['payments']:
+                details = payment['payment_details']
+                details = no_details if details is None else get_details(details)
+                payment_rows.append(get_payment(payment) + number + details)
+
+        return receipt_rows, item_rows, payment_rows
 
     @staticmethod
-    def to_dataframes(response: dict):
+    def to_dataframes(response: dict, typed: bool = False, timezone_id: str = 'UTC'):
         """
         Formats receipts API return data into three dataframes (receipts, items, payments)
 
         Args:
             response (dict): receipt endpoint response
+            typed (bool): convert timestamps to timezone-aware datetime64, money fields to float64 and identifier /
+                enumeration fields to categoricals (default: False, all values as returned by the API)
+            timezone_id (str): timezone identifier of the timestamp columns, if typed (default: UTC)
         Returns:
             receipt_df (pandas.Dataframe): receipt level information
             items_df (pandas.Dataframe): receipt items information
             payments_df (pandas.Dataframe): receipt payments information
+        Notes:
+            Receipts are flattened into columns in a single pass and each dataframe is built once from its columns
         """
 
-        receipts = []
-        items = []
-        payments = []
-
         if 'receipts' in response:
             receipts_in = response['receipts']
         else:
             receipts_in = [response]
 
-        for receipt in receipts_in:
-            receipt_df, item_df, payment_df = Receipts._receipt_to_dataframes(receipt)
-            receipts.append(receipt_df)
-            items.append(item_df)
-            payments.append(payment_df)
+        id_key = 'receipt_number'
+        receipt_rows, item_rows, payment_rows = Receipts._to_rows(receipts_in)
 
-        receipts = pd.concat(receipts)
-        items = pd.concat(items)
-        payments = pd.concat(payments)
+        receipts = Receipts._rows_to_dataframe(receipt_rows, fields.receipt)
+        items = Receipts._rows_to_dataframe(item_rows, fields.item + [id_key])
+        payments = Receipts._rows_to_dataframe(payment_rows, fields.payment + [id_key] + fields.payment_details)
 
-        receipts.reset_index(drop=True, inplace=True)
-        items.reset_index(drop=True, inplace=True)
-        payments.reset_index(drop=True, inplace=True)
+        if typed:
+            for df in (receipts, items, payments):
+                Receipts._convert_types(df, timezone_id)
 
         return receipts, items, payments
+
+    @staticmethod
+    def _convert_types(df, timezone_id: str) -> None:
+        """
+        Converts the columns of a receipts dataframe in place, using the column types defined in fields
+
+        Args:
+            df (pandas.DataFrame): receipts, items or payments dataframe
+            timezone_id (str): timezone identifier of the timestamp columns
+        """
+
+        import pandas as pd
+
+        for column in df.columns:
+            column_type = fields.types.get(column)
+
+            if column_type == 'timestamp':
+                df[column] = to_timezone(df[column], timezone_id)
+            elif column_type == 'double':
+                df[column] = pd.to_numeric(df[column], errors='coerce').astype('float64')
+            elif column in fields.categorical:
+                df[column] = df[column].astype('category')
+
+    @staticmethod
+    def _rows_to_dataframe(rows: list, columns: list):
+        """
+        Builds a dataframe from rows of values, transposing them into column lists first
+
+        Notes:
+            Columns holding missing values are pinned to the object dtype (missing values kept as None), as built by
+            concatenating one dataframe per receipt. Pandas would otherwise infer str columns holding NaN.
+        """
+
+        import pandas as pd
+
+        if rows:
+            data = dict(zip(columns, map(list, zip(*rows))))
+            data = {column: pd.Series(values, dtype=object) if None in values else values
+                    for column, values in data.items()}
+        else:
+            data = {column: [] for column in columns}
+
+        return pd.DataFrame(data, columns=columns)
+
+
+class AsyncReceipts(ReceiptsBase):
+    """
+    Asynchronous receipts endpoint wrapper, the query arguments are the same as for the Receipts methods. The
+    blocking helpers built on top of the requests (sync, backfill, export_parquet, iter_dataframes, aggregate) are
+    only available on Receipts.
+    """
+
+    to_dataframes = staticmethod(Receipts.to_dataframes)
+
+    def __init__(self, api: AsyncApi):
+        super().__init__(api)
+
+    async def get_by_query(self, **query) -> dict:
+        """
+        Retrieves receipts that respect the specific query criteria passed in
+
+        Args:
+            query: query arguments, same as for Receipts.get_by_query
+        Returns:
+            response (dict): formatted receipts information (JSON)
+        """
+
+        return await self._api.request('GET', self._path, params=self._params(**query))
+
+    async def get_by_id(self, receipt_id: str) -> dict:
+        """
+        Retrieves the receipts information for a specific receipt ID
+
+        Args:
+            receipt_id (str): string uniquely identifying the receipt to be retrieved
+        Returns:
+            response (dict): formatted receipt information (JSON)
+        """
+
+        return await self._api.request('GET', f'{self._path}/{receipt_id}', cached=True)
+
+    async def get_by_date(self, date: datetime) -> dict:
+        """
+        Retrieve receipts information for a specific day
+
+        Args:
+            date (datetime): datetime object representing day in question (including time zone info)
+        Returns:
+            response (dict): formatted receipts information (JSON)
+        """
+
+        return await self.get_by_query(created_at_min=day_start(date), created_at_max=day_end(date))
+
+    async def get_by_dates(self, start_date: datetime, end_date: datetime = None, window: timedelta = None,
+                           store_ids: list = None, workers: int = 4) -> dict:
+        """
+        Retrieves receipts information for a specific date interval.
+
+        Args:
+            start_date (datetime): start date, including time-zone info
+            end_date (datetime): end date, including time-zone info (if not provided, defaults to UTC now)
+            window (timedelta): if provided, splits the date interval into time windows fetched concurrently, see
+                Receipts.get_by_dates
+            store_ids (list): if provided, additionally splits each time window by store ID
+            workers (int): number of windows fetched concurrently (only used with window or store_ids)
+        Returns:
+            response (dict): formatted receipts information (JSON)
+        """
+
+        if end_date is None:
+            end_date = datetime.now(timezone.utc)
+
+        if window is None and store_ids is None:
+            return await self.get_by_query(created_at_min=day_start(start_date), created_at_max=day_end(end_date))
+
+        async def fetch(window_start: datetime, window_end: datetime, store_id: str) -> list:
+            response = await self.get_by_query(created_at_min=window_start, created_at_max=window_end,
+                                               store_id=store_id)
+            return response['receipts']
+
+        start_date, end_date = day_start(start_date), day_end(end_date)
+        if window is None:
+            window = end_date - start_date
+
+        receipts = await fetch_sharded_async(fetch, start_date, end_date, window, key='receipt_number',
+                                             shards=store_ids, workers=workers)
+
+        return {'receipts': receipts}
+
+    async def get_many(self, receipt_numbers: list) -> dict:
+        """
+        Retrieves receipts for a list of receipt numbers of any length, requesting all batches concurrently
+
+        Args:
+            receipt_numbers (list): receipt numbers of the receipts to be retrieved
+        Returns:
+            response (dict): receipts keyed by receipt number (receipts) and receipt numbers not found (missing)
+        """
+
+        ids = list(dict.fromkeys(receipt_numbers))
+        pages = await asyncio.gather(*(self.get_by_query(receipt_numbers=batch) for batch in pack_ids(ids)))
+
+        found = {obj['receipt_number']: obj for page in pages for obj in page['receipts']}
+
+        return {'receipts': found, 'missing': [id_ for id_ in ids if id_ not in found]}
+
+    async def iter_by_query(self, **query):
+        """
+        Iterates asynchronously over receipts that respect the specific query criteria passed in
+
+        Args:
+            query: query arguments, same as for Receipts.get_by_query
+        Returns:
+            receipts (async generator): receipt objects (dict)
+        """
+
+        async for page in self._api.iter_pages(self._path, params=self._params(**query)):
+            for receipt in page['receipts']:
+                yield receipt
+
+    def iter_by_date(self, date: datetime):
+        """
+        Iterates asynchronously over receipts of a specific day
+
+        Args:
+            date (datetime): datetime object representing day in question (including time zone info)
+        Returns:
+            receipts (async generator): receipt objects (dict)
+        """
+
+        return self.iter_by_query(created_at_min=day_start(date), created_at_max=day_end(date))
+
+    def iter_by_dates(self, start_date: datetime, end_date: datetime = None):
+        """
+        Iterates asynchronously over receipts of a specific date interval
+
+        Args:
+            start_date (datetime): start date, including time-zone info
+            end_date (datetime): end date, including time-zone info (if not provided, defaults to UTC now)
+        Returns:
+            receipts (async generator): receipt objects (dict)
+        """
+
+        if end_date is None:
+            end_date = datetime.now(timezone.utc)
+
+        return self.iter_by_query(created_at_min=day_start(start_date), created_at_max=day_end(end_date))
+
+    async def iter_models(self, **query):
+        """
+        Iterates asynchronously over receipts that respect the specific query criteria passed in, decoded into typed
+        models (loyverse.models.Receipt)
+
+        Args:
+            query: query arguments, same as for Receipts.get_by_query
+        Returns:
+            receipts (async generator): Receipt models
+        """
+
+        from loyverse.models import page_decoder
+
+        decode = page_decoder('receipts')
+        async for page in self._api.iter_pages(self._path, params=self._params(**query), decode=decode):
+            for receipt in page['receipts']:
+                yield receipt
@@ -0,0 +1,215 @@
+"""
+Export of receipts, line items and payments to partitioned Parquet datasets
+
+Receipts are converted chunk by chunk into Arrow record batches with explicit schemas (built from the fields and
+column types defined in loyverse.endpoints.fields) and written to three Parquet datasets (receipts, items, payments),
+partitioned by receipt date and store ID using the hive layout (``date=2020-10-12/store_id=.../part-....parquet``).
+Readers get column pruning from Parquet and partition pruning from the directory layout (see dataset).
+
+New files are added next to the existing ones, so appending new days never rewrites old partitions.
+
+The pyarrow package is an optional dependency, install it with ``pip install loyverse[parquet]``.
+"""
+
+import os
+import shutil
+import uuid
+import pytz
+from loyverse.endpoints.fields import receipt as fields
+from loyverse.endpoints.receipts import Receipts
+from loyverse.utils.dates import parse_isoformat
+
+tables = ('receipts', 'items', 'payments')
+partition_keys = ('date', 'store_id')
+# Directory label of missing partition values (e.g. receipts without store)
+null_fallback = '__HIVE_DEFAULT_PARTITION__'
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+    except ImportError:
+        raise ImportError('Parquet export requires the pyarrow package, install it with: pip install loyverse[parquet]')
+
+    return pyarrow
+
+
+def _columns(table: str) -> list:
+    id_key = 'receipt_number'
+
+    if table == 'receipts':
+        return list(fields.receipt)
+    if table == 'items':
+        return fields.item + [id_key]
+
+    return fields.payment + [id_key] + fields.payment_details
+
+
+def _partitioning(table_schema):
+    """
+    Hive partitioning of a table by the partition keys, labelling missing values with null_fallback
+    """
+
+    pa = _pyarrow()
+    partition_schema = pa.schema([table_schema.field(key) for key in partition_keys])
+
+    return pa.dataset.HivePartitioning(partition_schema, null_fallback=null_fallback)
+
+
+def schema(table: str):
+    """
+    Arrow schema of an exported table, including the partition columns
+
+    Args:
+        table (str): table name (receipts, items or payments)
+    Returns:
+        schema (pyarrow.Schema): table schema
+    """
+
+    pa = _pyarrow()
+    types = {
+        'string': pa.string(),
+        'double': pa.float64(),
+        'timestamp': pa.timestamp('ms', tz='UTC'),
+    }
+
+    columns = [column for column in _columns(table) if column not in partition_keys]
+    schema_fields = [pa.field(column, types[fields.types.get(column, 'string')]) for column in columns]
+
+    return pa.schema(schema_fields + [pa.field(key, pa.string()) for key in partition_keys])
+
+
+def to_record_batches(receipts: list, timezone_id: str = None) -> dict:
+    """
+    Converts receipts into one Arrow record batch per table
+
+    Args:
+        receipts (list): receipt objects
+        timezone_id (str): timezone identifier used to compute the receipt date partition (default: UTC)
+    Returns:
+        batches (dict): record batches (pyarrow.RecordBatch) by table name
+    """
+
+    pa = _pyarrow()
+    timezone = None if timezone_id is None else pytz.timezone(timezone_id)
+
+    rows = dict(zip(tables, Receipts._to_rows(receipts)))
+
+    # Partition values of each receipt, shared with its line items and payments
+    partitions = dict()
+    for receipt in receipts:
+        if timezone is None:
+            date = receipt['receipt_date'][:10]
+        else:
+            date = parse_isoformat(receipt['receipt_date']).astimezone(timezone).date().isoformat()
+        partitions[receipt['receipt_number']] = (date, receipt['store_id'])
+
+    batches = dict()
+    for table in tables:
+        table_schema = schema(table)
+        columns = _columns(table)
+        number_index = columns.index('receipt_number')
+        values = dict(zip(columns, map(list, zip(*rows[table])))) if rows[table] else {key: [] for key in columns}
+        dates, stores = zip(*(partitions[row[number_index]] for row in rows[table])) if rows[table] else ((), ())
+        values['date'], values['store_id'] = list(dates), list(stores)
+
+        arrays = []
+        for field in table_schema:
+            if pa.types.is_timestamp(field.type):
+                arrays.append(pa.array(values[field.name], pa.string()).cast(field.type))
+            else:
+                arrays.append(pa.array(values[field.name], field.type))
+
+        batches[table] = pa.RecordBatch.from_arrays(arrays, schema=table_schema)
+
+    return batches
+
+
+class ParquetExporter:
+    """
+    Writer of partitioned Parquet datasets for receipts, line items and payments
+
+    Args:
+        path (str): root directory of the datasets, each table is written to its own sub-directory
+        timezone_id (str): timezone identifier used to compute the receipt date partition (default: UTC)
+        mode (str): append (add files to existing partitions) or replace (remove the existing files of each partition
+            written to by this exporter, on first write)
+    """
+
+    def __init__(self, path: str, timezone_id: str = None, mode: str = 'append'):
+
+        if mode not in ('append', 'replace'):
+            raise ValueError('Mode has to be either append or replace.')
+
+        self.path = path
+        self.timezone_id = timezone_id
+        self.mode = mode
+        self._run = uuid.uuid4().hex
+        self._chunk = 0
+        self._replaced = set()
+
+    def write(self, receipts: list) -> int:
+        """
+        Writes a chunk of receipts to the datasets
+
+        Args:
+            receipts (list): receipt objects
+        Returns:
+            count (int): number of receipts written
+        """
+
+        if not receipts:
+            return 0
+
+        pa = _pyarrow()
+        batches = to_record_batches(receipts, timezone_id=self.timezone_id)
+
+        for table, batch in batches.items():
+            root = os.path.join(self.path, table)
+
+            if self.mode == 'replace':
+                self._replace_partitions(root, batch)
+
+            pa.dataset.write_dataset(batch, root, format='parquet', partitioning=_partitioning(batch.schema),
+                                     basename_template=f'part-{self._run}-{self._chunk}-{{i}}.parquet',
+                                     existing_data_behavior='overwrite_or_ignore')
+
+        self._chunk += 1
+
+        return len(receipts)
+
+    def _replace_partitions(self, root: str, batch) -> None:
+        """
+        Removes existing partitions of a table the first time they are written to by this exporter
+        """
+
+        dates = batch.column('date').to_pylist()
+        stores = batch.column('store_id').to_pylist()
+
+        for date, store_id in set(zip(dates, stores)):
+            store_id = null_fallback if store_id is None else store_id
+            directory = os.path.join(root, f'date={date}', f'store_id={store_id}')
+            if directory not in self._replaced:
+                self._replaced.add(directory)
+                shutil.rmtree(directory, ignore_errors=True)
+
+
+def dataset(path: str, table: str):
+    """
+    Opens an exported table as Arrow dataset, supporting column and partition pruning, e.g.
+    ``dataset(path, 'items').to_table(columns=['item_id', 'total_money'], filter=pyarrow.dataset.field('date') ==
+    '2020-10-12')``
+
+    Args:
+        path (str): root directory of the datasets
+        table (str): table name (receipts, items or payments)
+    Returns:
+        dataset (pyarrow.dataset.Dataset): partitioned dataset
+    """
+
+    pa = _pyarrow()
+    table_schema = schema(table)
+
+    return pa.dataset.dataset(os.path.join(path, table), schema=table_schema, format='parquet',
+                              partitioning=_partitioning(table_schema))
@@ -0,0 +1,263 @@
+"""
+Instrumentation hooks of the Api class and an in-memory metrics collector
+
+The Api class reports the following events to its hooks object, with the path of the endpoint relative to the API
+root url (e.g. receipts or customers/<id>):
+
+* request_start: an HTTP request is about to be sent (once per attempt)
+* request_end: an HTTP request completed, with its status, latency, response size and remaining rate limit budget
+* page: a response page was received and decoded, with its number of records
+* retry: a failed request is retried after a delay
+* throttle_wait: a request waited for the rate limiter
+
+Hooks are called on the thread (or event loop) sending the request, implementations should be fast and thread-safe.
+Subclass Hooks to forward events to a monitoring system, or use the MetricsCollector to aggregate them in memory:
+
+    metrics = MetricsCollector()
+    client = Client(hooks=metrics)
+    client.receipts.get_by_dates(start_date, end_date, window=timedelta(days=1))
+    metrics.snapshot()['receipts']['request_latency']['p95']
+"""
+
+import bisect
+import threading
+from collections import defaultdict
+
+
+class Hooks:
+    """
+    Base class of the instrumentation hooks, all events are ignored by default
+    """
+
+    def request_start(self, path: str, attempt: int) -> None:
+        """
+        Called before an HTTP request is sent
+
+        Args:
+            path (str): endpoint path (e.g. receipts)
+            attempt (int): attempt number, 0 for the first attempt and increasing with each retry
+        """
+
+    def request_end(self, path: str, status: int, latency: float, size: int, remaining: int) -> None:
+        """
+        Called once an HTTP request completed
+
+        Args:
+            path (str): endpoint path
+            status (int): HTTP status code, None if the connection failed or timed out
+            latency (float): seconds between sending the request and receiving the response
+            size (int): response body size in bytes
+            remaining (int): remaining rate limit budget of the client
+        """
+
+    def page(self, path: str, records: int, size: int, latency: float) -> None:
+        """
+        Called once a response page was received and decoded
+
+        Args:
+            path (str): endpoint path
+            records (int): number of objects in the page
+            size (int): page size in bytes
+            latency (float): seconds to get the page, including throttling, retries and decoding
+        """
+
+    def retry(self, path: str, reason: str, attempt: int, delay: float) -> None:
+        """
+        Called before a failed request is retried
+
+        Args:
+            path (str): endpoint path
+            reason (str): retry reason, the status class of loyverse.retry.RetryPolicy (e.g. rate_limited)
+            attempt (int): number of the failed attempt
+            delay (float): seconds waited before the next attempt
+        """
+
+    def throttle_wait(self, path: str, delay: float, remaining: int) -> None:
+        """
+        Called when a request has to wait for the rate limiter
+
+        Args:
+            path (str): endpoint path
+            delay (float): seconds waited
+            remaining (int): remaining rate limit budget after the wait
+        """
+
+
+class Histogram:
+    """
+    Histogram of observed values with fixed bucket bounds
+
+    Args:
+        bounds (tuple): upper bounds of the buckets, in increasing order (values above the last bound are counted in
+            an overflow bucket)
+    """
+
+    latency_bounds = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1., 2.5, 5., 10., 30., 60.)
+    size_bounds = (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6)
+
+    def __init__(self, bounds: tuple = latency_bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.
+        self.max = None
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float):
+        """
+        Estimated quantile of the observed values, as the upper bound of the bucket holding it
+
+        Args:
+            q (float): quantile between 0 and 1 (e.g. 0.95)
+        Returns:
+            value (float): quantile estimate, the largest observed value if it falls in the overflow bucket and None if
+                nothing was observed
+        """
+
+        if self.count == 0:
+            return None
+
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank and count > 0:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+
+        return self.max
+
+    def to_dict(self) -> dict:
+        """
+        Histogram summary: count, sum, mean, max, quantile estimates and cumulative bucket counts (le: less or equal)
+        """
+
+        buckets, cumulative = dict(), 0
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else None,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': buckets,
+        }
+
+
+class _EndpointMetrics:
+    """
+    Totals and histograms of a single endpoint
+    """
+
+    totals = ('requests', 'errors', 'pages', 'records', 'bytes', 'retries', 'throttle_waits', 'throttle_wait_s')
+
+    def __init__(self):
+        for total in self.totals:
+            setattr(self, total, 0)
+        self.statuses = defaultdict(int)
+        self.retry_reasons = defaultdict(int)
+        self.remaining = None
+        self.request_latency = Histogram(Histogram.latency_bounds)
+        self.page_latency = Histogram(Histogram.latency_bounds)
+        self.page_size = Histogram(Histogram.size_bounds)
+        self.throttle_wait = Histogram(Histogram.latency_bounds)
+
+    def to_dict(self) -> dict:
+        return {
+            **{total: getattr(self, total) for total in self.totals},
+            'statuses': dict(self.statuses),
+            'retry_reasons': dict(self.retry_reasons),
+            'remaining': self.remaining,
+            'request_latency': self.request_latency.to_dict(),
+            'page_latency': self.page_latency.to_dict(),
+            'page_size': self.page_size.to_dict(),
+            'throttle_wait': self.throttle_wait.to_dict(),
+        }
+
+
+class MetricsCollector(Hooks):
+    """
+    Thread-safe in-memory collector of totals and histograms per endpoint
+
+    Single-object paths are grouped by resource, e.g. receipts/1-1001 and receipts/2-1002 are both reported under
+    receipts/{id}.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = defaultdict(_EndpointMetrics)
+
+    @staticmethod
+    def endpoint(path: str) -> str:
+        """
+        Endpoint name of a request path, grouping single-object paths by resource
+        """
+
+        parts = path.strip('/').split('/')
+        if len(parts) > 1:
+            return f'{parts[0]}/{{id}}'
+        return parts[0]
+
+    def request_start(self, path: str, attempt: int) -> None:
+        with self._lock:
+            self._endpoints[self.endpoint(path)].requests += 1
+
+    def request_end(self, path: str, status: int, latency: float, size: int, remaining: int) -> None:
+        with self._lock:
+            metrics = self._endpoints[self.endpoint(path)]
+            metrics.statuses[str(status)] += 1
+            if status is None or status >= 400:
+                metrics.errors += 1
+            metrics.bytes += size
+            metrics.remaining = remaining
+            metrics.request_latency.observe(latency)
+
+    def page(self, path: str, records: int, size: int, latency: float) -> None:
+        with self._lock:
+            metrics = self._endpoints[self.endpoint(path)]
+            metrics.pages += 1
+            metrics.records += records
+            metrics.page_latency.observe(latency)
+            metrics.page_size.observe(size)
+
+    def retry(self, path: str, reason: str, attempt: int, delay: float) -> None:
+        with self._lock:
+            metrics = self._endpoints[self.endpoint(path)]
+            metrics.retries += 1
+            metrics.retry_reasons[reason] += 1
+
+    def throttle_wait(self, path: str, delay: float, remaining: int) -> None:
+        with self._lock:
+            metrics = self._endpoints[self.endpoint(path)]
+            metrics.throttle_waits += 1
+            metrics.throttle_wait_s += delay
+            metrics.remaining = remaining
+            metrics.throttle_wait.observe(delay)
+
+    def snapshot(self) -> dict:
+        """
+        Current metrics of all endpoints, as plain dictionaries ready to be exported (e.g. as JSON)
+
+        Returns:
+            metrics (dict): totals and histogram summaries by endpoint
+        """
+
+        with self._lock:
+            return {endpoint: metrics.to_dict() for endpoint, metrics in self._endpoints.items()}
+
+    def reset(self) -> None:
+        """
+        Clears all metrics
+        """
+
+        with self._lock:
+            self._endpoints.clear()
@@ -0,0 +1,188 @@
+"""
+Typed models of API objects: Receipt, LineItem, Payment, PaymentDetails and Customer
+
+Models hold the fields defined in loyverse.endpoints.fields as attributes, using compact slotted classes instead of
+dictionaries, and skip all other fields of the API objects. When the msgspec package is installed, models are msgspec
+structs and response pages are decoded directly into them, without building intermediate dictionaries. Otherwise,
+models are plain slotted classes built from the decoded dictionaries, page by page.
+
+Response pages are decoded into models with Receipts.iter_models and Customers.iter_models.
+"""
+
+from typing import Any, List, Optional
+from loyverse.decoders import get_decoder
+from loyverse.endpoints.fields import receipt as receipt_fields, customer as customer_fields
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+_types = {
+    'string': Optional[str],
+    'double': Optional[float],
+    'timestamp': Optional[str],
+}
+
+
+class Model:
+    """
+    Base class of the slotted models, used when msgspec is not installed
+    """
+
+    __slots__ = ()
+    _nested = {}
+
+    def __init__(self, **values):
+        for field in self.__slots__:
+            setattr(self, field, values.get(field))
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Builds a model from an API object, keeping only the model fields
+
+        Args:
+            data (dict): API object
+        Returns:
+            model (Model): model instance
+        """
+
+        model = cls.__new__(cls)
+        for field in cls.__slots__:
+            value = data.get(field)
+            nested = cls._nested.get(field)
+            if nested is not None and value is not None:
+                value = [nested.from_dict(item) for item in value] if isinstance(value, list) else \
+                    nested.from_dict(value)
+            setattr(model, field, value)
+
+        return model
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __repr__(self) -> str:
+        values = ', '.join(f'{field}={getattr(self, field)!r}' for field in self.__slots__)
+        return f'{type(self).__name__}({values})'
+
+
+def _define(name: str, fields: list, types: dict, nested: dict = None):
+    """
+    Defines a model class with the passed in fields, as msgspec struct if available and as slotted class otherwise
+
+    Args:
+        name (str): class name
+        fields (list): field names
+        types (dict): column type (string, double or timestamp) by field name, other fields are strings
+        nested (dict): (model class, is list) tuples by field name, for fields holding nested objects
+    Returns:
+        model (type): model class
+    """
+
+    nested = nested or dict()
+
+    if msgspec is not None:
+        annotations = [(field, _types[types.get(field, 'string')], None) for field in fields]
+        for field, (model, is_list) in nested.items():
+            annotations.append((field, List[model] if is_list else Optional[model], [] if is_list else None))
+        return msgspec.defstruct(name, annotations, module=__name__)
+
+    return type(name, (Model,), {
+        '__slots__': tuple(fields) + tuple(nested),
+        '_nested': {field: model for field, (model, _) in nested.items()},
+        '__module__': __name__,
+    })
+
+
+PaymentDetails = _define('PaymentDetails', receipt_fields.payment_details, receipt_fields.types)
+Payment = _define('Payment', receipt_fields.payment, receipt_fields.types,
+                  nested={'payment_details': (PaymentDetails, False)})
+LineItem = _define('LineItem', receipt_fields.item, receipt_fields.types)
+Receipt = _define('Receipt', receipt_fields.receipt, receipt_fields.types,
+                  nested={'line_items': (LineItem, True), 'payments': (Payment, True)})
+Customer = _define('Customer', customer_fields.customer, customer_fields.types)
+
+_models = {
+    'receipts': Receipt,
+    'customers': Customer,
+}
+
+
+def from_dict(model: type, data: dict):
+    """
+    Builds a model from an API object, keeping only the model fields
+
+    Args:
+        model (type): model class (e.g. Receipt)
+        data (dict): API object
+    Returns:
+        model: model instance
+    """
+
+    if msgspec is not None:
+        return msgspec.convert(data, model)
+
+    return model.from_dict(data)
+
+
+def to_dict(model) -> dict:
+    """
+    Converts a model (including nested models) back to a dictionary
+
+    Args:
+        model: model instance
+    Returns:
+        data (dict): model fields
+    """
+
+    if msgspec is not None:
+        return msgspec.to_builtins(model)
+
+    data = dict()
+    for field in model.__slots__:
+        value = getattr(model, field)
+        if isinstance(value, list):
+            value = [to_dict(item) if isinstance(item, Model) else item for item in value]
+        elif isinstance(value, Model):
+            value = to_dict(value)
+        data[field] = value
+
+    return data
+
+
+def page_decoder(key: str, backend: str = None):
+    """
+    Decoder of raw response pages into models
+
+    Args:
+        key (str): page key holding the list of objects (receipts or customers)
+        backend (str): JSON decoder backend used when msgspec is not installed (default: fastest installed backend)
+    Returns:
+        decode (callable): function decode(content) returning a page dictionary, with the list of models under key
+            and the cursor of the next page (if any)
+    """
+
+    model = _models[key]
+
+    if msgspec is not None:
+        page_type = msgspec.defstruct(f'{model.__name__}Page', [(key, List[model], []), ('cursor', Any, None)])
+        decoder = msgspec.json.Decoder(page_type)
+
+        def decode(content: bytes) -> dict:
+            page = decoder.decode(content)
+            objects = {key: getattr(page, key)}
+            if page.cursor is not None:
+                objects['cursor'] = page.cursor
+            return objects
+
+        return decode
+
+    decode_json = get_decoder(backend)
+
+    def decode(content: bytes) -> dict:
+        page = decode_json(content)
+        page[key] = [model.from_dict(obj) for obj in page[key]]
+        return page
+
+    return decode
@@ -0,0 +1,236 @@
+"""
+Pool of clients of many merchant accounts, with fair scheduling of jobs across accounts
+
+Each account (access token) gets its own Client, hence its own rate limit budget and connection pool. Jobs are
+functions job(client, *args, **kwargs) queued per account and run by a shared set of worker threads:
+
+* accounts with queued jobs are served in round-robin order, one job at a time
+* at most per_account jobs of the same account run at once, so that a large backfill of one merchant cannot occupy
+  all workers (blocked on its own rate limit) while jobs of other merchants wait
+* submit returns a concurrent.futures.Future holding the result of the job
+
+    with ClientPool({'north': 'token-1', 'south': 'token-2'}, workers=8) as pool:
+        futures = pool.map(lambda client: list(client.customers.iter_by_query()))
+        customers = {account: future.result() for account, future in futures.items()}
+
+Since every account has its own budget, the total throughput of the pool is the sum of the account budgets.
+"""
+
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from loyverse.client import Client
+
+# Client options that must not be shared between accounts
+_per_account = ('rate_limiter', 'cache')
+
+
+class ClientPool:
+    """
+    Clients of many merchant accounts sharing a fair job scheduler
+
+    Args:
+        access_tokens (dict): access tokens by account name (a list of tokens is accepted, tokens are then the names)
+        workers (int): number of worker threads shared by all accounts
+        per_account (int): maximum number of jobs of one account running at once
+        client_options: options passed to every Client (e.g. pool_size, retry, url, hooks). Rate limiters and caches
+            are per account, pass them to add instead.
+    """
+
+    def __init__(self, access_tokens=None, workers: int = 8, per_account: int = 2, **client_options):
+
+        if workers < 1 or per_account < 1:
+            raise ValueError('Number of workers and jobs per account have to be at least 1.')
+
+        shared = [option for option in _per_account if option in client_options]
+        if shared:
+            raise ValueError(f'Options {", ".join(shared)} cannot be shared between accounts, pass them to add.')
+
+        self.workers = workers
+        self.per_account = per_account
+        self.client_options = client_options
+
+        self.clients = OrderedDict()
+        self.stats = dict()
+        self._queues = OrderedDict()
+        self._running = dict()
+        self._turn = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._threads = []
+
+        if isinstance(access_tokens, (list, tuple)):
+            access_tokens = {token: token for token in access_tokens}
+        for account, access_token in (access_tokens or dict()).items():
+            self.add(account, access_token)
+
+    def add(self, account: str, access_token: str, **client_options) -> Client:
+        """
+        Adds an account to the pool
+
+        Args:
+            account (str): name of the account, used to submit jobs
+            access_token (str): access token of the account
+            client_options: options of the account client, overriding the pool options (e.g. rate_limiter, cache)
+        Returns:
+            client (loyverse.Client): client of the account
+        """
+
+        with self._condition:
+            if account in self.clients:
+                raise ValueError(f'Account {account} is already in the pool.')
+
+            client = Client(access_token=access_token, **{**self.client_options, **client_options})
+            self.clients[account] = client
+            self._queues[account] = deque()
+            self._running[account] = 0
+            self.stats[account] = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0}
+
+        return client
+
+    def __getitem__(self, account: str) -> Client:
+        return self.clients[account]
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def submit(self, account: str, job, *args, **kwargs) -> Future:
+        """
+        Queues a job of an account
+
+        Args:
+            account (str): name of the account
+            job (callable): function job(client, *args, **kwargs) called with the client of the account
+            args, kwargs: additional arguments of the job
+        Returns:
+            future (concurrent.futures.Future): result (or exception) of the job
+        """
+
+        future = Future()
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('Cannot submit jobs to a closed pool.')
+            if account not in self.clients:
+                raise KeyError(f'Unknown account {account}.')
+
+            self._queues[account].append((future, job, args, kwargs))
+            self.stats[account]['submitted'] += 1
+            self._start()
+            self._condition.notify()
+
+        return future
+
+    def map(self, job, *args, accounts: list = None, **kwargs) -> dict:
+        """
+        Queues the same job for many accounts
+
+        Args:
+            job (callable): function job(client, *args, **kwargs)
+            args, kwargs: additional arguments of the job
+            accounts (list): names of the accounts, keyword only (default: all accounts)
+        Returns:
+            futures (dict): futures (concurrent.futures.Future) by account name
+        """
+
+        accounts = list(self.clients) if accounts is None else accounts
+
+        return {account: self.submit(account, job, *args, **kwargs) for account in accounts}
+
+    @property
+    def queued(self) -> dict:
+        """
+        Number of queued (not yet running) jobs by account
+        """
+
+        with self._condition:
+            return {account: len(jobs) for account, jobs in self._queues.items()}
+
+    def _start(self) -> None:
+        """
+        Starts the worker threads on the first submitted job (called holding the lock)
+        """
+
+        if not self._threads:
+            for _ in range(self.workers):
+                thread = threading.Thread(target=self._work, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _next(self):
+        """
+        Takes the next job in round-robin order over the accounts with queued jobs and free slots (called holding the
+        lock)
+
+        Returns:
+            job (tuple): account, future, job, args and kwargs, None if no job can be started
+        """
+
+        accounts = list(self._queues)
+        for offset in range(len(accounts)):
+            account = accounts[(self._turn + offset) % len(accounts)]
+            if self._queues[account] and self._running[account] < self.per_account:
+                self._turn = (self._turn + offset + 1) % len(accounts)
+                self._running[account] += 1
+                return (account,) + self._queues[account].popleft()
+
+        return None
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                scheduled = self._next()
+                while scheduled is None:
+                    if self._closed and not any(self._queues.values()):
+                        return
+                    self._condition.wait()
+                    scheduled = self._next()
+
+            account, future, job, args, kwargs = scheduled
+            outcome = 'cancelled'
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = job(self.clients[account], *args, **kwargs)
+                except Exception as error:
+                    outcome = 'failed'
+                    future.set_exception(error)
+                else:
+                    outcome = 'completed'
+                    future.set_result(result)
+
+            with self._condition:
+                self._running[account] -= 1
+                self.stats[account][outcome] += 1
+                # A slot of the account was released, other workers may now pick its jobs
+                self._condition.notify_all()
+
+    def close(self, wait: bool = True, cancel: bool = False) -> None:
+        """
+        Stops accepting jobs, and closes the clients once the queued jobs are done
+
+        Args:
+            wait (bool): wait for the queued and running jobs to complete (the clients are only closed when waiting)
+            cancel (bool): cancel the queued jobs that did not start yet
+        """
+
+        with self._condition:
+            self._closed = True
+            if cancel:
+                for account, jobs in self._queues.items():
+                    while jobs:
+                        jobs.popleft()[0].cancel()
+                        self.stats[account]['cancelled'] += 1
+            self._condition.notify_all()
+
+        if wait:
+            for thread in self._threads:
+                thread.join()
+            for client in self.clients.values():
+                client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,114 @@
+"""
+Retry policy for transient request failures
+
+Failed requests (rate limited, server errors, connection errors) are retried with exponential backoff and jitter, or
+after the delay requested by the server in the Retry-After header (failing fast if the server asks to wait longer than
+max_retry_after). Since a request is retried with the same query
+parameters, a failure during pagination only repeats the failing page (same cursor), pages already received are kept.
+"""
+
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+class RetryPolicy:
+    """
+    Retry policy with per status class limits
+
+    Args:
+        rate_limited (int): maximum number of retries of a rate limited request (HTTP 429)
+        server_error (int): maximum number of retries of a request failing with a server error (HTTP 5xx)
+        connection_error (int): maximum number of retries of a request failing with a connection error or timeout
+        backoff_factor (float): delay before the first retry in seconds, doubled for every further retry
+        max_backoff (float): maximum delay between two attempts in seconds, without Retry-After header
+        jitter (bool): randomize delays (full jitter), spreads retries of concurrent requests
+        max_retry_after (float): maximum delay requested by the server (Retry-After) that is waited for, in seconds.
+            Requests asked to wait longer are not retried.
+    """
+
+    def __init__(self, rate_limited: int = 8, server_error: int = 4, connection_error: int = 4,
+                 backoff_factor: float = 0.5, max_backoff: float = 60., jitter: bool = True,
+                 max_retry_after: float = 300.):
+
+        self.limits = {
+            'rate_limited': rate_limited,
+            'server_error': server_error,
+            'connection_error': connection_error,
+        }
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.max_retry_after = max_retry_after
+
+    @staticmethod
+    def status_class(status_code: int):
+        """
+        Retry class of an HTTP status code
+
+        Args:
+            status_code (int): HTTP status code
+        Returns:
+            status_class (str): rate_limited, server_error or None if the status should not be retried
+        """
+
+        if status_code == 429:
+            return 'rate_limited'
+        if 500 <= status_code < 600:
+            return 'server_error'
+
+        return None
+
+    def should_retry(self, status_class: str, retries: int) -> bool:
+        """
+        Whether a failed request should be retried
+
+        Args:
+            status_class (str): failure class (rate_limited, server_error or connection_error)
+            retries (int): number of retries already made for the request
+        Returns:
+            retry (bool): True if the request should be retried
+        """
+
+        return status_class is not None and retries < self.limits[status_class]
+
+    def delay(self, retries: int, retry_after: str = None) -> float:
+        """
+        Delay before the next attempt
+
+        Args:
+            retries (int): number of retries already made for the request
+            retry_after (str): Retry-After header of the failed response (seconds or HTTP date), if any
+        Returns:
+            delay (float): delay in seconds, None if the server asks to wait longer than max_retry_after (the request
+                should then not be retried)
+        """
+
+        if retry_after is not None:
+            delay = self._parse_retry_after(retry_after)
+            if delay is not None:
+                return delay if delay <= self.max_retry_after else None
+
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** retries)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return delay
+
+    @staticmethod
+    def _parse_retry_after(retry_after: str):
+        try:
+            return max(0., float(retry_after))
+        except ValueError:
+            pass
+
+        try:
+            date = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+
+        if date.tzinfo is None:
+            # Dates with a -0000 offset are parsed as naive datetimes, HTTP dates are in UTC
+            date = date.replace(tzinfo=timezone.utc)
+
+        return max(0., (date - datetime.now(timezone.utc)).total_seconds())
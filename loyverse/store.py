@@ -0,0 +1,169 @@
+"""
+Local SQLite mirror of receipts, line items and payments
+
+The store keeps an indexed copy of the receipts retrieved from the API, so that queries by date, store or customer run
+locally. It records the highest ``updated_at`` timestamp of the last completed synchronization (high-water mark), which
+allows incremental synchronization: only receipts updated since the last run have to be requested (see Receipts.sync).
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from loyverse.endpoints.fields import receipt as fields
+from loyverse.endpoints.receipts import Receipts
+from loyverse.utils.dates import utc_isoformat
+
+
+def _columns(names: list) -> str:
+    return ', '.join(f'"{name}"' for name in names)
+
+
+class ReceiptStore:
+    """
+    SQLite store of receipts, upserted by receipt number
+
+    Args:
+        path (str): path of the SQLite database file (created if it does not exist)
+    """
+
+    id_key = 'receipt_number'
+
+    def __init__(self, path: str):
+
+        self.path = path
+        self._item_columns = fields.item + [self.id_key]
+        self._payment_columns = fields.payment + [self.id_key] + fields.payment_details
+
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(f'''
+            CREATE TABLE IF NOT EXISTS receipts ({_columns(fields.receipt)}, data TEXT NOT NULL,
+                                                 PRIMARY KEY ("{self.id_key}"));
+            CREATE INDEX IF NOT EXISTS receipts_created_at ON receipts (created_at);
+            CREATE INDEX IF NOT EXISTS receipts_updated_at ON receipts (updated_at);
+            CREATE INDEX IF NOT EXISTS receipts_store_id ON receipts (store_id, created_at);
+            CREATE INDEX IF NOT EXISTS receipts_customer_id ON receipts (customer_id, created_at);
+            CREATE TABLE IF NOT EXISTS line_items ({_columns(self._item_columns)});
+            CREATE INDEX IF NOT EXISTS line_items_receipt_number ON line_items ("{self.id_key}");
+            CREATE INDEX IF NOT EXISTS line_items_item_id ON line_items (item_id);
+            CREATE TABLE IF NOT EXISTS payments ({_columns(self._payment_columns)});
+            CREATE INDEX IF NOT EXISTS payments_receipt_number ON payments ("{self.id_key}");
+            CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT);
+        ''')
+
+    def close(self) -> None:
+        """
+        Closes the database connection
+        """
+
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def high_water_mark(self) -> str:
+        """
+        Highest updated_at timestamp of the receipts of the last completed synchronization (ISO format), None if no
+        synchronization completed yet
+        """
+
+        row = self.connection.execute("SELECT value FROM sync_state WHERE key = 'updated_at'").fetchone()
+        return None if row is None else row[0]
+
+    def upsert(self, receipts: list) -> int:
+        """
+        Inserts receipts, replacing stored receipts (with their line items and payments) with the same receipt number.
+        All receipts are written in one transaction. The high-water mark is not updated, see set_high_water_mark.
+
+        Args:
+            receipts (list): receipt objects
+        Returns:
+            count (int): number of receipts written
+        """
+
+        if not receipts:
+            return 0
+
+        receipt_rows, item_rows, payment_rows = Receipts._to_rows(receipts)
+        receipt_rows = [row + (json.dumps(receipt),) for row, receipt in zip(receipt_rows, receipts)]
+        numbers = [(receipt[self.id_key],) for receipt in receipts]
+
+        def placeholders(count: int) -> str:
+            return ', '.join('?' * count)
+
+        with self.connection:
+            self.connection.executemany(f'DELETE FROM line_items WHERE "{self.id_key}" = ?', numbers)
+            self.connection.executemany(f'DELETE FROM payments WHERE "{self.id_key}" = ?', numbers)
+            self.connection.executemany(f'INSERT OR REPLACE INTO receipts ({_columns(fields.receipt)}, data) '
+                                        f'VALUES ({placeholders(len(fields.receipt) + 1)})', receipt_rows)
+            self.connection.executemany(f'INSERT INTO line_items ({_columns(self._item_columns)}) '
+                                        f'VALUES ({placeholders(len(self._item_columns))})', item_rows)
+            self.connection.executemany(f'INSERT INTO payments ({_columns(self._payment_columns)}) '
+                                        f'VALUES ({placeholders(len(self._payment_columns))})', payment_rows)
+
+        return len(receipts)
+
+    def set_high_water_mark(self, updated_at: str) -> None:
+        """
+        Records the high-water mark of a completed synchronization, the mark never moves backwards
+
+        Args:
+            updated_at (str): highest updated_at timestamp (ISO format) of the synchronized receipts
+        Notes:
+            Pages are ordered by creation date, not by updated_at: the mark may only be moved once all pages were
+            stored, otherwise an interrupted synchronization would skip the receipts of the pages not yet received.
+        """
+
+        if updated_at is None:
+            return
+
+        if self.high_water_mark is not None:
+            updated_at = max(updated_at, self.high_water_mark)
+
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES ('updated_at', ?)",
+                                    (updated_at,))
+
+    def query(self, start_date: datetime = None, end_date: datetime = None, store_id: str = None,
+              customer_id: str = None) -> list:
+        """
+        Retrieves stored receipts by creation date, store and customer
+
+        Args:
+            start_date (datetime): return only receipts created after this date (includes timezone info)
+            end_date (datetime): return only receipts created before this date (includes timezone info)
+            store_id (str): filter receipts by store id
+            customer_id (str): filter receipts by customer id
+        Returns:
+            receipts (list): receipt objects, newest first
+        """
+
+        conditions = []
+        params = []
+
+        if start_date is not None:
+            conditions.append('created_at >= ?')
+            params.append(utc_isoformat(start_date))
+
+        if end_date is not None:
+            conditions.append('created_at <= ?')
+            params.append(utc_isoformat(end_date))
+
+        if store_id is not None:
+            conditions.append('store_id = ?')
+            params.append(store_id)
+
+        if customer_id is not None:
+            conditions.append('customer_id = ?')
+            params.append(customer_id)
+
+        where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+        rows = self.connection.execute(f'SELECT data FROM receipts {where} ORDER BY created_at DESC', params)
+
+        return [json.loads(data) for data, in rows]
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM receipts').fetchone()[0]
@@ -0,0 +1,3 @@
+"""
+Tools to exercise the package without the live Loyverse API
+"""
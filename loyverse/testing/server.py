@@ -0,0 +1,389 @@
+"""
+Local stand-in of the Loyverse API, to test concurrency, retries and rate limiting offline
+
+The FakeServer serves receipts and customers (e.g. from loyverse.testing.synthetic) over HTTP on localhost, on a
+background thread. Point a client at it with its ``url``:
+
+    with FakeServer(receipts=generate_receipts(10000)) as server:
+        client = Client(access_token='token', url=server.url)
+        receipts = client.receipts.get_by_dates(start_date, end_date)
+
+Implemented resources:
+
+* /receipts and /receipts/{receipt_number}
+* /customers and /customers/{customer_id}
+
+List resources support cursor pagination (``limit`` from 1 to 250, default 50), the filter parameters used by
+Receipts.get_by_query and Customers.get_by_query, and return objects newest first. Cursors carry the query, so the
+following pages are requested with ``cursor`` and ``limit`` only, as with the API. Single resources are served with an
+ETag and answer conditional requests with 304 Not Modified.
+
+Requests beyond the rate limit (300 requests in 300sec per access token by default) are answered with 429 and a
+Retry-After header. Latency and errors (random or queued) can be injected to exercise the client under load.
+"""
+
+import base64
+import json
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from loyverse.utils.dates import utc_isoformat, parse_isoformat
+
+
+def _timestamp(value: str) -> str:
+    """
+    Normalizes an ISO timestamp query parameter to the format of the API objects, for string comparisons
+    """
+
+    return utc_isoformat(parse_isoformat(value))
+
+
+def _encode_cursor(query: dict, offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({'query': query, 'offset': offset}).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """
+    Query and offset of a cursor, raises ValueError for unknown or garbled cursors
+    """
+
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        query, offset = state['query'], state['offset']
+    except (ValueError, KeyError, TypeError):
+        raise ValueError(f'Invalid cursor: {cursor}')
+
+    if not isinstance(query, dict) or not isinstance(offset, int) or offset < 0:
+        raise ValueError(f'Invalid cursor: {cursor}')
+
+    return query, offset
+
+
+class _Resource:
+    """
+    Objects of a list resource, newest first, with their filters
+
+    Args:
+        key (str): response key holding the list of objects (receipts or customers)
+        id_key (str): object field identifying the objects
+        ids_param (str): query parameter filtering objects by comma-separated IDs
+        objects (list): API objects
+    """
+
+    def __init__(self, key: str, id_key: str, ids_param: str, objects: list):
+        self.key = key
+        self.id_key = id_key
+        self.ids_param = ids_param
+        self.objects = sorted(objects, key=lambda obj: obj['created_at'], reverse=True)
+        self.by_id = {obj[id_key]: obj for obj in self.objects}
+
+    def filter(self, query: dict) -> list:
+        """
+        Objects matching the query parameters, newest first
+
+        Args:
+            query (dict): query parameters (single values), without limit and cursor
+        Returns:
+            objects (list): matching objects
+        """
+
+        objects = self.objects
+
+        if self.ids_param in query:
+            ids = set(query[self.ids_param].split(','))
+            objects = [obj for obj in objects if obj[self.id_key] in ids]
+
+        if 'since_receipt_number' in query:
+            reference = self.by_id.get(query['since_receipt_number'])
+            if reference is not None:
+                objects = [obj for obj in objects if obj['created_at'] > reference['created_at']]
+
+        if 'before_receipt_number' in query:
+            reference = self.by_id.get(query['before_receipt_number'])
+            created_at = reference['created_at'] if reference is not None else ''
+            objects = [obj for obj in objects if obj['created_at'] < created_at]
+
+        for param in ('store_id', 'order', 'source', 'email'):
+            if param in query:
+                objects = [obj for obj in objects if obj.get(param) == query[param]]
+
+        for field in ('created_at', 'updated_at'):
+            if f'{field}_min' in query:
+                minimum = _timestamp(query[f'{field}_min'])
+                objects = [obj for obj in objects if obj[field] >= minimum]
+            if f'{field}_max' in query:
+                maximum = _timestamp(query[f'{field}_max'])
+                objects = [obj for obj in objects if obj[field] <= maximum]
+
+        return objects
+
+
+class FakeServer:
+    """
+    Local HTTP stand-in of the Loyverse API, running on a background thread
+
+    Args:
+        receipts (list): receipt objects served under /receipts
+        customers (list): customer objects served under /customers
+        access_token (str): if provided, requests with a different bearer token are rejected with 401
+        rate_limit (int): number of requests allowed per period and access token, None disables rate limiting
+        period (float): period in seconds over which the rate limit is enforced
+        latency (float): seconds added to every response
+        error_rate (float): fraction of requests answered with error_status, chosen at random
+        error_status (int): status code of the randomly injected errors
+        seed (int): random seed of the error injection
+        host (str): interface to listen on
+        port (int): port to listen on (default: any free port)
+    """
+
+    def __init__(self, receipts: list = None, customers: list = None, access_token: str = None,
+                 rate_limit: int = 300, period: float = 300., latency: float = 0., error_rate: float = 0.,
+                 error_status: int = 500, seed: int = 0, host: str = '127.0.0.1', port: int = 0):
+
+        self.resources = {
+            'receipts': _Resource('receipts', 'receipt_number', 'receipt_numbers', receipts or []),
+            'customers': _Resource('customers', 'id', 'customer_ids', customers or []),
+        }
+        self.access_token = access_token
+        self.rate_limit = rate_limit
+        self.period = period
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests = defaultdict(deque)
+        self._injected = deque()
+        self.stats = {'requests': 0, 'served': 0, 'throttled': 0, 'errors': 0, 'not_modified': 0}
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        Root url of the server API, to be passed to the Client (e.g. http://127.0.0.1:51234/v1.0)
+        """
+
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}/v1.0'
+
+    def start(self):
+        """
+        Starts serving requests on a background thread
+
+        Returns:
+            server (FakeServer): the server itself
+        """
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+            self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops serving requests and releases the port
+        """
+
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def inject(self, status: int, count: int = 1, retry_after: float = None) -> None:
+        """
+        Queues errors answered to the next requests, before any other check
+
+        Args:
+            status (int): status code of the injected responses (e.g. 429, 500, 503)
+            count (int): number of requests answered with the error
+            retry_after (float): value of the Retry-After header, if any
+        """
+
+        with self._lock:
+            self._injected.extend([(status, retry_after)] * count)
+
+    def reset(self) -> None:
+        """
+        Clears the rate limit history, the queued errors and the statistics
+        """
+
+        with self._lock:
+            self._requests.clear()
+            self._injected.clear()
+            self.stats = {key: 0 for key in self.stats}
+
+    def _throttle(self, token: str):
+        """
+        Records a request against the rate limit of the access token
+
+        Returns:
+            retry_after (float): seconds until the request would be allowed, None if allowed
+        """
+
+        if self.rate_limit is None:
+            return None
+
+        now = time.monotonic()
+        sent = self._requests[token]
+        while sent and sent[0] <= now - self.period:
+            sent.popleft()
+
+        if len(sent) >= self.rate_limit:
+            return sent[0] + self.period - now
+
+        sent.append(now)
+        return None
+
+    def _handle(self, method: str, path: str, query: dict, headers) -> tuple:
+        """
+        Computes the response of a request
+
+        Returns:
+            response (tuple): status code, response headers (dict) and body (dict or None)
+        """
+
+        with self._lock:
+            self.stats['requests'] += 1
+
+            if self._injected:
+                status, retry_after = self._injected.popleft()
+                self.stats['errors'] += 1
+                return status, {} if retry_after is None else {'Retry-After': str(retry_after)}, \
+                    _error('INJECTED_ERROR', f'Injected error {status}')
+
+            token = headers.get('Authorization', '')
+            if self.access_token is not None and token != f'Bearer {self.access_token}':
+                return 401, {}, _error('UNAUTHORIZED', 'Invalid access token')
+
+            retry_after = self._throttle(token)
+            if retry_after is not None:
+                self.stats['throttled'] += 1
+                return 429, {'Retry-After': str(max(1, round(retry_after)))}, \
+                    _error('RATE_LIMITED', 'Rate limit exceeded')
+
+            if self.error_rate > 0 and self._rng.random() < self.error_rate:
+                self.stats['errors'] += 1
+                return self.error_status, {}, _error('INTERNAL_SERVER_ERROR', 'Injected error')
+
+        if method != 'GET':
+            return 405, {}, _error('METHOD_NOT_ALLOWED', f'{method} is not supported')
+
+        parts = [part for part in path.split('/') if part]
+        if len(parts) < 2 or parts[0] != 'v1.0' or parts[1] not in self.resources or len(parts) > 3:
+            return 404, {}, _error('NOT_FOUND', f'Resource {path} not found')
+
+        resource = self.resources[parts[1]]
+        if len(parts) == 3:
+            return self._get_object(resource, parts[2], headers)
+
+        return self._get_list(resource, query)
+
+    def _get_object(self, resource: _Resource, object_id: str, headers) -> tuple:
+        obj = resource.by_id.get(object_id)
+        if obj is None:
+            return 404, {}, _error('NOT_FOUND', f'{resource.key[:-1].capitalize()} {object_id} not found')
+
+        etag = f'"{obj.get("updated_at")}"'
+        if headers.get('If-None-Match') == etag:
+            with self._lock:
+                self.stats['not_modified'] += 1
+            return 304, {'ETag': etag}, None
+
+        return 200, {'ETag': etag}, obj
+
+    def _get_list(self, resource: _Resource, query: dict) -> tuple:
+        try:
+            limit = int(query.pop('limit', 50))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= 250:
+            return 400, {}, _error('INVALID_RANGE', 'limit must be between 1 and 250', field='limit')
+
+        offset = 0
+        if 'cursor' in query:
+            try:
+                query, offset = _decode_cursor(query['cursor'])
+            except ValueError:
+                return 400, {}, _error('INVALID_CURSOR', 'Invalid cursor', field='cursor')
+
+        try:
+            objects = resource.filter(query)
+        except ValueError as error:
+            return 400, {}, _error('INVALID_VALUE', str(error))
+
+        body = {resource.key: objects[offset:offset + limit]}
+        if offset + limit < len(objects):
+            body['cursor'] = _encode_cursor(query, offset + limit)
+
+        return 200, {}, body
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                self._respond('GET')
+
+            def do_POST(self):
+                self._respond('POST')
+
+            def do_PUT(self):
+                self._respond('PUT')
+
+            def do_DELETE(self):
+                self._respond('DELETE')
+
+            def _respond(self, method: str):
+                # The request body has to be consumed to keep the connection usable
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+
+                if server.latency > 0:
+                    time.sleep(server.latency)
+
+                url = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                status, headers, body = server._handle(method, url.path, query, self.headers)
+
+                content = b'' if body is None else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(content)
+
+                if status < 400:
+                    with server._lock:
+                        server.stats['served'] += 1
+
+            def log_message(self, format, *args):
+                return None
+
+        return Handler
+
+
+def _error(code: str, details: str, field: str = None) -> dict:
+    error = {'code': code, 'details': details}
+    if field is not None:
+        error['field'] = field
+    return {'errors': [error]}
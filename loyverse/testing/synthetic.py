@@ -0,0 +1,195 @@
+"""
+Synthetic generator of Loyverse API objects
+
+Generates receipts (with line items and payments) and customers following the shape of the Loyverse API responses, to
+test and benchmark the package at production volumes without access to the live API. Generation is reproducible for a
+given seed.
+"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+
+def _isoformat(date: datetime) -> str:
+    return date.isoformat(timespec='milliseconds')[:23] + 'Z'
+
+
+def _uuid(rng: random.Random) -> str:
+    value = '%032x' % rng.getrandbits(128)
+    return f'{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}'
+
+
+def generate_receipts(count: int, start: datetime = None, end: datetime = None, seed: int = 0,
+                      stores: int = 3, items: int = 200, customers: int = 1000) -> list:
+    """
+    Generates synthetic receipts, ordered by creation date (newest first) as returned by the API
+
+    Args:
+        count (int): number of receipts to generate
+        start (datetime): earliest creation date (default: 2020-09-01 UTC)
+        end (datetime): latest creation date (default: 30 days after start)
+        seed (int): random seed, the same seed always generates the same receipts
+        stores (int): number of distinct stores
+        items (int): number of distinct items in the catalog
+        customers (int): number of distinct customers
+    Returns:
+        receipts (list): receipt objects (dict)
+    """
+
+    rng = random.Random(seed)
+
+    if start is None:
+        start = datetime(2020, 9, 1, tzinfo=timezone.utc)
+    if end is None:
+        end = start + timedelta(days=30)
+
+    store_ids = [_uuid(rng) for _ in range(stores)]
+    employee_ids = [_uuid(rng) for _ in range(stores * 4)]
+    device_ids = [_uuid(rng) for _ in range(stores * 2)]
+    customer_ids = [_uuid(rng) for _ in range(customers)]
+    catalog = [{'item_id': _uuid(rng), 'variant_id': _uuid(rng), 'item_name': f'Item {index}',
+                'variant_name': None, 'sku': str(10000 + index), 'price': round(rng.uniform(1, 50), 2)}
+               for index in range(items)]
+    payment_types = [(_uuid(rng), 'Cash', 'CASH', None), (_uuid(rng), 'Card', 'NONINTEGRATEDCARD', 'VISA')]
+
+    span = (end - start).total_seconds()
+    created = sorted((start + timedelta(seconds=rng.uniform(0, span)) for _ in range(count)), reverse=True)
+
+    receipts = []
+    for index, created_at in enumerate(created):
+        number = f'{1 + index % stores}-{count - index}'
+        refund = rng.random() < 0.02
+
+        line_items = []
+        for _ in range(rng.randint(1, 5)):
+            item = rng.choice(catalog)
+            quantity = rng.randint(1, 3)
+            gross = round(item['price'] * quantity, 2)
+            discount = round(gross * 0.1, 2) if rng.random() < 0.1 else 0.
+            line_items.append({
+                'id': _uuid(rng), **item, 'quantity': quantity, 'gross_total_money': gross,
+                'total_money': round(gross - discount, 2), 'cost': round(item['price'] * 0.4, 2),
+                'cost_total': round(item['price'] * 0.4 * quantity, 2), 'line_note': None,
+                'line_taxes': [], 'total_discount': discount, 'line_discounts': [], 'line_modifiers': [],
+            })
+
+        total = round(sum(line_item['total_money'] for line_item in line_items), 2)
+        payment_type_id, name, payment_type, card = rng.choice(payment_types)
+        details = None if card is None else {
+            'authorization_code': str(rng.randint(100000, 999999)), 'reference_id': None,
+            'entry_method': 'CONTACTLESS', 'card_company': card, 'card_number': f'****{rng.randint(1000, 9999)}',
+        }
+
+        timestamp = _isoformat(created_at)
+        receipts.append({
+            'receipt_number': number,
+            'note': None,
+            'receipt_type': 'REFUND' if refund else 'SALE',
+            'refund_for': f'1-{rng.randint(1, count)}' if refund else None,
+            'order': None,
+            'created_at': timestamp,
+            'updated_at': timestamp,
+            'source': 'point of sale',
+            'receipt_date': timestamp,
+            'cancelled_at': None,
+            'total_money': total,
+            'total_tax': 0.,
+            'points_earned': 0.,
+            'points_deducted': 0.,
+            'points_balance': 0.,
+            'customer_id': rng.choice(customer_ids) if rng.random() < 0.3 else None,
+            'total_discount': round(sum(line_item['total_discount'] for line_item in line_items), 2),
+            'employee_id': rng.choice(employee_ids),
+            'store_id': rng.choice(store_ids),
+            'pos_device_id': rng.choice(device_ids),
+            'dining_option': rng.choice(['Dine in', 'Takeout']),
+            'total_discounts': [],
+            'total_taxes': [],
+            'tip': 0.,
+            'surcharge': 0.,
+            'line_items': line_items,
+            'payments': [{
+                'payment_type_id': payment_type_id,
+                'name': name, 'type': payment_type, 'money_amount': total, 'paid_at': timestamp,
+                'payment_details': details,
+            }],
+        })
+
+    return receipts
+
+
+def generate_customers(count: int, start: datetime = None, end: datetime = None, seed: int = 0) -> list:
+    """
+    Generates synthetic customers, ordered by creation date (newest first) as returned by the API
+
+    Args:
+        count (int): number of customers to generate
+        start (datetime): earliest creation date (default: 2020-09-01 UTC)
+        end (datetime): latest creation date (default: 30 days after start)
+        seed (int): random seed, the same seed always generates the same customers
+    Returns:
+        customers (list): customer objects (dict)
+    """
+
+    rng = random.Random(seed)
+
+    if start is None:
+        start = datetime(2020, 9, 1, tzinfo=timezone.utc)
+    if end is None:
+        end = start + timedelta(days=30)
+
+    span = (end - start).total_seconds()
+    created = sorted((start + timedelta(seconds=rng.uniform(0, span)) for _ in range(count)), reverse=True)
+
+    customers = []
+    for index, created_at in enumerate(created):
+        visits = rng.randint(1, 40)
+        last_visit = min(end, created_at + timedelta(seconds=rng.uniform(0, span)))
+        customers.append({
+            'id': _uuid(rng),
+            'name': f'Customer {count - index}',
+            'email': f'customer{count - index}@example.com',
+            'phone_number': f'+41{rng.randint(100000000, 999999999)}',
+            'address': None,
+            'city': rng.choice(['Zurich', 'Geneva', 'Basel', 'Bern']),
+            'region': None,
+            'postal_code': str(rng.randint(1000, 9999)),
+            'country_code': 'CH',
+            'note': None,
+            'customer_code': str(100000 + count - index),
+            'first_visit': _isoformat(created_at),
+            'last_visit': _isoformat(last_visit),
+            'total_visits': visits,
+            'total_spent': round(visits * rng.uniform(5, 60), 2),
+            'total_points': 0.,
+            'permanent_deletion_at': None,
+            'created_at': _isoformat(created_at),
+            'updated_at': _isoformat(last_visit),
+            'deleted_at': None,
+        })
+
+    return customers
+
+
+def encode_pages(objects: list, key: str, page_size: int = 250) -> list:
+    """
+    Splits objects into raw response pages (bytes) linked by cursors, as received from the API
+
+    Args:
+        objects (list): API objects, e.g. from generate_receipts
+        key (str): page key holding the list of objects (receipts or customers)
+        page_size (int): number of objects per page (at most 250 for the API)
+    Returns:
+        pages (list): raw pages, the cursor of each page (but the last) is the index of the next page as string
+    """
+
+    pages = []
+    count = max(1, -(-len(objects) // page_size))
+    for index in range(count):
+        page = {key: objects[index * page_size:(index + 1) * page_size]}
+        if index + 1 < count:
+            page['cursor'] = str(index + 1)
+        pages.append(json.dumps(page).encode())
+
+    return pages
@@ -0,0 +1,177 @@
+"""
+Client-side throttling of API requests to stay below the limits per account (300 requests in 300sec).
+
+The limiters follow a token bucket scheme: the bucket holds at most ``burst`` tokens and is refilled at a constant rate,
+chosen such that ``burst + rate * period`` never exceeds the account budget (minus a safety margin). Each request
+reserves a token and waits if the bucket is empty, giving a steady request rate just under the budget.
+
+Available limiters:
+
+* TokenBucket: in-process bucket, shared by all threads using the same Api object
+* SQLiteTokenBucket: bucket stored in a SQLite file, shared by all processes on one host using the same file
+"""
+
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+class RateLimiter(ABC):
+    """
+    Base class for request rate limiters
+    """
+
+    @abstractmethod
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Reserves tokens from the budget
+
+        Args:
+            tokens (int): number of tokens (requests) to reserve
+        Returns:
+            delay (float): seconds to wait before the reserved requests can be sent
+        """
+
+    @property
+    @abstractmethod
+    def remaining(self) -> int:
+        """
+        Number of requests that can be sent right away without waiting
+        """
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Reserves tokens from the budget and blocks until they are available
+
+        Args:
+            tokens (int): number of tokens (requests) to acquire
+        Returns:
+            delay (float): seconds waited
+        """
+
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+        return delay
+
+
+class TokenBucket(RateLimiter):
+    """
+    Thread-safe in-process token bucket
+
+    Args:
+        rate_limit (int): number of requests allowed per period by the API (default: 300)
+        period (float): period in seconds over which the rate limit is enforced (default: 300)
+        margin (float): fraction of the rate limit to be used, keeps a safety margin (default: 0.95)
+        burst (int): maximum number of requests that can be sent back to back after an idle phase (default: 15)
+    """
+
+    def __init__(self, rate_limit: int = 300, period: float = 300., margin: float = 0.95, burst: int = 15):
+
+        budget = rate_limit * margin
+        if burst >= budget:
+            raise ValueError('Burst size has to be smaller than the rate limit budget.')
+
+        self.capacity = burst
+        self.rate = (budget - burst) / period
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = self._now()
+
+    @staticmethod
+    def _now() -> float:
+        return time.monotonic()
+
+    def _refill(self, tokens: float, updated: float, now: float) -> float:
+        return min(self.capacity, tokens + (now - updated) * self.rate)
+
+    def _take(self, tokens: float, updated: float, now: float, count: int) -> tuple:
+        tokens = self._refill(tokens, updated, now) - count
+        delay = 0. if tokens >= 0 else -tokens / self.rate
+        return tokens, delay
+
+    def reserve(self, tokens: int = 1) -> float:
+
+        with self._lock:
+            now = self._now()
+            self._tokens, delay = self._take(self._tokens, self._updated, now, tokens)
+            self._updated = now
+
+        return delay
+
+    @property
+    def remaining(self) -> int:
+
+        with self._lock:
+            tokens = self._refill(self._tokens, self._updated, self._now())
+
+        return max(0, int(tokens))
+
+
+class SQLiteTokenBucket(TokenBucket):
+    """
+    Token bucket stored in a SQLite database, to share one budget between several processes on the same host
+
+    Args:
+        path (str): path of the SQLite database file, all processes sharing a budget have to use the same file
+        name (str): bucket name, allows to store budgets of several accounts in the same file (default: default)
+        rate_limit (int): number of requests allowed per period by the API (default: 300)
+        period (float): period in seconds over which the rate limit is enforced (default: 300)
+        margin (float): fraction of the rate limit to be used, keeps a safety margin (default: 0.95)
+        burst (int): maximum number of requests that can be sent back to back after an idle phase (default: 15)
+    """
+
+    def __init__(self, path: str, name: str = 'default', rate_limit: int = 300, period: float = 300.,
+                 margin: float = 0.95, burst: int = 15):
+
+        super().__init__(rate_limit=rate_limit, period=period, margin=margin, burst=burst)
+        self.path = path
+        self.name = name
+
+        connection = self._connect()
+        try:
+            connection.execute('CREATE TABLE IF NOT EXISTS buckets '
+                               '(name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)')
+            connection.execute('INSERT OR IGNORE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)',
+                               (self.name, float(self.capacity), self._now()))
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _now() -> float:
+        # Wall clock, as monotonic clocks are not comparable between processes
+        return time.time()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def reserve(self, tokens: int = 1) -> float:
+
+        connection = self._connect()
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            stored, updated = connection.execute('SELECT tokens, updated FROM buckets WHERE name = ?',
+                                                 (self.name,)).fetchone()
+            now = self._now()
+            stored, delay = self._take(stored, updated, max(now, updated), tokens)
+            connection.execute('UPDATE buckets SET tokens = ?, updated = ? WHERE name = ?',
+                               (stored, max(now, updated), self.name))
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
+
+        return delay
+
+    @property
+    def remaining(self) -> int:
+
+        connection = self._connect()
+        try:
+            stored, updated = connection.execute('SELECT tokens, updated FROM buckets WHERE name = ?',
+                                                 (self.name,)).fetchone()
+        finally:
+            connection.close()
+
+        return max(0, int(self._refill(stored, updated, max(self._now(), updated))))
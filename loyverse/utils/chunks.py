@@ -0,0 +1,210 @@
+"""
+Splitting of iterables into chunks, batched retrieval of objects by ID and batched writes
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from urllib.parse import quote
+
+
+def chunked(iterable, size: int):
+    """
+    Splits an iterable into lists of at most size elements, consuming it lazily
+
+    Args:
+        iterable (iterable): elements to be split, e.g. a generator of receipts
+        size (int): maximum number of elements per chunk
+    Returns:
+        chunks (generator): lists of elements
+    """
+
+    if size < 1:
+        raise ValueError('Chunk size has to be at least 1.')
+
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def pack_ids(ids: list, max_length: int = 1500, max_count: int = 250, separator: str = ','):
+    """
+    Packs IDs into batches that fit in one query parameter value, once URL-encoded and joined by the separator
+
+    Args:
+        ids (list): IDs to be packed
+        max_length (int): maximum URL-encoded length of the joined IDs of one batch
+        max_count (int): maximum number of IDs per batch (default: 250, the maximum page size of the API)
+        separator (str): separator used to join the IDs
+    Returns:
+        batches (generator): lists of IDs
+    """
+
+    separator_length = len(quote(separator, safe=''))
+    batch = []
+    length = 0
+
+    for id_ in ids:
+        id_length = len(quote(str(id_), safe=''))
+        if id_length > max_length:
+            raise ValueError(f'ID {id_} is longer than the maximum length of a batch.')
+
+        added = id_length if not batch else id_length + separator_length
+        if batch and (length + added > max_length or len(batch) >= max_count):
+            yield batch
+            batch, length, added = [], 0, id_length
+
+        batch.append(id_)
+        length += added
+
+    if batch:
+        yield batch
+
+
+def fetch_many(fetch, ids: list, key: str, workers: int = 4, max_length: int = 1500) -> dict:
+    """
+    Fetches objects by ID in URL-length-safe batches, concurrently
+
+    Args:
+        fetch (callable): function fetch(ids) returning the list of objects found for a batch of IDs
+        ids (list): IDs to be retrieved, duplicates are removed
+        key (str): object field holding the ID
+        workers (int): number of batches fetched concurrently
+        max_length (int): maximum URL-encoded length of the joined IDs of one batch
+    Returns:
+        results (dict): objects keyed by ID (found) and list of IDs not returned by the API (missing)
+    """
+
+    ids = list(dict.fromkeys(ids))
+    batches = list(pack_ids(ids, max_length=max_length))
+
+    found = dict()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for objects in executor.map(fetch, batches):
+            for obj in objects:
+                found[obj[key]] = obj
+
+    return {
+        'found': found,
+        'missing': [id_ for id_ in ids if id_ not in found],
+    }
+
+
+def _failure(record, error: Exception) -> dict:
+    """
+    Failure report of a record: the record, the HTTP status (None if no response was received) and the error message
+    """
+
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+
+    message = str(error)
+    try:
+        errors = response.json().get('errors') or []
+        message = '; '.join(str(e.get('details') or e.get('code')) for e in errors) or message
+    except Exception:
+        pass
+
+    return {'record': record, 'status': status, 'error': message}
+
+
+def _splittable(batch: list, error: Exception) -> bool:
+    """
+    Whether a failed batch is split in halves to isolate the rejected records: the batch holds more than one record
+    and was rejected with a client error (4xx, rate limiting excluded)
+    """
+
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+
+    return len(batch) > 1 and status is not None and 400 <= status < 500 and status != 429
+
+
+def send_many(send, records: list, batch_size: int = 250, workers: int = 4) -> dict:
+    """
+    Writes records in batches of at most batch_size records, concurrently, reporting failures per record
+
+    A batch rejected with a client error (4xx, rate limiting excluded) is split in halves that are sent again, until
+    the rejected records are isolated: all other records of the batch are still written. Batches failing otherwise
+    (e.g. server errors or connection failures once all retries are spent) are reported as failed without splitting.
+
+    Args:
+        send (callable): function send(batch) writing a list of records and returning the list of written objects
+        records (list): records to be written
+        batch_size (int): maximum number of records per request
+        workers (int): number of batches sent concurrently
+    Returns:
+        results (dict): written objects (succeeded) and failure reports (failed) holding the record, the HTTP status
+            and the error message
+    """
+
+    if batch_size < 1:
+        raise ValueError('Batch size has to be at least 1.')
+
+    def write(batch: list) -> tuple:
+        try:
+            return list(send(batch) or []), []
+        except Exception as error:
+            if not _splittable(batch, error):
+                return [], [_failure(record, error) for record in batch]
+
+        middle = len(batch) // 2
+        succeeded, failed = write(batch[:middle])
+        more_succeeded, more_failed = write(batch[middle:])
+
+        return succeeded + more_succeeded, failed + more_failed
+
+    succeeded, failed = [], []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch_succeeded, batch_failed in executor.map(write, chunked(records, batch_size)):
+            succeeded.extend(batch_succeeded)
+            failed.extend(batch_failed)
+
+    return {'succeeded': succeeded, 'failed': failed}
+
+
+async def send_many_async(send, records: list, batch_size: int = 250, workers: int = 4) -> dict:
+    """
+    Writes records in batches of at most batch_size records, at most workers batches at once, reporting failures per
+    record. Asynchronous counterpart of send_many, rejected batches are split in the same way.
+
+    Args:
+        send (coroutine function): function send(batch) writing a list of records and returning the list of written
+            objects
+        records (list): records to be written
+        batch_size (int): maximum number of records per request
+        workers (int): number of batches sent concurrently
+    Returns:
+        results (dict): written objects (succeeded) and failure reports (failed) holding the record, the HTTP status
+            and the error message
+    """
+
+    if batch_size < 1:
+        raise ValueError('Batch size has to be at least 1.')
+
+    semaphore = asyncio.Semaphore(workers)
+
+    async def write(batch: list) -> tuple:
+        try:
+            async with semaphore:
+                return list(await send(batch) or []), []
+        except Exception as error:
+            if not _splittable(batch, error):
+                return [], [_failure(record, error) for record in batch]
+
+        middle = len(batch) // 2
+        succeeded, failed = await write(batch[:middle])
+        more_succeeded, more_failed = await write(batch[middle:])
+
+        return succeeded + more_succeeded, failed + more_failed
+
+    results = await asyncio.gather(*(write(batch) for batch in chunked(records, batch_size)))
+
+    succeeded, failed = [], []
+    for batch_succeeded, batch_failed in results:
+        succeeded.extend(batch_succeeded)
+        failed.extend(batch_failed)
+
+    return {'succeeded': succeeded, 'failed': failed}
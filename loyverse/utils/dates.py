@@ -1,9 +1,10 @@
 """
 Date (datetime objects) manipulation methods
+
+The pytz package is only imported when a timezone identifier has to be resolved, to keep ``import loyverse`` light.
 """
 
-import pytz
-from datetime import datetime
+from datetime import datetime, timezone as tz
 
 
 def add_timezone(date: datetime, timezone_id: str) -> datetime:
@@ -19,6 +20,8 @@ def add_timezone(date: datetime, timezone_id: str) -> datetime:
         date_local (datetime): localized datetime object
     """
 
+    import pytz
+
     timezone = pytz.timezone(timezone_id)
     date_local = timezone.localize(date)
 
@@ -46,12 +49,43 @@ def utc_isoformat(date: datetime, timezone_id: str = None) -> str:
     else:
         date_aware = add_timezone(date, timezone_id)
 
-    date_utc = date_aware.astimezone(pytz.utc)
+    date_utc = date_aware.astimezone(tz.utc)
     date_str = date_utc.isoformat(sep='T', timespec='milliseconds')[:23] + 'Z'
 
     return date_str
 
 
+def parse_isoformat(date_str: str) -> datetime:
+    """
+    Parses an ISO8601 UTC timestamp as returned by the API
+
+    Args:
+        date_str (str): date + time in UTC timezone and ISO format (e.g. 2020-10-12T23:14:59.897Z)
+    Returns:
+        date (datetime): timezone-aware datetime object (UTC)
+    """
+
+    return datetime.strptime(date_str, '%Y-%m-%dT%H:%M:%S.%fZ').replace(tzinfo=tz.utc)
+
+
+def to_timezone(timestamps, timezone_id: str = 'UTC'):
+    """
+    Converts ISO8601 UTC timestamps (as returned by the API) to timezone-aware datetimes in bulk
+
+    Args:
+        timestamps (pandas.Series): timestamps in ISO format (e.g. 2020-10-12T23:14:59.897Z), missing values allowed
+        timezone_id (str): timezone identifier of the returned datetimes (e.g. Europe/Zurich).
+            For a list of available identifiers, check the
+            `tz database <https://en.wikipedia.org/wiki/List_of_tz_database_time_zones>`_.
+    Returns:
+        dates (pandas.Series): timezone-aware datetime64 series (missing values as NaT)
+    """
+
+    import pandas as pd
+
+    return pd.to_datetime(timestamps, utc=True).dt.tz_convert(timezone_id)
+
+
 def day_start(date: datetime) -> datetime:
     """
     Calculates day start for passed in date object
@@ -0,0 +1,208 @@
+"""
+Parallel retrieval of time ranges split into sub-windows (shards)
+
+Cursor pagination is strictly sequential, hence long date ranges are split into time windows (and optionally further
+shards, e.g. store IDs) that are fetched concurrently. Window sizes adapt to the density of the records: after each
+window completes, the size of the next windows is chosen such that they hold roughly ``target_size`` records.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+
+
+class WindowPlanner:
+    """
+    Splits a time range into consecutive windows, walking backwards from the end date (newest records first)
+
+    Args:
+        start (datetime): start of the time range (including timezone info)
+        end (datetime): end of the time range (including timezone info)
+        window (timedelta): size of the first windows
+        target_size (int): number of records targeted per window, used to adapt the window sizes
+        min_window (timedelta): smallest window size
+        max_window (timedelta): largest window size
+    """
+
+    def __init__(self, start: datetime, end: datetime, window: timedelta, target_size: int = 1000,
+                 min_window: timedelta = timedelta(minutes=15), max_window: timedelta = timedelta(days=31)):
+
+        if window <= timedelta(0):
+            raise ValueError('Window size has to be positive.')
+
+        self.start = start
+        self.target_size = target_size
+        self.min_window = min_window
+        self.max_window = max_window
+        self.window = window
+        self._cursor = end
+        self._index = 0
+
+    def next(self):
+        """
+        Next window of the time range
+
+        Returns:
+            window (tuple): window index, window start and window end, None once the time range is exhausted
+        """
+
+        if self._cursor <= self.start:
+            return None
+
+        window_end = self._cursor
+        window_start = max(self.start, window_end - self.window)
+        self._cursor = window_start
+
+        index = self._index
+        self._index += 1
+
+        return index, window_start, window_end
+
+    def observe(self, duration: timedelta, count: int) -> None:
+        """
+        Adapts the size of the next windows to the density observed in a completed window
+
+        Args:
+            duration (timedelta): duration of the completed window
+            count (int): number of records retrieved for the window
+        """
+
+        if duration <= timedelta(0):
+            return
+
+        if count == 0:
+            self.window = min(self.max_window, self.window * 2)
+        else:
+            self.window = min(self.max_window, max(self.min_window, duration * (self.target_size / count)))
+
+
+def fetch_sharded(fetch, start: datetime, end: datetime, window: timedelta, key: str, shards: list = None,
+                  workers: int = 4, target_size: int = 1000, order_by: str = 'created_at') -> list:
+    """
+    Fetches records for a time range split into adaptive time windows (and optional shards), concurrently
+
+    Args:
+        fetch (callable): function fetch(window_start, window_end, shard) returning the list of records of a window
+        start (datetime): start of the time range (including timezone info)
+        end (datetime): end of the time range (including timezone info)
+        window (timedelta): size of the first windows
+        key (str): record field uniquely identifying a record, used to remove duplicates at window boundaries
+        shards (list): additional split of each window (e.g. store IDs), passed to fetch (default: no split)
+        workers (int): number of windows fetched concurrently
+        target_size (int): number of records targeted per window and shard
+        order_by (str): ISO timestamp field used to order records within a window (newest first)
+    Returns:
+        records (list): records of all windows, newest window first, without duplicates
+    """
+
+    if shards is None:
+        shards = [None]
+
+    planner = WindowPlanner(start, end, window, target_size=target_size)
+    results = dict()
+    pending = dict()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def submit() -> bool:
+            window_next = planner.next()
+            if window_next is None:
+                return False
+            index, window_start, window_end = window_next
+            for shard in shards:
+                pending[executor.submit(fetch, window_start, window_end, shard)] = window_next
+            return True
+
+        while len(pending) < workers and submit():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, window_start, window_end = pending.pop(future)
+                records = future.result()
+                results.setdefault(index, []).extend(records)
+                planner.observe(window_end - window_start, len(records))
+
+            while len(pending) < workers and submit():
+                pass
+
+    return _merge(results, key, sharded=len(shards) > 1, order_by=order_by)
+
+
+async def fetch_sharded_async(fetch, start: datetime, end: datetime, window: timedelta, key: str, shards: list = None,
+                              workers: int = 4, target_size: int = 1000, order_by: str = 'created_at') -> list:
+    """
+    Asyncio version of fetch_sharded, fetching at most workers windows (and shards) at once
+
+    Args:
+        fetch (callable): coroutine function fetch(window_start, window_end, shard) returning the list of records of a
+            window
+        start, end, window, key, shards, workers, target_size, order_by: same as for fetch_sharded
+    Returns:
+        records (list): records of all windows, newest window first, without duplicates
+    """
+
+    if shards is None:
+        shards = [None]
+
+    planner = WindowPlanner(start, end, window, target_size=target_size)
+    results = dict()
+    pending = dict()
+
+    def submit() -> bool:
+        window_next = planner.next()
+        if window_next is None:
+            return False
+        index, window_start, window_end = window_next
+        for shard in shards:
+            pending[asyncio.ensure_future(fetch(window_start, window_end, shard))] = window_next
+        return True
+
+    try:
+        while len(pending) < workers and submit():
+            pass
+
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index, window_start, window_end = pending.pop(task)
+                records = task.result()
+                results.setdefault(index, []).extend(records)
+                planner.observe(window_end - window_start, len(records))
+
+            while len(pending) < workers and submit():
+                pass
+    finally:
+        for task in pending:
+            task.cancel()
+
+    return _merge(results, key, sharded=len(shards) > 1, order_by=order_by)
+
+
+def _merge(results: dict, key: str, sharded: bool, order_by: str) -> list:
+    """
+    Merges the records of the windows, newest window first, removing duplicates at window boundaries
+
+    Args:
+        results (dict): records (list) of each window, by window index
+        key (str): record field uniquely identifying a record
+        sharded (bool): whether windows were split into shards, the records of a window are then sorted again
+        order_by (str): ISO timestamp field used to order records within a window (newest first)
+    Returns:
+        records (list): merged records
+    """
+
+    merged = []
+    seen = set()
+    for index in sorted(results):
+        records = results[index]
+        if sharded:
+            records.sort(key=lambda record: record[order_by], reverse=True)
+
+        for record in records:
+            if record[key] not in seen:
+                seen.add(record[key])
+                merged.append(record)
+
+    return merged
@@ -0,0 +1,337 @@
+"""
+Embeddable receiver of Loyverse webhooks for receipt and customer updates
+
+Instead of polling for updated receipts and customers, subscribe a webhook (receipts.update, customers.update) to the
+url of a WebhookReceiver. The receiver:
+
+* verifies the HMAC signature of each request against the webhook secret
+* de-duplicates objects delivered more than once (same object ID and updated_at)
+* hands each new object to a callback, or puts it on a local queue. If the callback fails, the request is answered
+  with an error (500) and the object is not remembered, so that the redelivery (or the next poll) hands it over again
+* runs a low-frequency reconciliation poll (objects updated since the previous poll) to catch missed deliveries
+
+Events are dictionaries holding the object type (receipt or customer), the object ID, its updated_at timestamp, the
+object itself (data) and the source of the event (webhook or poll).
+
+The receiver can be exercised offline by posting recorded payloads to its url, or by passing them to its handle method:
+
+    receiver = WebhookReceiver('secret', client=client)
+    with receiver:
+        requests.post(receiver.url, data=payload, headers={'X-Loyverse-Signature': signature(payload, 'secret')})
+        event = receiver.queue.get()
+"""
+
+import base64
+import hmac
+import json
+import queue
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Payload key holding the objects and object ID field, by object type
+_objects = {
+    'receipt': ('receipts', 'receipt_number'),
+    'customer': ('customers', 'id'),
+}
+
+
+def signature(body: bytes, secret: str, digest: str = 'sha1') -> str:
+    """
+    HMAC signature of a webhook body, base64 encoded
+
+    Args:
+        body (bytes): raw request body
+        secret (str): webhook secret
+        digest (str): hash function of the HMAC (hashlib name)
+    Returns:
+        signature (str): base64 encoded HMAC digest
+    """
+
+    return base64.b64encode(hmac.new(secret.encode(), body, digest).digest()).decode()
+
+
+def _header(headers, name: str):
+    """
+    Value of a request header, looked up case-insensitively (headers may be a plain dict passed in by the caller)
+    """
+
+    value = headers.get(name)
+    if value is None:
+        name = name.lower()
+        value = next((value for key, value in headers.items() if key.lower() == name), None)
+
+    return value
+
+
+class WebhookReceiver:
+    """
+    HTTP receiver of receipt and customer webhooks, running on a background thread
+
+    Args:
+        secret (str): webhook secret used to verify request signatures (required). Passing None explicitly disables
+            verification, e.g. for tests with unsigned payloads.
+        callback (callable): function callback(event) called with each new event, from the receiving thread. If not
+            provided, events are put on the queue attribute (queue.Queue).
+        client (loyverse.Client): client used by the reconciliation poll, None disables reconciliation
+        reconcile_interval (float): seconds between reconciliation polls
+        overlap (timedelta): the reconciliation poll requests objects updated since the start of the previous poll
+            minus this overlap, to tolerate clock skew and indexing delays of the API
+        max_seen (int): number of delivered (object ID, updated_at) keys remembered for de-duplication
+        signature_header (str): request header holding the signature (base64 or hex encoded)
+        digest (str): hash function of the HMAC signature (hashlib name)
+        host (str): interface to listen on
+        port (int): port to listen on (default: any free port)
+        path (str): url path of the webhooks
+    """
+
+    def __init__(self, secret: str, callback=None, client=None, reconcile_interval: float = 3600.,
+                 overlap: timedelta = timedelta(minutes=10), max_seen: int = 100000,
+                 signature_header: str = 'X-Loyverse-Signature', digest: str = 'sha1', host: str = '127.0.0.1',
+                 port: int = 0, path: str = '/webhooks'):
+
+        self.secret = secret
+        self.callback = callback
+        self.queue = queue.Queue()
+        self.client = client
+        self.reconcile_interval = reconcile_interval
+        self.overlap = overlap
+        self.max_seen = max_seen
+        self.signature_header = signature_header
+        self.digest = digest
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._seen = OrderedDict()
+        now = datetime.now(timezone.utc)
+        self.high_water_marks = {object_type: now for object_type in _objects}
+        self.stats = {'requests': 0, 'rejected': 0, 'failed': 0, 'delivered': 0, 'duplicates': 0, 'reconciled': 0}
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+        self._poller = None
+        self._stopped = threading.Event()
+
+    @property
+    def url(self) -> str:
+        """
+        Url of the webhooks (e.g. http://127.0.0.1:51234/webhooks)
+        """
+
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}{self.path}'
+
+    def start(self):
+        """
+        Starts receiving webhooks, and polling for missed updates if a client was provided
+
+        Returns:
+            receiver (WebhookReceiver): the receiver itself
+        """
+
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+            self._thread.start()
+
+            if self.client is not None:
+                self._poller = threading.Thread(target=self._poll, daemon=True)
+                self._poller.start()
+
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops receiving webhooks and polling, and releases the port
+        """
+
+        self._stopped.set()
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        if self._poller is not None:
+            self._poller.join()
+            self._poller = None
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def verify(self, body: bytes, received: str) -> bool:
+        """
+        Verifies the signature of a request body
+
+        Args:
+            body (bytes): raw request body
+            received (str): signature received in the request header (base64 or hex encoded)
+        Returns:
+            valid (bool): True if the signature matches the secret (or no secret is set)
+        """
+
+        if self.secret is None:
+            return True
+        if not received:
+            return False
+
+        expected = hmac.new(self.secret.encode(), body, self.digest).digest()
+        received = received.strip()
+
+        return hmac.compare_digest(base64.b64encode(expected).decode(), received) or \
+            hmac.compare_digest(expected.hex(), received.lower())
+
+    def handle(self, body: bytes, headers: dict = None) -> int:
+        """
+        Handles a webhook request: verifies, parses and dispatches the objects it holds
+
+        Args:
+            body (bytes): raw request body
+            headers (dict): request headers, names are matched case-insensitively
+        Returns:
+            status (int): HTTP status of the response (200 accepted, 400 invalid payload, 401 invalid signature, 500
+                callback failed, the webhook is then delivered again by Loyverse)
+        """
+
+        headers = headers or dict()
+        with self._lock:
+            self.stats['requests'] += 1
+
+        if not self.verify(body, _header(headers, self.signature_header)):
+            with self._lock:
+                self.stats['rejected'] += 1
+            return 401
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+
+        if not isinstance(payload, dict):
+            with self._lock:
+                self.stats['rejected'] += 1
+            return 400
+
+        try:
+            for object_type, (key, _) in _objects.items():
+                for obj in payload.get(key) or []:
+                    self.dispatch(object_type, obj, source='webhook')
+        except Exception:
+            with self._lock:
+                self.stats['failed'] += 1
+            return 500
+
+        return 200
+
+    def dispatch(self, object_type: str, obj: dict, source: str) -> bool:
+        """
+        Hands an object to the callback (or the queue), unless it was already delivered with the same updated_at
+
+        Args:
+            object_type (str): receipt or customer
+            obj (dict): receipt or customer object
+            source (str): webhook or poll
+        Returns:
+            delivered (bool): False if the object is a duplicate
+        Notes:
+            Exceptions of the callback are raised again, the object is then not remembered as delivered.
+        """
+
+        id_key = _objects[object_type][1]
+        updated_at = obj.get('updated_at')
+        key = (object_type, obj.get(id_key), updated_at)
+
+        with self._lock:
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                self.stats['duplicates'] += 1
+                return False
+
+            # Remembered before delivery, so that concurrent deliveries of the same object are dropped
+            self._seen[key] = None
+            while len(self._seen) > self.max_seen:
+                self._seen.popitem(last=False)
+
+        event = {'type': object_type, 'id': obj.get(id_key), 'updated_at': updated_at, 'data': obj,
+                 'source': source}
+        try:
+            if self.callback is not None:
+                self.callback(event)
+            else:
+                self.queue.put(event)
+        except Exception:
+            with self._lock:
+                self._seen.pop(key, None)
+            raise
+
+        with self._lock:
+            self.stats['delivered'] += 1
+            if source == 'poll':
+                self.stats['reconciled'] += 1
+
+        return True
+
+    def reconcile(self) -> int:
+        """
+        Polls receipts and customers updated since the start of the previous poll (minus the overlap, since the start
+        of the receiver for the first poll) and dispatches the ones not delivered by webhooks
+
+        Returns:
+            count (int): number of missed objects dispatched
+        """
+
+        if self.client is None:
+            raise ValueError('Reconciliation requires a client.')
+
+        endpoints = {'receipt': self.client.receipts, 'customer': self.client.customers}
+
+        count = 0
+        for object_type, endpoint in endpoints.items():
+            started = datetime.now(timezone.utc)
+            with self._lock:
+                since = self.high_water_marks[object_type] - self.overlap
+
+            for obj in endpoint.iter_by_query(updated_at_min=since):
+                count += self.dispatch(object_type, obj, source='poll')
+
+            # Only moved once the whole range was polled, a failed poll is repeated over the same range
+            with self._lock:
+                self.high_water_marks[object_type] = started
+
+        return count
+
+    def _poll(self) -> None:
+        while not self._stopped.wait(self.reconcile_interval):
+            try:
+                self.reconcile()
+            except Exception:
+                # The high-water marks did not move, the next poll covers the same range again
+                continue
+
+    def _handler(self):
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length)
+
+                if self.path.split('?')[0] != receiver.path:
+                    status = 404
+                else:
+                    status = receiver.handle(body, self.headers)
+
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                return None
+
+        return Handler
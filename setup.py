@@ -58,6 +58,10 @@ setup(name=NAME,
           'python-dotenv',
           'pandas',
       ],
+      extras_require={
+          'async': ['httpx'],
+          'parquet': ['pyarrow'],
+      },
       include_package_data=True,
       zip_safe=False,
       )
@@ -0,0 +1,102 @@
+"""
+Testing of the streaming sales aggregation
+
+Tests:
+* test_sales_aggregator: testing totals against a dataframe groupby, refunds and merging of shards
+* test_hyperloglog: testing distinct count estimates and merging of sketches
+* test_aggregate_receipts: testing Client.receipts aggregate over concurrent windows
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from loyverse import Client
+from loyverse.aggregate import SalesAggregator, HyperLogLog
+from loyverse.endpoints import Receipts
+from loyverse.testing.server import FakeServer
+from loyverse.testing.synthetic import generate_receipts
+
+receipts = generate_receipts(2000, seed=8)
+
+
+def test_sales_aggregator():
+    """
+    Test SalesAggregator totals by day, store and item match a groupby over the items dataframe
+    """
+
+    aggregator = SalesAggregator(('day', 'store_id', 'item_id')).update(receipts)
+
+    receipts_df, items_df, _ = Receipts.to_dataframes({'receipts': receipts})
+    items_df = items_df.merge(receipts_df[['receipt_number', 'receipt_date', 'store_id', 'receipt_type']])
+    items_df['day'] = items_df['receipt_date'].str[:10]
+    items_df['sign'] = items_df['receipt_type'].map({'SALE': 1, 'REFUND': -1})
+    items_df['net'] = items_df['total_money'] * items_df['sign']
+    items_df['signed_quantity'] = items_df['quantity'] * items_df['sign']
+    grouped = items_df.groupby(['day', 'store_id', 'item_id'])
+    expected = grouped.agg(net=('net', 'sum'), quantity=('signed_quantity', 'sum'))
+
+    results = aggregator.results()
+    assert len(results) == len(expected)
+    for row in results[:50]:
+        totals = expected.loc[(row['day'], row['store_id'], row['item_id'])]
+        assert row['net_sales'] == pytest.approx(totals['net'])
+        assert row['quantity'] == pytest.approx(totals['quantity'])
+
+    refunds = [receipt for receipt in receipts if receipt['receipt_type'] == 'REFUND']
+    daily = SalesAggregator(('day',)).update(receipts)
+    assert sum(row['refund_receipts'] for row in daily.results()) == len(refunds)
+    assert sum(row['refunds'] for row in daily.results()) == pytest.approx(sum(r['total_money'] for r in refunds))
+
+    # Shards aggregated separately and merged give the same totals
+    shards = [SalesAggregator(('day',)).update(receipts[index::3]) for index in range(3)]
+    merged = shards[0].merge(shards[1]).merge(shards[2])
+    for row, merged_row in zip(daily.results(), merged.results()):
+        assert merged_row == pytest.approx(row)
+
+    by_payment = SalesAggregator(('payment_type',)).update(receipts).results()
+    assert sum(row['gross_sales'] - row['refunds'] for row in by_payment) == \
+        pytest.approx(sum(row['net_sales'] for row in daily.results()))
+
+    with pytest.raises(ValueError):
+        SalesAggregator(('item_id', 'payment_type'))
+
+
+def test_hyperloglog():
+    """
+    Test HyperLogLog estimates are exact while sparse, within a few percent otherwise, and merge as unions
+    """
+
+    small = HyperLogLog(precision=10)
+    for value in range(100):
+        small.add(value)
+    assert small.count() == 100.
+
+    first, second = HyperLogLog(precision=12), HyperLogLog(precision=12)
+    for value in range(20000):
+        first.add(f'customer-{value}')
+    for value in range(10000, 30000):
+        second.add(f'customer-{value}')
+
+    assert first.count() == pytest.approx(20000, rel=0.05)
+    first.merge(second)
+    assert first.count() == pytest.approx(30000, rel=0.05)
+
+    with pytest.raises(ValueError):
+        small.merge(first)
+
+
+def test_aggregate_receipts():
+    """
+    Test Client.receipts aggregate over concurrent windows against the local stand-in server
+    """
+
+    start = datetime(2020, 9, 1, tzinfo=timezone.utc)
+    end = datetime(2020, 9, 30, tzinfo=timezone.utc)
+
+    with FakeServer(receipts=receipts) as server:
+        client = Client(access_token='token', url=server.url)
+        sharded = client.receipts.aggregate(start, end, dimensions=('day',), window=timedelta(days=7))
+        streamed = client.receipts.aggregate(start, end, dimensions=('day',))
+        client.close()
+
+    assert sharded.results() == streamed.results() == SalesAggregator(('day',)).update(receipts).results()
+    assert len(sharded) == 30
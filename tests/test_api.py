@@ -0,0 +1,61 @@
+"""
+Testing of the Api base class
+
+Tests:
+* test_get_request_pagination: testing page merging over a shared session
+* test_close: testing closing of the connection pool
+* test_iter_pages: testing lazy page iteration
+"""
+
+from loyverse.api import Api
+from tests.utils import FakeSession
+
+
+def test_get_request_pagination():
+    """
+    Test Api.get_request follows cursors on a single pooled session
+    """
+
+    api = Api(access_token='token')
+    session = FakeSession([
+        {'receipts': [{'receipt_number': '1-1'}], 'cursor': 'abc'},
+        {'receipts': [{'receipt_number': '1-2'}]},
+    ])
+    api._session = session
+
+    response = api.request('GET', 'receipts', params={'store_id': 'store'})
+
+    assert [receipt['receipt_number'] for receipt in response['receipts']] == ['1-1', '1-2']
+    assert session.calls[1][1] == {'cursor': 'abc', 'limit': 250}
+
+
+def test_close():
+    """
+    Test Api.close releases the session and a new one is created on next use
+    """
+
+    with Api(access_token='token') as api:
+        session = api.session
+        assert api.session is session
+
+    assert api._session is None
+    assert api.session is not session
+
+
+def test_iter_pages():
+    """
+    Test Api.iter_pages only requests the next page once the current one has been consumed
+    """
+
+    api = Api(access_token='token')
+    session = FakeSession([
+        {'customers': [{'id': 'a'}], 'cursor': 'abc'},
+        {'customers': [{'id': 'b'}]},
+    ])
+    api._session = session
+
+    pages = api.iter_pages('customers', params={})
+    assert next(pages)['customers'] == [{'id': 'a'}]
+    assert len(session.calls) == 1
+    assert [page['customers'] for page in pages] == [[{'id': 'b'}]]
+    assert len(session.calls) == 2
@@ -0,0 +1,182 @@
+"""
+Testing of the AsyncClient endpoints
+
+Tests:
+* test_get_receipts_by_dates: testing merging of pages fetched asynchronously
+* test_iter_customers: testing asynchronous iteration over customers
+* test_get_receipts_by_windows: testing concurrent retrieval of time windows
+* test_async_api: testing the context manager, the response cache and the endpoint methods of the asynchronous api
+* test_async_hooks: testing the rate limiter is never consulted on the event loop when reporting to the hooks
+"""
+
+import asyncio
+import threading
+import httpx
+import pytest
+from datetime import datetime, timedelta
+from loyverse import AsyncClient
+from loyverse.async_api import AsyncApi
+from loyverse.cache import ResponseCache
+from loyverse.metrics import MetricsCollector
+from loyverse.throttle import TokenBucket
+from loyverse.utils.dates import parse_isoformat
+from loyverse.testing.synthetic import generate_receipts
+from loyverse.utils.dates import add_timezone
+from tests.utils import error_msg
+
+
+timezone = 'Europe/Zurich'
+
+
+def mock_client(pages: dict) -> tuple:
+    """
+    AsyncClient serving the passed in pages (by cursor) from a mock transport, together with the list of requests
+    """
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=pages[request.url.params.get('cursor')])
+
+    client = AsyncClient(access_token='token')
+    client._api._session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    return client, requests
+
+
+def test_get_receipts_by_dates():
+    """
+    Test AsyncClient.receipts get_by_dates endpoint function
+    """
+
+    start_date = add_timezone(datetime(2020, 9, 1), timezone)
+    end_date = add_timezone(datetime(2020, 10, 1), timezone)
+
+    client, requests = mock_client({
+        None: {'receipts': [{'receipt_number': '1-2'}], 'cursor': 'abc'},
+        'abc': {'receipts': [{'receipt_number': '1-1'}]},
+    })
+
+    async def fetch():
+        async with client:
+            return await client.receipts.get_by_dates(start_date, end_date)
+
+    receipts = asyncio.run(fetch())
+
+    assert len(receipts['receipts']) == 2, error_msg('receipts', 'get_by_dates: incorrect number of receipts')
+    assert requests[0].headers['Authorization'] == 'Bearer token'
+    assert requests[1].url.params['limit'] == '250'
+
+
+def test_iter_customers():
+    """
+    Test AsyncClient.customers iter_by_query endpoint function
+    """
+
+    client, _ = mock_client({
+        None: {'customers': [{'id': 'a'}, {'id': 'b'}], 'cursor': 'abc'},
+        'abc': {'customers': [{'id': 'c'}]},
+    })
+
+    async def fetch():
+        async with client:
+            return [customer['id'] async for customer in client.customers.iter_by_query(email='a@b.c')]
+
+    assert asyncio.run(fetch()) == ['a', 'b', 'c'], error_msg('customers', 'iter_by_query: incorrect customers')
+
+
+def test_get_receipts_by_windows():
+    """
+    Test AsyncClient.receipts get_by_dates splits the date interval into windows fetched concurrently
+    """
+
+    receipts = generate_receipts(300, seed=8)
+    start_date = parse_isoformat(receipts[-1]['created_at'])
+    end_date = parse_isoformat(receipts[0]['created_at'])
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        created_at_min = request.url.params['created_at_min']
+        created_at_max = request.url.params['created_at_max']
+        window = [receipt for receipt in receipts if created_at_min <= receipt['created_at'] <= created_at_max]
+        return httpx.Response(200, json={'receipts': window})
+
+    client = AsyncClient(access_token='token')
+    client._api._session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def fetch():
+        async with client:
+            return await client.receipts.get_by_dates(start_date, end_date, window=timedelta(days=2), workers=3)
+
+    numbers = [receipt['receipt_number'] for receipt in asyncio.run(fetch())['receipts']]
+
+    assert numbers == [receipt['receipt_number'] for receipt in receipts], \
+        error_msg('receipts', 'get_by_dates: incorrect receipts of the windows')
+    assert len(requests) > 1
+
+
+def test_async_api():
+    """
+    Test AsyncApi is only an asynchronous context manager, serves cached lookups and exposes only async endpoints
+    """
+
+    with pytest.raises(TypeError):
+        with AsyncApi(access_token='token'):
+            pass
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={'receipt_number': '1-1'})
+
+    client = AsyncClient(access_token='token', cache=ResponseCache())
+    client._api._session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def fetch():
+        async with client:
+            first = await client.receipts.get_by_id('1-1')
+            second = await client.receipts.get_by_id('1-1')
+            return first, second
+
+    assert asyncio.run(fetch()) == ({'receipt_number': '1-1'},) * 2
+    assert len(requests) == 1, error_msg('receipts', 'get_by_id: cached response not served')
+
+    for name in ('sync', 'backfill', 'export_parquet', 'iter_dataframes', 'aggregate'):
+        assert not hasattr(client.receipts, name), error_msg('receipts', f'blocking method {name} exposed')
+    assert hasattr(client.receipts, 'to_dataframes')
+
+
+def test_async_hooks():
+    """
+    Test AsyncApi reads the remaining budget reported to the hooks from a worker thread, not the event loop thread
+    """
+
+    class RecordingBucket(TokenBucket):
+
+        def __init__(self):
+            super().__init__()
+            self.threads = []
+
+        @property
+        def remaining(self) -> int:
+            self.threads.append(threading.get_ident())
+            return super().remaining
+
+    bucket = RecordingBucket()
+    metrics = MetricsCollector()
+    client = AsyncClient(access_token='token', rate_limiter=bucket, hooks=metrics)
+    client._api._session = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, json={'receipt_number': '1-1'})))
+
+    async def fetch():
+        async with client:
+            await client.receipts.get_by_id('1-1')
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(fetch())
+
+    assert bucket.threads and loop_thread not in bucket.threads
+    assert metrics.snapshot()['receipts/{id}']['statuses'] == {'200': 1}
@@ -0,0 +1,58 @@
+"""
+Testing of checkpointed backfills
+
+Tests:
+* test_backfill_resume: testing resumption of an interrupted backfill from the stored cursor
+"""
+
+import os
+import pytest
+from datetime import datetime, timedelta, timezone
+from loyverse import Client
+from loyverse.backfill import Backfill
+from tests.utils import FakeSession
+
+
+def test_backfill_resume(tmp_path):
+    """
+    Test Client.receipts backfill resumes after the last checkpointed page, without duplicates
+    """
+
+    path = os.path.join(tmp_path, 'state.json')
+    start_date = datetime(2020, 9, 1, tzinfo=timezone.utc)
+    end_date = datetime(2020, 9, 2, tzinfo=timezone.utc)
+    pages = [
+        {'receipts': [{'receipt_number': '1-1'}], 'cursor': 'a'},
+        {'receipts': [{'receipt_number': '1-2'}], 'cursor': 'b'},
+        {'receipts': [{'receipt_number': '1-3'}]},
+        {'receipts': [{'receipt_number': '1-3'}]},
+        {'receipts': [{'receipt_number': '1-4'}]},
+    ]
+
+    client = Client(access_token='token')
+    session = FakeSession(pages)
+    client._api._session = session
+    written = []
+
+    def failing_sink(receipts: list) -> None:
+        if receipts[0]['receipt_number'] == '1-3':
+            raise KeyboardInterrupt
+        written.extend(receipts)
+
+    with pytest.raises(KeyboardInterrupt):
+        client.receipts.backfill(path, failing_sink, start_date, end_date, store_id='store')
+
+    count = client.receipts.backfill(path, written.extend, start_date, end_date, store_id='store')
+
+    assert count == 2
+    assert [receipt['receipt_number'] for receipt in written] == ['1-1', '1-2', '1-3', '1-4']
+    assert session.calls[3][1] == {'cursor': 'b', 'limit': 250}
+    assert session.calls[4][1]['created_at_min'] == '2020-09-02T00:00:00.000Z'
+    assert session.calls[4][1]['store_id'] == 'store'
+
+    backfill = Backfill(client.receipts, path, start_date, end_date, store_id='store')
+    assert backfill.done and backfill.written == 4
+    assert backfill.run(written.extend) == 0
+
+    with pytest.raises(ValueError):
+        Backfill(client.receipts, path, start_date, end_date, window=timedelta(hours=1), store_id='store')
@@ -0,0 +1,97 @@
+"""
+Testing of the response cache for single-resource lookups
+
+Tests:
+* test_cached_get_by_id: testing cache hits, expiry and conditional revalidation
+* test_disk_cache: testing LRU eviction, the on-disk tier and its clearing
+* test_shared_cache: testing a cache shared between access tokens keeps their responses apart
+* test_uncached_list: testing list requests follow their cursor pages and are never cached
+"""
+
+import os
+from loyverse import Client
+from loyverse.cache import ResponseCache
+from tests.utils import FakeResponse, FakeSession
+
+
+def test_cached_get_by_id():
+    """
+    Test Client.customers get_by_id is served from the cache and revalidated with the ETag once expired
+    """
+
+    cache = ResponseCache(ttl=60.)
+    client = Client(access_token='token', cache=cache)
+    session = FakeSession([
+        FakeResponse({'id': 'a', 'name': 'Alice'}, headers={'ETag': '"v1"'}),
+        FakeResponse(None, status_code=304),
+    ])
+    client._api._session = session
+
+    assert client.customers.get_by_id('a')['name'] == 'Alice'
+    assert client.customers.get_by_id('a')['name'] == 'Alice'
+    assert len(session.calls) == 1
+
+    next(iter(cache._entries.values())).expires = 0.
+    assert client.customers.get_by_id('a')['name'] == 'Alice'
+    assert session.headers[1]['If-None-Match'] == '"v1"'
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+    assert cache.stats()['revalidations'] == 1
+
+
+def test_disk_cache(tmp_path):
+    """
+    Test ResponseCache evicts least recently used entries from memory and reloads them from disk
+    """
+
+    cache = ResponseCache(maxsize=2, directory=str(tmp_path))
+    for key in ('a', 'b', 'c'):
+        cache.set(key, {'id': key})
+
+    assert len(cache) == 2
+    assert cache.stats()['evictions'] == 1
+    assert ResponseCache(directory=str(tmp_path)).lookup('a').response == {'id': 'a'}
+
+    # Entries promoted from disk are subject to the same size limit
+    assert cache.lookup('a').response == {'id': 'a'}
+    assert len(cache) == 2
+    assert cache.stats()['evictions'] == 2
+
+    # Leftovers of interrupted writes are removed with the cached responses
+    open(cache._path('d') + '.tmp', 'w').close()
+    cache.clear()
+    assert os.listdir(tmp_path) == []
+
+
+def test_shared_cache():
+    """
+    Test a ResponseCache shared between clients of different access tokens does not serve one account to the other
+    """
+
+    cache = ResponseCache()
+    clients = []
+    for token in ('north', 'south'):
+        client = Client(access_token=token, cache=cache)
+        client._api._session = FakeSession([FakeResponse({'id': 'a', 'name': token})])
+        clients.append(client)
+
+    assert [client.customers.get_by_id('a')['name'] for client in clients] == ['north', 'south']
+    assert len(cache) == 2
+
+
+def test_uncached_list():
+    """
+    Test a GET request of a list with a cache enabled follows all cursor pages and is sent again on the next call
+    """
+
+    cache = ResponseCache()
+    client = Client(access_token='token', cache=cache)
+    client._api._session = FakeSession([
+        {'customers': [{'id': 'a'}], 'cursor': 'next'},
+        {'customers': [{'id': 'b'}]},
+        {'customers': [{'id': 'a'}, {'id': 'b'}, {'id': 'c'}]},
+    ])
+
+    assert [customer['id'] for customer in client.request('GET', 'customers')['customers']] == ['a', 'b']
+    assert [customer['id'] for customer in client.request('GET', 'customers')['customers']] == ['a', 'b', 'c']
+    assert len(cache) == 0
@@ -0,0 +1,77 @@
+"""
+Testing of the catalog endpoints and the catalog snapshot
+
+Tests:
+* test_catalog_params: testing formatting and validation of catalog query filters, and single-object requests
+* test_catalog_snapshot: testing concurrent loading of the catalog and its indexes
+"""
+
+import pytest
+from datetime import datetime, timezone
+from loyverse import Client
+from loyverse.endpoints import Variants, Inventory
+from tests.utils import RouteSession, error_msg
+
+endpoint = 'catalog_snapshot'
+
+items = [
+    {'id': 'item-1', 'item_name': 'Espresso', 'category_id': 'cat-1',
+     'variants': [{'variant_id': 'var-1', 'sku': '10001'}, {'variant_id': 'var-2', 'sku': '10002'}]},
+    {'id': 'item-2', 'item_name': 'Croissant', 'category_id': None,
+     'variants': [{'variant_id': 'var-3', 'sku': '10003'}]},
+]
+
+routes = {
+    'items': [{'items': items[:1], 'cursor': '1'}, {'items': items[1:]}],
+    'variants': {'variants': [{'variant_id': 'var-1', 'item_id': 'item-1', 'sku': '10001',
+                               'option1_value': 'Small'}]},
+    'categories': {'categories': [{'id': 'cat-1', 'name': 'Coffee'}]},
+    'stores': {'stores': [{'id': 'store-1', 'name': 'Main street'}]},
+    'stores/store-1': {'id': 'store-1', 'name': 'Main street'},
+    'employees': {'employees': [{'id': 'emp-1', 'name': 'Ann'}]},
+    'taxes': {'taxes': []},
+    'discounts': {'discounts': [{'id': 'disc-1', 'name': 'Staff'}]},
+    'payment_types': {'payment_types': [{'id': 'pay-1', 'name': 'Cash', 'type': 'CASH'}]},
+    'inventory': {'inventory_levels': [{'variant_id': 'var-1', 'store_id': 'store-1', 'in_stock': 12.}]},
+}
+
+
+def test_catalog_params():
+    """
+    Test catalog endpoints format lists, dates and booleans and reject unknown filters
+    """
+
+    params = Variants(None)._params(items_ids=['item-1', 'item-2'], show_deleted=True,
+                                    updated_at_min=datetime(2020, 9, 1, tzinfo=timezone.utc), sku=None)
+    assert params == {'items_ids': 'item-1,item-2', 'show_deleted': 'true',
+                      'updated_at_min': '2020-09-01T00:00:00.000Z', 'limit': 250}
+
+    with pytest.raises(ValueError):
+        Inventory(None)._params(store_id='store-1')
+    assert not hasattr(Inventory(None), 'get_by_id'), error_msg(endpoint, 'inventory exposes single-object requests')
+
+
+def test_catalog_snapshot():
+    """
+    Test Client.catalog_snapshot loads all catalog endpoints and indexes them by ID, SKU and variant
+    """
+
+    client = Client(access_token='token')
+    client._api._session = session = RouteSession(routes)
+
+    assert client.stores.get_by_id('store-1')['name'] == 'Main street'
+    snapshot = client.catalog_snapshot(workers=4)
+
+    assert sorted({path for path, _ in session.calls}) == sorted(routes)
+    assert ('items', {'cursor': '1', 'limit': 250}) in session.calls, error_msg(endpoint, 'pages not followed')
+
+    assert snapshot.item('item-2')['item_name'] == 'Croissant'
+    assert snapshot.variant(sku='10002')['item_id'] == 'item-1'
+    assert snapshot.variant('var-1')['option1_value'] == 'Small'
+    assert [variant['variant_id'] for variant in snapshot.variants_by_item['item-1']] == ['var-1', 'var-2']
+    assert snapshot.category('item-1')['name'] == 'Coffee' and snapshot.category('item-2') is None
+
+    joined = snapshot.join_line_item({'item_id': 'item-1', 'variant_id': 'var-1'}, store_id='store-1')
+    assert joined['category']['name'] == 'Coffee' and joined['store']['name'] == 'Main street'
+    assert joined['in_stock'] == 12.
+    assert snapshot.join_line_item({'item_id': 'item-9', 'variant_id': 'var-9'})['item'] is None
@@ -0,0 +1,71 @@
+"""
+Testing of the chunking utilities and batched retrieval by ID
+
+Tests:
+* test_pack_ids: testing packing of IDs into url-length-safe batches
+* test_get_many: testing Client.customers get_many
+* test_send_many_async: testing rejected batches are split until the rejected records are isolated
+"""
+
+import asyncio
+import requests
+from loyverse import Client
+from loyverse.utils.chunks import chunked, pack_ids, send_many_async
+from tests.utils import FakeResponse, FakeSession
+
+
+def test_pack_ids():
+    """
+    Test pack_ids respects the encoded length and count limits
+    """
+
+    ids = [f'id {index}' for index in range(100)]
+    batches = list(pack_ids(ids, max_length=100, max_count=10))
+
+    assert sum(batches, []) == ids
+    assert all(len(','.join(batch).replace(' ', '%20').replace(',', '%2C')) <= 100 for batch in batches)
+    assert max(len(batch) for batch in batches) <= 10
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_get_many():
+    """
+    Test Client.customers get_many de-duplicates IDs, batches requests and reports missing IDs
+    """
+
+    ids = [f'{index:036d}' for index in range(60)]
+
+    def page(batch_ids: list) -> dict:
+        return {'customers': [{'id': id_} for id_ in batch_ids if id_ != ids[7]]}
+
+    client = Client(access_token='token')
+    session = FakeSession([page(ids[:38]), page(ids[38:])])
+    client._api._session = session
+
+    customers = client.customers.get_many(ids + ids[:5], workers=1)
+
+    assert len(session.calls) == 2
+    assert session.calls[0][1]['customer_ids'] == ','.join(ids[:38])
+    assert set(customers['customers']) == set(ids) - {ids[7]}
+    assert customers['missing'] == [ids[7]]
+
+
+def test_send_many_async():
+    """
+    Test send_many_async writes all valid records of a rejected batch and reports the rejected record
+    """
+
+    batches = []
+
+    async def send(batch: list) -> list:
+        batches.append(batch)
+        if 3 in batch:
+            response = FakeResponse({'errors': [{'code': 'BAD_REQUEST', 'details': 'invalid'}]}, status_code=400)
+            raise requests.HTTPError('400 Error', response=response)
+        return batch
+
+    results = asyncio.run(send_many_async(send, list(range(8)), batch_size=4, workers=2))
+
+    assert sorted(results['succeeded']) == [0, 1, 2, 4, 5, 6, 7]
+    assert results['failed'] == [{'record': 3, 'status': 400, 'error': 'invalid'}]
+    assert [3] in batches
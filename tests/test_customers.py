@@ -4,13 +4,16 @@ Testing of Client.customers endpoint functions
 Tests:
 * test_get_by_id: testing get_by_id function
 * test_get_by_date: testing get_by_date function
+* test_iter_customers_pages: testing streaming of customers over synthetic pages
 """
 
+import json
 import pytest
 from datetime import datetime
 from loyverse import Client
 from loyverse.utils.dates import add_timezone
-from tests.utils import error_msg
+from loyverse.testing.synthetic import generate_customers, encode_pages
+from tests.utils import error_msg, FakeSession
 
 
 endpoint = 'customers'
@@ -36,3 +39,21 @@ def test_get_customers_by_creation_dates():
     assert isinstance(customers, dict), error_msg(endpoint, 'get_by_date return type not of type dict')
     assert len(customers[endpoint]) == customers_length, error_msg(endpoint, 'get_by_dates: incorrect number of '
                                                                              'customers retrieved')
+
+
+def test_iter_customers_pages():
+    """
+    Test Client.customers iter_by_query follows the cursors of synthetic customer pages
+    """
+
+    customers = generate_customers(600, seed=3)
+    pages = encode_pages(customers, 'customers')
+    assert len(pages) == 3 and 'cursor' not in json.loads(pages[-1])
+
+    client = Client(access_token='token')
+    client._api._session = FakeSession([json.loads(page) for page in pages])
+
+    streamed = list(client.customers.iter_by_query())
+    assert [customer['id'] for customer in streamed] == [customer['id'] for customer in customers], \
+        error_msg(endpoint, 'iter_by_query: incorrect customers retrieved')
+    assert client._api._session.calls[1][1] == {'cursor': '1', 'limit': 250}
@@ -0,0 +1,28 @@
+"""
+Testing of the JSON decoder backends
+
+Tests:
+* test_decoders: testing all installed backends decode the same page
+"""
+
+import json
+import pytest
+from loyverse.decoders import available_backends, get_decoder
+from loyverse.testing.synthetic import generate_receipts
+
+
+def test_decoders():
+    """
+    Test every installed backend decodes raw page bytes to the same objects
+    """
+
+    page = {'receipts': generate_receipts(20), 'cursor': 'abc'}
+    content = json.dumps(page).encode()
+
+    assert 'json' in available_backends()
+    for backend in available_backends():
+        assert get_decoder(backend)(content) == page
+
+    assert get_decoder()(content) == page
+    with pytest.raises(ValueError):
+        get_decoder('yaml')
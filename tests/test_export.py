@@ -0,0 +1,64 @@
+"""
+Testing of the partitioned Parquet export
+
+Tests:
+* test_export_parquet: testing partitioned export, appends and partition pruning
+* test_replace_partitions: testing replacement of re-exported partitions, including receipts without store
+"""
+
+import os
+import pyarrow.dataset as ds
+from datetime import datetime, timezone
+from loyverse import Client
+from loyverse.export import ParquetExporter, dataset
+from loyverse.testing.synthetic import generate_receipts
+from tests.utils import FakeSession
+
+
+def test_export_parquet(tmp_path):
+    """
+    Test Client.receipts export_parquet writes typed, partitioned tables and appends without rewriting
+    """
+
+    receipts = generate_receipts(300, seed=3)
+
+    client = Client(access_token='token')
+    client._api._session = FakeSession([{'receipts': receipts[:250], 'cursor': 'abc'}, {'receipts': receipts[250:]}])
+
+    count = client.receipts.export_parquet(str(tmp_path), datetime(2020, 9, 1, tzinfo=timezone.utc),
+                                           datetime(2020, 10, 1, tzinfo=timezone.utc), chunk_size=100)
+    assert count == 300
+
+    day = receipts[0]['receipt_date'][:10]
+    day_files = sorted(os.listdir(os.path.join(tmp_path, 'receipts', f'date={day}')))
+
+    ParquetExporter(str(tmp_path)).write(generate_receipts(10, start=datetime(2020, 11, 1, tzinfo=timezone.utc),
+                                                           end=datetime(2020, 11, 2, tzinfo=timezone.utc)))
+    assert sorted(os.listdir(os.path.join(tmp_path, 'receipts', f'date={day}'))) == day_files
+
+    items = dataset(str(tmp_path), 'items').to_table(columns=['item_id', 'total_money'], filter=ds.field('date') == day)
+    expected = sum(len(r['line_items']) for r in receipts if r['receipt_date'][:10] == day)
+    assert items.num_rows == expected
+    assert items.column_names == ['item_id', 'total_money']
+
+    table = dataset(str(tmp_path), 'receipts').to_table()
+    assert table.num_rows == 310
+    assert str(table.schema.field('created_at').type) == 'timestamp[ms, tz=UTC]'
+
+
+def test_replace_partitions(tmp_path):
+    """
+    Test ParquetExporter replace mode does not duplicate re-exported receipts
+    """
+
+    receipts = generate_receipts(50, seed=4)
+    for receipt in receipts[::5]:
+        receipt['store_id'] = None
+
+    ParquetExporter(str(tmp_path)).write(receipts)
+    exporter = ParquetExporter(str(tmp_path), mode='replace')
+    exporter.write(receipts[:25])
+    exporter.write(receipts[25:])
+
+    assert dataset(str(tmp_path), 'payments').count_rows() == 50
+    assert dataset(str(tmp_path), 'receipts').to_table(filter=ds.field('store_id').is_null()).num_rows == 10
@@ -0,0 +1,65 @@
+"""
+Testing of the instrumentation hooks and the metrics collector
+
+Tests:
+* test_metrics_collector: testing request, page, retry and throttling metrics per endpoint
+* test_histogram: testing histogram buckets and quantile estimates
+"""
+
+from loyverse.api import Api
+from loyverse.metrics import MetricsCollector, Histogram
+from loyverse.retry import RetryPolicy
+from loyverse.throttle import TokenBucket
+from tests.utils import FakeResponse, FakeSession
+
+
+def test_metrics_collector():
+    """
+    Test Api reports requests, pages, retries and throttling waits to the MetricsCollector
+    """
+
+    metrics = MetricsCollector()
+    api = Api(access_token='token', retry=RetryPolicy(backoff_factor=0.), hooks=metrics,
+              rate_limiter=TokenBucket(rate_limit=100, period=1., margin=1., burst=1))
+    api._session = FakeSession([
+        {'receipts': [{'receipt_number': '1-3'}, {'receipt_number': '1-2'}], 'cursor': 'abc'},
+        FakeResponse({'errors': []}, status_code=503),
+        {'receipts': [{'receipt_number': '1-1'}]},
+        {'id': 'a'},
+        {'id': 'b'},
+    ])
+
+    api.request('GET', 'receipts', params={})
+    api.request('GET', 'customers/a')
+    api.request('GET', 'customers/b')
+    snapshot = metrics.snapshot()
+
+    receipts = snapshot['receipts']
+    assert receipts['requests'] == 3 and receipts['pages'] == 2 and receipts['records'] == 3
+    assert receipts['statuses'] == {'200': 2, '503': 1} and receipts['errors'] == 1
+    assert receipts['retries'] == 1 and receipts['retry_reasons'] == {'server_error': 1}
+    assert receipts['throttle_waits'] == 2 and receipts['throttle_wait_s'] > 0
+    assert receipts['request_latency']['count'] == 3 and receipts['page_size']['count'] == 2
+    assert receipts['bytes'] > 0 and receipts['remaining'] is not None
+
+    assert snapshot['customers/{id}']['requests'] == 2 and snapshot['customers/{id}']['pages'] == 2
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_histogram():
+    """
+    Test Histogram bucket counts and quantile estimates
+    """
+
+    histogram = Histogram(bounds=(1., 2., 5.))
+    assert histogram.quantile(0.5) is None
+
+    for value in (0.5, 0.7, 1.5, 4., 9.):
+        histogram.observe(value)
+
+    summary = histogram.to_dict()
+    assert summary['buckets'] == {'1.0': 2, '2.0': 3, '5.0': 4, 'inf': 5}
+    assert summary['count'] == 5 and summary['max'] == 9.
+    assert histogram.quantile(0.4) == 1. and histogram.quantile(0.5) == 2. and histogram.quantile(0.99) == 9.
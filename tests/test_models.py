@@ -0,0 +1,58 @@
+"""
+Testing of the typed models
+
+Tests:
+* test_iter_models: testing decoding of receipt pages into models
+* test_slotted_models: testing the slotted fallback models
+"""
+
+from loyverse import Client
+from loyverse import models
+from loyverse.endpoints.fields import receipt as fields
+from loyverse.testing.synthetic import generate_receipts
+from tests.utils import FakeSession
+
+
+def test_iter_models():
+    """
+    Test Client.receipts iter_models decodes pages into Receipt models with nested line items and payments
+    """
+
+    receipts = generate_receipts(30, seed=5)
+    client = Client(access_token='token')
+    client._api._session = FakeSession([{'receipts': receipts[:20], 'cursor': 'abc'}, {'receipts': receipts[20:]}])
+
+    decoded = list(client.receipts.iter_models())
+
+    assert len(decoded) == 30
+    assert isinstance(decoded[0], models.Receipt)
+    assert isinstance(decoded[0].line_items[0], models.LineItem)
+    assert decoded[0].receipt_number == receipts[0]['receipt_number']
+    assert decoded[0].line_items[0].total_money == receipts[0]['line_items'][0]['total_money']
+    assert not hasattr(decoded[0].line_items[0], 'line_taxes')
+    assert not hasattr(decoded[0], '__dict__')
+
+    data = models.to_dict(decoded[0])
+    assert {key: data[key] for key in fields.receipt} == {key: receipts[0][key] for key in fields.receipt}
+    assert models.from_dict(models.Receipt, receipts[0]) == decoded[0]
+
+
+def test_slotted_models():
+    """
+    Test the page decoder falls back to slotted models when msgspec is not installed
+    """
+
+    msgspec, models.msgspec = models.msgspec, None
+    try:
+        PaymentDetails = models._define('PaymentDetails', fields.payment_details, fields.types)
+        Payment = models._define('Payment', fields.payment, fields.types,
+                                 nested={'payment_details': (PaymentDetails, False)})
+        payment = generate_receipts(10)[1]['payments'][0]
+        model = Payment.from_dict(payment)
+    finally:
+        models.msgspec = msgspec
+
+    assert model.money_amount == payment['money_amount']
+    assert model.payment_details.card_company == payment['payment_details']['card_company']
+    assert not hasattr(model, '__dict__')
+    assert models.Model.__eq__(model, Payment.from_dict(payment))
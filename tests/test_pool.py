@@ -0,0 +1,118 @@
+"""
+Testing of the multi-account client pool
+
+Tests:
+* test_pool_round_robin: testing jobs of different accounts are interleaved
+* test_pool_per_account: testing the per-account limit of running jobs keeps workers available to other accounts
+* test_pool_accounts: testing per-account clients, budgets and servers end to end, and map arguments
+"""
+
+import threading
+import pytest
+from loyverse.pool import ClientPool
+from loyverse.throttle import TokenBucket
+from loyverse.testing.server import FakeServer
+from loyverse.testing.synthetic import generate_customers
+from tests.utils import error_msg
+
+endpoint = 'pool'
+
+
+def test_pool_round_robin():
+    """
+    Test ClientPool serves accounts with queued jobs in round-robin order
+    """
+
+    order = []
+    release = threading.Event()
+
+    def job(client, name: str):
+        release.wait(5)
+        order.append(name)
+
+    with ClientPool({'big': 'token-1', 'small': 'token-2'}, workers=1, per_account=1) as pool:
+        futures = [pool.submit('big', job, f'big-{index}') for index in range(4)]
+        futures.append(pool.submit('small', job, 'small-0'))
+        release.set()
+        for future in futures:
+            future.result(5)
+
+    assert order == ['big-0', 'small-0', 'big-1', 'big-2', 'big-3'], error_msg(endpoint, 'accounts not interleaved')
+    assert pool.stats['big'] == {'submitted': 4, 'completed': 4, 'failed': 0, 'cancelled': 0}
+
+    with pytest.raises(RuntimeError):
+        pool.submit('big', job, 'late')
+
+
+def test_pool_per_account():
+    """
+    Test ClientPool runs at most per_account jobs of an account at once, and reports failed jobs in their futures
+    """
+
+    release = threading.Event()
+    lock = threading.Lock()
+    running = {'current': 0, 'max': 0}
+
+    def backfill(client):
+        with lock:
+            running['current'] += 1
+            running['max'] = max(running['max'], running['current'])
+        release.wait(5)
+        with lock:
+            running['current'] -= 1
+
+    def fail(client):
+        raise ValueError('failed job')
+
+    pool = ClientPool(['token-1', 'token-2'], workers=4, per_account=2)
+    backfills = [pool.submit('token-1', backfill) for _ in range(6)]
+
+    # Workers are still available to the other account while the backfill jobs hold their slots
+    assert pool.submit('token-2', lambda client: client._api._access_token).result(5) == 'token-2'
+    with pytest.raises(ValueError):
+        pool.submit('token-2', fail).result(5)
+
+    assert pool.queued['token-1'] == 4
+    release.set()
+    pool.close(wait=True)
+
+    assert all(future.done() for future in backfills)
+    assert running['max'] == 2, error_msg(endpoint, 'per-account limit exceeded')
+    assert pool.stats['token-2']['failed'] == 1
+
+    with pytest.raises(ValueError):
+        ClientPool(['token-1'], rate_limiter=TokenBucket())
+
+
+def test_pool_accounts():
+    """
+    Test ClientPool clients query their own account with their own rate limit budget
+    """
+
+    customers = {'north': generate_customers(40, seed=1), 'south': generate_customers(70, seed=2)}
+    servers = {account: FakeServer(customers=objects, access_token=f'{account}-token')
+               for account, objects in customers.items()}
+
+    with servers['north'], servers['south']:
+        with ClientPool(workers=4) as pool:
+            for account, server in servers.items():
+                pool.add(account, f'{account}-token', url=server.url)
+            with pytest.raises(ValueError):
+                pool.add('north', 'north-token')
+
+            futures = pool.map(lambda client: list(client.customers.iter_by_query()))
+            results = {account: future.result(10) for account, future in futures.items()}
+            assert pool['north']._api._session is not pool['south']._api._session
+
+    for account, objects in customers.items():
+        assert [customer['id'] for customer in results[account]] == \
+            [customer['id'] for customer in objects], error_msg(endpoint, f'incorrect customers of {account}')
+
+    assert pool['north']._api.rate_limiter is not pool['south']._api.rate_limiter
+    assert pool.stats['south']['completed'] == 1
+
+    with ClientPool(['token-1', 'token-2', 'token-3'], workers=2) as pool:
+        futures = pool.map(lambda client, first, second=0: (client._api._access_token, first + second), 1,
+                           second=2, accounts=['token-1', 'token-3'])
+        assert {account: future.result(5) for account, future in futures.items()} == \
+            {'token-1': ('token-1', 3), 'token-3': ('token-3', 3)}, error_msg(endpoint, 'map arguments not passed')
@@ -4,13 +4,23 @@ Testing of Client.receipts endpoint functions
 Tests:
 * test_get_by_id: testing get_by_id function
 * test_get_by_date: testing get_by_date function
+* test_iter_receipts_by_dates: testing streaming of receipts over multiple pages
+* test_to_dataframes: testing formatting of receipts into dataframes
+* test_to_dataframes_dtypes: testing column types match the dataframes concatenated receipt by receipt
+* test_to_dataframes_typed: testing column types of typed dataframes
+* test_iter_dataframes: testing chunked formatting of streamed receipts into dataframes
 """
 
+import json
 import pytest
+import pandas as pd
 from datetime import datetime
 from loyverse import Client
-from loyverse.utils.dates import add_timezone
-from tests.utils import error_msg
+from loyverse.utils.dates import add_timezone, parse_isoformat
+from loyverse.endpoints import Receipts
+from loyverse.endpoints.fields import receipt as fields
+from loyverse.testing.synthetic import generate_receipts, encode_pages
+from tests.utils import error_msg, FakeSession
 
 
 endpoint = 'receipts'
@@ -75,3 +85,120 @@ def test_get_receipts_by_dates():
     assert isinstance(receipts, dict), error_msg(endpoint, 'get_by_date return type not of type dict')
     assert len(receipts['receipts']) == receipts_length, error_msg(endpoint, 'get_by_dates: incorrect number of '
                                                                              'receipts retrieved')
+
+
+def test_iter_receipts_by_dates():
+    """
+    Test Client.receipts iter_by_dates endpoint function
+    """
+
+    # Query arguments
+    start_date = add_timezone(datetime(2020, 9, 1), timezone)
+    end_date = add_timezone(datetime(2020, 10, 1), timezone)
+
+    client = Client(access_token='token')
+    session = FakeSession([
+        {'receipts': [{'receipt_number': '1-2'}, {'receipt_number': '1-1'}], 'cursor': 'abc'},
+        {'receipts': [{'receipt_number': '1-0'}]},
+    ])
+    client._api._session = session
+
+    receipts = client.receipts.iter_by_dates(start_date, end_date)
+    numbers = [receipt['receipt_number'] for receipt in receipts]
+
+    assert numbers == ['1-2', '1-1', '1-0'], error_msg(endpoint, 'iter_by_dates: incorrect receipts yielded')
+    assert session.calls[0][1]['created_at_min'] == '2020-08-31T22:00:00.000Z', \
+        error_msg(endpoint, 'iter_by_dates: incorrect query parameters')
+
+
+def test_to_dataframes():
+    """
+    Test Client.receipts to_dataframes formatting function
+    """
+
+    receipts = generate_receipts(100, seed=1)
+    receipt_df, items_df, payments_df = Receipts.to_dataframes({'receipts': receipts})
+
+    items_length = sum(len(receipt['line_items']) for receipt in receipts)
+    card_payment = next(receipt for receipt in receipts if receipt['payments'][0]['payment_details'] is not None)
+    card_row = payments_df[payments_df['receipt_number'] == card_payment['receipt_number']].iloc[0]
+
+    assert list(receipt_df.columns) == fields.receipt, error_msg(endpoint, 'to_dataframes: incorrect receipt columns')
+    assert len(receipt_df) == 100, error_msg(endpoint, 'to_dataframes: incorrect number of receipts')
+    assert len(items_df) == items_length, error_msg(endpoint, 'to_dataframes: incorrect number of items')
+    assert list(items_df['receipt_number'].unique()) == [receipt['receipt_number'] for receipt in receipts]
+    assert card_row['card_company'] == 'VISA', error_msg(endpoint, 'to_dataframes: incorrect payment details')
+
+    single_df, _, _ = Receipts.to_dataframes(receipts[0])
+    assert single_df['receipt_number'].tolist() == [receipts[0]['receipt_number']]
+
+
+def test_to_dataframes_dtypes():
+    """
+    Test Client.receipts to_dataframes column types match concatenating one dataframe per receipt and payment
+    """
+
+    receipts = generate_receipts(100, seed=1)
+    receipt_df, _, payments_df = Receipts.to_dataframes({'receipts': receipts})
+
+    payments = []
+    for receipt in receipts:
+        for payment in receipt['payments']:
+            details = payment['payment_details'] or dict()
+            payments.append({**{key: payment[key] for key in fields.payment},
+                             'receipt_number': receipt['receipt_number'],
+                             **{key: details.get(key) for key in fields.payment_details}})
+
+    expected_receipts = pd.concat([pd.DataFrame({key: receipt[key] for key in fields.receipt}, index=[0])
+                                   for receipt in receipts], ignore_index=True)
+    expected_payments = pd.concat([pd.DataFrame(payment, index=[0]) for payment in payments], ignore_index=True)
+
+    assert receipt_df.dtypes.equals(expected_receipts.dtypes), error_msg(endpoint, 'to_dataframes: receipt dtypes')
+    assert payments_df.dtypes.equals(expected_payments.dtypes), error_msg(endpoint, 'to_dataframes: payment dtypes')
+    assert payments_df['authorization_code'].dtype == object and receipt_df['refund_for'].dtype == object
+    assert receipt_df.equals(expected_receipts) and payments_df.equals(expected_payments)
+
+
+def test_to_dataframes_typed():
+    """
+    Test Client.receipts to_dataframes column typing
+    """
+
+    receipts = generate_receipts(50, seed=6)
+    receipt_df, items_df, payments_df = Receipts.to_dataframes({'receipts': receipts}, typed=True,
+                                                               timezone_id=timezone)
+
+    assert str(receipt_df['created_at'].dt.tz) == timezone, error_msg(endpoint, 'to_dataframes: incorrect timezone')
+    assert receipt_df['created_at'].iloc[0] == parse_isoformat(receipts[0]['created_at']), \
+        error_msg(endpoint, 'to_dataframes: incorrect timestamp')
+    assert receipt_df['cancelled_at'].isna().all()
+    assert receipt_df['total_money'].dtype == 'float64'
+    assert items_df['quantity'].dtype == 'float64'
+    assert isinstance(receipt_df['store_id'].dtype, pd.CategoricalDtype)
+    assert isinstance(items_df['item_id'].dtype, pd.CategoricalDtype)
+    assert str(payments_df['paid_at'].dt.tz) == timezone
+
+
+def test_iter_dataframes():
+    """
+    Test Client.receipts iter_dataframes yields dataframes chunk by chunk while pages are being fetched
+    """
+
+    receipts = generate_receipts(120, seed=7)
+    pages = [json.loads(page) for page in encode_pages(receipts, 'receipts', page_size=50)]
+
+    client = Client(access_token='token')
+    client._api._session = session = FakeSession(pages)
+
+    start_date = add_timezone(datetime(2020, 9, 1), timezone)
+    chunks = client.receipts.iter_dataframes(start_date, start_date, chunk_size=40, typed=True)
+
+    receipt_df, items_df, payments_df = next(chunks)
+    assert len(session.calls) == 1, error_msg(endpoint, 'iter_dataframes: pages fetched ahead of the chunks')
+    assert receipt_df['receipt_number'].tolist() == [receipt['receipt_number'] for receipt in receipts[:40]]
+    assert set(items_df['receipt_number']) <= set(receipt_df['receipt_number'])
+    assert str(payments_df['paid_at'].dt.tz) == 'UTC'
+
+    lengths = [len(receipt_df)] + [len(chunk[0]) for chunk in chunks]
+    assert lengths == [40, 40, 40], error_msg(endpoint, 'iter_dataframes: incorrect chunk sizes')
+    assert len(session.calls) == 3
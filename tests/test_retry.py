@@ -0,0 +1,64 @@
+"""
+Testing of the retry policy
+
+Tests:
+* test_retry_resumes_cursor: testing retries of the failing page only
+* test_retry_limits: testing per status class limits and Retry-After delays
+"""
+
+import pytest
+import requests
+from loyverse.api import Api
+from loyverse.retry import RetryPolicy
+from tests.utils import FakeResponse, FakeSession
+
+
+def test_retry_resumes_cursor():
+    """
+    Test Api.get_request retries a failing page with the same cursor and keeps the pages already received
+    """
+
+    api = Api(access_token='token', retry=RetryPolicy(backoff_factor=0.))
+    session = FakeSession([
+        {'receipts': [{'receipt_number': '1-2'}], 'cursor': 'abc'},
+        FakeResponse(None, status_code=429, headers={'Retry-After': '0'}),
+        requests.ConnectionError('connection reset'),
+        FakeResponse(None, status_code=503),
+        {'receipts': [{'receipt_number': '1-1'}]},
+    ])
+    api._session = session
+
+    response = api.request('GET', 'receipts', params={})
+
+    assert [receipt['receipt_number'] for receipt in response['receipts']] == ['1-2', '1-1']
+    assert [params.get('cursor') for _, params in session.calls] == [None, 'abc', 'abc', 'abc', 'abc']
+
+
+def test_retry_limits():
+    """
+    Test RetryPolicy limits, backoff and Retry-After parsing
+    """
+
+    policy = RetryPolicy(rate_limited=2, server_error=0, backoff_factor=1., max_backoff=10., jitter=False)
+
+    assert policy.should_retry(policy.status_class(429), 1)
+    assert not policy.should_retry(policy.status_class(429), 2)
+    assert not policy.should_retry(policy.status_class(500), 0)
+    assert not policy.should_retry(policy.status_class(404), 0)
+    assert [policy.delay(retries) for retries in range(5)] == [1., 2., 4., 8., 10.]
+    assert policy.delay(0, retry_after='3') == 3.
+    assert policy.delay(0, retry_after='Wed, 21 Oct 2015 07:28:00 GMT') == 0.
+    assert policy.delay(0, retry_after='Wed, 21 Oct 2015 07:28:00 -0000') == 0.
+    assert policy.delay(0, retry_after='120') == 120., 'Retry-After capped by max_backoff'
+    assert policy.delay(0, retry_after='3600') is None
+
+    api = Api(access_token='token', retry=policy)
+    api._session = session = FakeSession([FakeResponse(None, status_code=429, headers={'Retry-After': '3600'})])
+    with pytest.raises(requests.HTTPError):
+        api.request('GET', 'receipts', params={})
+    assert len(session.calls) == 1
+
+    api = Api(access_token='token', retry=policy)
+    api._session = FakeSession([FakeResponse(None, status_code=500)])
+    with pytest.raises(requests.HTTPError):
+        api.request('GET', 'receipts', params={})
@@ -0,0 +1,103 @@
+"""
+Testing of the local stand-in Loyverse server
+
+Tests:
+* test_server_pagination: testing concurrent end-to-end queries with filters and cursor pagination
+* test_server_rate_limit: testing 429 responses beyond the rate limit and retries of injected errors
+* test_server_objects: testing single-resource requests, 404s, conditional requests and invalid cursors
+"""
+
+import pytest
+import requests
+from datetime import datetime, timedelta, timezone
+from loyverse import Client
+from loyverse.cache import ResponseCache
+from loyverse.retry import RetryPolicy
+from loyverse.testing.server import FakeServer
+from loyverse.testing.synthetic import generate_receipts, generate_customers
+
+receipts = generate_receipts(1200, seed=4)
+customers = generate_customers(300, seed=4)
+
+
+def test_server_pagination():
+    """
+    Test Client.receipts and Client.customers queries against the server, including sharded concurrent queries
+    """
+
+    start = datetime(2020, 9, 5, tzinfo=timezone.utc)
+    end = datetime(2020, 9, 20, tzinfo=timezone.utc)
+    store_id = receipts[0]['store_id']
+
+    with FakeServer(receipts=receipts, customers=customers, access_token='token') as server:
+        client = Client(access_token='token', url=server.url)
+
+        response = client.receipts.get_by_query(created_at_min=start, created_at_max=end, store_id=store_id)
+        expected = [receipt['receipt_number'] for receipt in receipts
+                    if receipt['store_id'] == store_id and '2020-09-05' <= receipt['created_at'] < '2020-09-20']
+        assert [receipt['receipt_number'] for receipt in response['receipts']] == expected
+
+        sharded = client.receipts.get_by_dates(start, end - timedelta(days=1), window=timedelta(days=2))
+        expected = [receipt['receipt_number'] for receipt in receipts
+                    if '2020-09-05' <= receipt['created_at'] < '2020-09-20']
+        assert [receipt['receipt_number'] for receipt in sharded['receipts']] == expected
+
+        response = client.customers.get_by_query(email=customers[10]['email'])
+        assert response['customers'] == [customers[10]]
+        assert len(list(client.customers.iter_by_query())) == len(customers)
+
+        assert server.stats['throttled'] == 0 and server.stats['errors'] == 0
+        assert requests.get(f'{server.url}/receipts', params={'limit': 251},
+                            headers={'Authorization': 'Bearer token'}).status_code == 400
+        assert requests.get(f'{server.url}/receipts').status_code == 401
+        client.close()
+
+
+def test_server_rate_limit():
+    """
+    Test the server rate limit answers 429 with Retry-After, and injected errors are retried by the client
+    """
+
+    with FakeServer(receipts=receipts, rate_limit=3, period=300.) as server:
+        client = Client(access_token='token', url=server.url, retry=RetryPolicy(rate_limited=0, backoff_factor=0.))
+
+        numbers = [receipt['receipt_number'] for receipt in receipts[:2]]
+
+        server.inject(503, count=2)
+        assert len(client.receipts.get_by_query(receipt_numbers=numbers)['receipts']) == 2
+        assert server.stats['errors'] == 2
+
+        client.receipts.get_by_query(receipt_numbers=numbers[:1])
+        client.receipts.get_by_query(receipt_numbers=numbers[:1])
+        with pytest.raises(requests.HTTPError) as error:
+            client.receipts.get_by_query(receipt_numbers=numbers[:1])
+        assert error.value.response.status_code == 429
+        assert 0 < int(error.value.response.headers['Retry-After']) <= 300
+        assert server.stats['throttled'] == 1
+
+        server.reset()
+        assert client.receipts.get_by_query(receipt_numbers=numbers[:1])['receipts'][0]['receipt_number'] == numbers[0]
+        client.close()
+
+
+def test_server_objects():
+    """
+    Test get_by_id requests against the server, with not found objects and cache revalidation
+    """
+
+    with FakeServer(receipts=receipts, customers=customers) as server:
+        client = Client(access_token='token', url=server.url, cache=ResponseCache(ttl=0.))
+
+        assert client.receipts.get_by_id(receipts[5]['receipt_number']) == receipts[5]
+        assert client.customers.get_by_id(customers[5]['id']) == customers[5]
+        assert client.customers.get_by_id(customers[5]['id']) == customers[5]
+        assert server.stats['not_modified'] == 1
+
+        with pytest.raises(requests.HTTPError):
+            client.receipts.get_by_id('9-999999')
+        client.close()
+
+        for cursor in ('garbled', 'MTIz', 'eyJxdWVyeSI6IDF9'):
+            response = requests.get(f'{server.url}/receipts', params={'cursor': cursor},
+                                    headers={'Authorization': 'Bearer token'})
+            assert response.status_code == 400 and response.json()['errors'][0]['code'] == 'INVALID_CURSOR'
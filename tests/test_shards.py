@@ -0,0 +1,57 @@
+"""
+Testing of the time window sharding utilities
+
+Tests:
+* test_window_planner: testing adaptation of window sizes to record density
+* test_fetch_sharded: testing concurrent retrieval, ordering and de-duplication
+"""
+
+from datetime import datetime, timedelta, timezone
+from loyverse.utils.shards import WindowPlanner, fetch_sharded
+
+
+def test_window_planner():
+    """
+    Test WindowPlanner covers the time range and shrinks windows for dense periods
+    """
+
+    start = datetime(2020, 9, 1, tzinfo=timezone.utc)
+    end = datetime(2020, 9, 11, tzinfo=timezone.utc)
+    planner = WindowPlanner(start, end, timedelta(days=1), target_size=100)
+
+    assert planner.next() == (0, datetime(2020, 9, 10, tzinfo=timezone.utc), end)
+    planner.observe(timedelta(days=1), 400)
+    assert planner.next()[1:] == (datetime(2020, 9, 9, 18, tzinfo=timezone.utc),
+                                  datetime(2020, 9, 10, tzinfo=timezone.utc))
+    planner.observe(timedelta(hours=6), 0)
+    assert planner.window == timedelta(hours=12)
+
+    windows = []
+    while True:
+        window = planner.next()
+        if window is None:
+            break
+        windows.append(window)
+
+    assert windows[-1][1] == start
+
+
+def test_fetch_sharded():
+    """
+    Test fetch_sharded merges windows and shards newest first, without duplicates at window boundaries
+    """
+
+    start = datetime(2020, 9, 1, tzinfo=timezone.utc)
+    records = [{'id': f'{store}-{hour}', 'store': store, 'created_at': (start + timedelta(hours=hour)).isoformat()}
+               for hour in range(48) for store in ('a', 'b')]
+
+    def fetch(window_start: datetime, window_end: datetime, store: str) -> list:
+        bounds = window_start.isoformat(), window_end.isoformat()
+        return [record for record in reversed(records)
+                if record['store'] == store and bounds[0] <= record['created_at'] <= bounds[1]]
+
+    merged = fetch_sharded(fetch, start, start + timedelta(hours=47), timedelta(hours=5), key='id',
+                           shards=['a', 'b'], workers=3, target_size=4)
+
+    assert len(merged) == len(records)
+    assert [record['created_at'] for record in merged] == sorted((r['created_at'] for r in records), reverse=True)
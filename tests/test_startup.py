@@ -0,0 +1,26 @@
+"""
+Testing of the package import footprint
+
+Tests:
+* test_import_is_light: testing heavy dependencies are only imported when needed
+"""
+
+import subprocess
+import sys
+
+
+def test_import_is_light():
+    """
+    Test import loyverse and endpoint access do not import pandas, numpy or pytz
+    """
+
+    code = '\n'.join([
+        'import sys',
+        'import loyverse',
+        'client = loyverse.Client(access_token="token")',
+        'client.receipts, client.customers',
+        'print(",".join(module for module in ("pandas", "numpy", "pytz") if module in sys.modules))',
+    ])
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+
+    assert output.stdout.strip() == '', f'Heavy modules imported by import loyverse: {output.stdout.strip()}'
@@ -0,0 +1,104 @@
+"""
+Testing of the local receipt store and Client.receipts.sync
+
+Tests:
+* test_sync: testing incremental synchronization and upserts
+* test_sync_interrupted: testing the high-water mark is kept when a synchronization fails
+* test_query: testing local queries by date, store and customer
+"""
+
+import os
+import pytest
+import requests
+from datetime import datetime, timezone
+from loyverse import Client
+from loyverse.retry import RetryPolicy
+from loyverse.store import ReceiptStore
+from loyverse.testing.synthetic import generate_receipts
+from tests.utils import FakeSession, FakeResponse, error_msg
+
+
+def test_sync(tmp_path):
+    """
+    Test Client.receipts sync only requests receipts updated since the last run
+    """
+
+    path = os.path.join(tmp_path, 'receipts.sqlite')
+    receipts = generate_receipts(10)
+    updated = dict(receipts[3], updated_at='2020-10-15T10:00:00.000Z', note='updated')
+
+    client = Client(access_token='token')
+    session = FakeSession([
+        {'receipts': receipts[:5], 'cursor': 'abc'},
+        {'receipts': receipts[5:]},
+        {'receipts': [updated]},
+    ])
+    client._api._session = session
+
+    assert client.receipts.sync(path) == 10
+    assert client.receipts.sync(path) == 1
+    assert session.calls[2][1]['updated_at_min'] == max(receipt['updated_at'] for receipt in receipts)
+
+    with ReceiptStore(path) as store:
+        assert len(store) == 10
+        assert store.high_water_mark == '2020-10-15T10:00:00.000Z'
+        count = store.connection.execute('SELECT COUNT(*) FROM line_items WHERE receipt_number = ?',
+                                         (updated['receipt_number'],)).fetchone()[0]
+        assert count == len(updated['line_items'])
+
+
+def test_sync_interrupted(tmp_path):
+    """
+    Test Client.receipts sync keeps the high-water mark when a page fails, and fetches the missed receipts again
+    """
+
+    path = os.path.join(tmp_path, 'receipts.sqlite')
+    receipts = generate_receipts(10, seed=3)
+    # The page not received holds receipts updated before the receipts of the first page
+    receipts.sort(key=lambda receipt: receipt['updated_at'], reverse=True)
+    first, second = receipts[:5], receipts[5:]
+
+    client = Client(access_token='token', retry=RetryPolicy(server_error=0))
+    session = FakeSession([
+        {'receipts': first, 'cursor': 'abc'},
+        FakeResponse({'error': 'internal'}, status_code=500),
+        {'receipts': first + second},
+    ])
+    client._api._session = session
+
+    with pytest.raises(requests.HTTPError):
+        client.receipts.sync(path)
+
+    with ReceiptStore(path) as store:
+        assert len(store) == 5
+        assert store.high_water_mark is None, error_msg('store', 'high-water mark moved by an interrupted sync')
+
+    assert client.receipts.sync(path) == 10
+    assert 'updated_at_min' not in session.calls[2][1]
+
+    with ReceiptStore(path) as store:
+        assert len(store) == 10
+        assert store.high_water_mark == max(receipt['updated_at'] for receipt in receipts)
+
+
+def test_query(tmp_path):
+    """
+    Test ReceiptStore query filters
+    """
+
+    receipts = generate_receipts(200, seed=2)
+    receipt = receipts[50]
+
+    with ReceiptStore(os.path.join(tmp_path, 'receipts.sqlite')) as store:
+        store.upsert(receipts)
+
+        by_store = store.query(store_id=receipt['store_id'])
+        assert len(by_store) == sum(r['store_id'] == receipt['store_id'] for r in receipts)
+
+        by_date = store.query(start_date=datetime(2020, 9, 10, tzinfo=timezone.utc),
+                              end_date=datetime(2020, 9, 12, tzinfo=timezone.utc))
+        assert all('2020-09-10' <= r['created_at'] < '2020-09-12' for r in by_date)
+        assert by_date == sorted(by_date, key=lambda r: r['created_at'], reverse=True)
+
+        customer_id = next(r['customer_id'] for r in receipts if r['customer_id'] is not None)
+        assert all(r['customer_id'] == customer_id for r in store.query(customer_id=customer_id))
@@ -0,0 +1,52 @@
+"""
+Testing of the request rate limiters
+
+Tests:
+* test_token_bucket: testing burst and refill of the in-process bucket
+* test_sqlite_token_bucket: testing budget sharing through a SQLite file
+"""
+
+import os
+import pytest
+from loyverse.throttle import RateLimiter, TokenBucket, SQLiteTokenBucket
+
+
+def test_token_bucket():
+    """
+    Test TokenBucket allows a burst, then spaces requests at the refill rate
+    """
+
+    bucket = TokenBucket(rate_limit=100, period=10., margin=1., burst=10)
+
+    assert bucket.rate == pytest.approx(9.)
+    assert [bucket.reserve() for _ in range(10)] == [0.] * 10
+    assert bucket.remaining == 0
+    assert bucket.reserve() == pytest.approx(1 / 9., rel=0.1)
+    assert bucket.reserve() == pytest.approx(2 / 9., rel=0.1)
+
+    with pytest.raises(ValueError):
+        TokenBucket(rate_limit=10, burst=20)
+
+    class Incomplete(RateLimiter):
+
+        def reserve(self, tokens: int = 1) -> float:
+            return 0.
+
+    # Limiters have to implement both reserve and remaining
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_sqlite_token_bucket(tmp_path):
+    """
+    Test SQLiteTokenBucket instances using the same file share one budget
+    """
+
+    path = os.path.join(tmp_path, 'budget.sqlite')
+    first = SQLiteTokenBucket(path, rate_limit=100, period=10., margin=1., burst=4)
+    second = SQLiteTokenBucket(path, rate_limit=100, period=10., margin=1., burst=4)
+
+    assert first.reserve(3) == 0.
+    assert second.remaining == 1
+    assert second.reserve(2) > 0.
+    assert SQLiteTokenBucket(path, name='other', burst=4).remaining == 4
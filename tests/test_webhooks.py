@@ -0,0 +1,108 @@
+"""
+Testing of the webhook receiver
+
+Tests:
+* test_webhook_receiver: testing signature verification, de-duplication and queueing of posted payloads
+* test_webhook_reconcile: testing the reconciliation poll against the local stand-in server
+* test_webhook_callback_failure: testing failed deliveries are answered with an error and delivered again
+"""
+
+import hmac
+import json
+import pytest
+import requests
+from datetime import datetime, timezone
+from loyverse import Client
+from loyverse.webhooks import WebhookReceiver, signature
+from loyverse.testing.server import FakeServer
+from loyverse.testing.synthetic import generate_receipts, generate_customers
+
+receipts = generate_receipts(20, seed=5)
+customers = generate_customers(5, seed=5)
+
+
+def post(receiver: WebhookReceiver, payload: dict, secret: str = 'secret') -> int:
+    body = json.dumps(payload).encode()
+    headers = {'X-Loyverse-Signature': signature(body, secret), 'Content-Type': 'application/json'}
+    return requests.post(receiver.url, data=body, headers=headers).status_code
+
+
+def test_webhook_receiver():
+    """
+    Test WebhookReceiver verifies signatures, drops duplicate deliveries and queues new objects
+    """
+
+    with WebhookReceiver('secret') as receiver:
+        assert post(receiver, {'type': 'receipts.update', 'receipts': receipts[:3]}) == 200
+        assert post(receiver, {'type': 'receipts.update', 'receipts': receipts[2:4]}) == 200
+        assert post(receiver, {'type': 'customers.update', 'customers': customers[:1]}) == 200
+        assert post(receiver, {'type': 'receipts.update', 'receipts': receipts[5:6]}, secret='wrong') == 401
+        assert requests.post(receiver.url, data=b'not json',
+                             headers={'X-Loyverse-Signature': signature(b'not json', 'secret')}).status_code == 400
+
+        updated = dict(receipts[0], updated_at='2021-01-01T00:00:00.000Z')
+        assert post(receiver, {'type': 'receipts.update', 'receipts': [updated]}) == 200
+
+    events = [receiver.queue.get_nowait() for _ in range(receiver.queue.qsize())]
+    assert [(event['type'], event['id']) for event in events] == \
+        [('receipt', receipt['receipt_number']) for receipt in receipts[:4]] + \
+        [('customer', customers[0]['id']), ('receipt', receipts[0]['receipt_number'])]
+    assert events[-1]['updated_at'] == '2021-01-01T00:00:00.000Z' and events[0]['source'] == 'webhook'
+    assert receiver.stats['duplicates'] == 1 and receiver.stats['rejected'] == 2
+
+    hex_signature = hmac.new(b'secret', b'{}', 'sha1').hexdigest()
+    assert receiver.handle(b'{}', {'X-Loyverse-Signature': hex_signature}) == 200
+    assert receiver.handle(b'{}', {'x-loyverse-signature': signature(b'{}', 'secret')}) == 200
+    assert receiver.handle(b'{}', {'content-type': 'application/json'}) == 401
+
+
+def test_webhook_reconcile():
+    """
+    Test WebhookReceiver.reconcile dispatches the objects missed by webhooks only
+    """
+
+    delivered = []
+
+    with FakeServer(receipts=receipts, customers=customers) as server:
+        client = Client(access_token='token', url=server.url)
+        receiver = WebhookReceiver(None, callback=delivered.append, client=client)
+        receiver.high_water_marks = {'receipt': datetime(2020, 9, 1, tzinfo=timezone.utc),
+                                     'customer': datetime(2020, 9, 1, tzinfo=timezone.utc)}
+
+        for receipt in receipts[:5]:
+            receiver.dispatch('receipt', receipt, source='webhook')
+
+        assert receiver.reconcile() == len(receipts) - 5 + len(customers)
+        assert receiver.reconcile() == 0
+        receiver.stop()
+        client.close()
+
+    assert sorted(event['id'] for event in delivered if event['type'] == 'receipt') == \
+        sorted(receipt['receipt_number'] for receipt in receipts)
+    assert {event['source'] for event in delivered[5:]} == {'poll'}
+    assert receiver.stats['reconciled'] == len(receipts) - 5 + len(customers)
+
+
+def test_webhook_callback_failure():
+    """
+    Test WebhookReceiver answers 500 when the callback fails and delivers the object again on redelivery
+    """
+
+    delivered = []
+    failures = [RuntimeError('database unavailable')]
+
+    def callback(event: dict) -> None:
+        if failures:
+            raise failures.pop()
+        delivered.append(event)
+
+    with WebhookReceiver('secret', callback=callback) as receiver:
+        assert post(receiver, {'type': 'receipts.update', 'receipts': receipts[:1]}) == 500
+        assert post(receiver, {'type': 'receipts.update', 'receipts': receipts[:1]}) == 200
+
+    assert [event['id'] for event in delivered] == [receipts[0]['receipt_number']]
+    assert receiver.stats['duplicates'] == 0 and receiver.stats['failed'] == 1
+    assert receiver.stats['delivered'] == 1
+
+    with pytest.raises(TypeError):
+        WebhookReceiver()
@@ -0,0 +1,122 @@
+"""
+Testing of write requests and bulk writes
+
+Tests:
+* test_inventory_update: testing batched inventory updates isolating rejected levels
+* test_customers_upsert: testing concurrent customer upserts, retries and per-record failures
+* test_async_customers_upsert: testing asynchronous customer upserts and per-record failures
+"""
+
+import asyncio
+import json
+import httpx
+import requests
+from loyverse import Client, AsyncClient
+from loyverse.cache import ResponseCache
+from loyverse.retry import RetryPolicy
+from loyverse.throttle import TokenBucket
+from tests.utils import FakeResponse, HandlerSession
+
+
+def test_inventory_update():
+    """
+    Test Client.inventory update packs levels into batches of 250 and reports rejected levels only
+    """
+
+    def handler(method, path, params, payload):
+        levels = payload['inventory_levels']
+        if any(level['variant_id'] == 'bad' for level in levels):
+            return FakeResponse({'errors': [{'code': 'NOT_FOUND', 'details': 'Variant not found'}]}, status_code=400)
+        return {'inventory_levels': [{**level, 'in_stock': level['stock_after']} for level in levels]}
+
+    levels = [{'variant_id': f'var-{index}', 'store_id': 'store-1', 'stock_after': index} for index in range(600)]
+    levels[300]['variant_id'] = 'bad'
+    levels.append({'variant_id': 'var-x', 'store_id': 'store-1'})
+
+    client = Client(access_token='token', retry=RetryPolicy(backoff_factor=0.),
+                    rate_limiter=TokenBucket(rate_limit=1000, period=1., burst=100))
+    client._api._session = session = HandlerSession(handler)
+
+    response = client.inventory.update(levels, workers=3)
+
+    assert len(response['inventory_levels']) == 599
+    assert [(failure['record']['variant_id'], failure['status']) for failure in response['failed']] == \
+        [('var-x', None), ('bad', 400)]
+    assert response['failed'][1]['error'] == 'Variant not found'
+    assert max(len(payload['inventory_levels']) for _, _, _, payload in session.calls) == 250
+    # 3 batches, the rejected batch (250 levels) is split 8 times down to the rejected level
+    assert len(session.calls) == 3 + 2 * 8
+
+
+def test_customers_upsert():
+    """
+    Test Client.customers upsert_many, create_or_update retries and delete with cache invalidation
+    """
+
+    attempts = {}
+
+    def handler(method, path, params, payload):
+        if method == 'GET':
+            return {'id': path.split('/')[1], 'name': 'Cached'}
+        if method == 'DELETE':
+            return {'deleted_object_ids': [path.split('/')[1]]}
+        key = payload['name']
+        attempts[key] = attempts.get(key, 0) + 1
+        if key == 'invalid':
+            return FakeResponse({'errors': [{'code': 'INVALID_VALUE', 'details': 'Invalid email'}]}, status_code=400)
+        if key in ('flaky create', 'flaky update') and attempts[key] == 1:
+            return FakeResponse(None, status_code=503)
+        return {'id': payload.get('id', f'new-{key}'), **payload}
+
+    client = Client(access_token='token', retry=RetryPolicy(backoff_factor=0.), cache=ResponseCache())
+    client._api._session = session = HandlerSession(handler)
+
+    response = client.customers.upsert_many([
+        {'name': 'new'}, {'name': 'invalid'}, {'id': 'c-1', 'name': 'flaky update'}, {'name': 'flaky create'},
+    ])
+
+    assert sorted(customer['id'] for customer in response['customers']) == ['c-1', 'new-new']
+    assert sorted((failure['record']['name'], failure['status']) for failure in response['failed']) == \
+        [('flaky create', 503), ('invalid', 400)]
+    assert attempts == {'new': 1, 'invalid': 1, 'flaky update': 2, 'flaky create': 1}
+
+    client.customers.get_by_id('c-1')
+    client.customers.create_or_update({'id': 'c-1', 'name': 'renamed'})
+    client.customers.get_by_id('c-1')
+    assert client.customers.delete('c-1') == {'deleted_object_ids': ['c-1']}
+    assert [call[0] for call in session.calls if call[1] == 'customers/c-1'] == ['GET', 'GET', 'DELETE']
+
+    try:
+        client.request('PUT', 'customers', payload={'name': 'invalid'})
+    except requests.HTTPError as error:
+        assert error.response.status_code == 400
+
+
+def test_async_customers_upsert():
+    """
+    Test AsyncClient.customers upsert_many sends every customer and reports rejected ones
+    """
+
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        sent.append(payload['name'])
+        if payload['name'] == 'invalid':
+            return httpx.Response(400, json={'errors': [{'code': 'INVALID_VALUE', 'details': 'Invalid email'}]})
+        return httpx.Response(200, json={'id': payload.get('id', f'new-{payload["name"]}'), **payload})
+
+    client = AsyncClient(access_token='token')
+    client._api._session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def upsert():
+        async with client:
+            return await client.customers.upsert_many([{'name': 'new'}, {'name': 'invalid'},
+                                                       {'id': 'c-1', 'name': 'update'}], workers=2)
+
+    response = asyncio.run(upsert())
+
+    assert sorted(sent) == ['invalid', 'new', 'update']
+    assert sorted(customer['id'] for customer in response['customers']) == ['c-1', 'new-new']
+    assert [(failure['record']['name'], failure['status'], failure['error']) for failure in response['failed']] == \
+        [('invalid', 400, 'Invalid email')]
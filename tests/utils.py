@@ -3,6 +3,7 @@ Common test utilities
 """
 
 import json
+import threading
 from tests import cassettes_dir
 
 
@@ -26,3 +27,107 @@ def error_msg(endpoint: str, msg: str) -> str:
     """
 
     return f'Client.{endpoint}: {msg}.'
+
+
+class FakeResponse:
+    """
+    Minimal stand-in for requests.Response returning a fixed JSON payload
+    """
+
+    def __init__(self, payload: dict, status_code: int = 200, headers: dict = None):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f'{self.status_code} Error', response=self)
+
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self.payload).encode()
+
+    def json(self) -> dict:
+        return self.payload
+
+
+class FakeSession:
+    """
+    Minimal stand-in for requests.Session serving the passed in responses in order and recording the calls
+    """
+
+    def __init__(self, responses: list):
+        self.responses = list(responses)
+        self.calls = []
+        self.headers = []
+        self.closed = False
+
+    def get(self, url: str, **kwargs):
+        self.calls.append((url, dict(kwargs.get('params') or {})))
+        self.headers.append(dict(kwargs.get('headers') or {}))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response if isinstance(response, FakeResponse) else FakeResponse(response)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class RouteSession:
+    """
+    Minimal stand-in for requests.Session serving fixed JSON payloads by resource path, safe to use from many threads
+
+    Args:
+        routes (dict): payload by resource path relative to the API root url (e.g. items or items/<id>), a list of
+            payloads is served as consecutive pages
+    """
+
+    def __init__(self, routes: dict):
+        self.routes = {path: list(pages) if isinstance(pages, list) else [pages] for path, pages in routes.items()}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs):
+        path = url.split('/v1.0/', 1)[1]
+        params = dict(kwargs.get('params') or {})
+        with self._lock:
+            self.calls.append((path, params))
+        pages = self.routes.get(path)
+        if pages is None:
+            return FakeResponse({'errors': [{'code': 'NOT_FOUND'}]}, status_code=404)
+        return FakeResponse(pages[int(params.get('cursor', 0))])
+
+    def close(self) -> None:
+        return None
+
+
+class HandlerSession:
+    """
+    Minimal stand-in for requests.Session answering every request with a handler function, safe to use from many
+    threads
+
+    Args:
+        handler (callable): function handler(method, path, params, payload) returning a FakeResponse or a JSON payload,
+            path is relative to the API root url
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, **kwargs):
+        path = url.split('/v1.0/', 1)[1]
+        params = dict(kwargs.get('params') or {})
+        with self._lock:
+            self.calls.append((method, path, params, kwargs.get('json')))
+        response = self.handler(method, path, params, kwargs.get('json'))
+        return response if isinstance(response, FakeResponse) else FakeResponse(response)
+
+    def get(self, url: str, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def close(self) -> None:
+        return None